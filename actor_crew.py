@@ -1,26 +1,21 @@
-from crewai import Agent, Task, Crew, Process
-from crewai_tools import MCPServerAdapter
-from mcp import StdioServerParameters
-
+from instrumentation.langfuse import tracer, callback_factory
+import asyncio
+import json
 import os
 
-from uuid import uuid4
-from crewai import LLM
-
-import instrumentation.langfuse
-
-
+from crews.llm import build_llm
+from crews.pipelines import build_acting_crew
+from crews.acting.engine import TurnEngine
+from crews.acting.history import RollingHistory, extractive_summarizer, llm_summarizer
+from crews.acting.rounds import run_rounds
 
-llm = LLM(
-    model="openai/gpt-4o-mini", # call model by provider/model_name
-    temperature=0.8,
-    max_tokens=350,
-    top_p=0.9,
-    frequency_penalty=0.1,
-    presence_penalty=0.1,
-    stop=["END"],
-    api_key=os.getenv("OPENAI_API_KEY")
-)
+GAME_ID = os.getenv("GAME_ID")
+# Reuse a scene id to resume its turn log
+SCENE_ID = os.getenv("SCENE_ID")
+TURNS = int(os.getenv("TURNS", "6"))
+# ROUNDS plans every actor's intention of a round concurrently instead of one turn at a time
+ROUNDS = int(os.getenv("ROUNDS", "0"))
+CONCURRENCY = int(os.getenv("CONCURRENCY", "4"))
 
 history = [
     {
@@ -40,109 +35,35 @@ history = [
     }
 ]
 
-crew_input = {
-    "request_id": str(uuid4()),
-    "current_character_id": "eca9aecd-dfa3-4308-b621-b2f4a05cbad3",
-    "current_character_name": "Aentzheigkeishcrast",
-    "history": history,
-    "room_description": "Aentzheigkeishcrast, Vegjeafoeaest, and Eataiouth are in Eataiouth's home discussing Bruaplueshee. It's late and raining outside.",
-    "game_id": os.getenv("GAME_ID")
-}
-
-server_params_list = [
-    StdioServerParameters(
-        command="python3", 
-        args=["servers/character_maker.py"],
-        env={"UV_PYTHON": "3.12", **os.environ},
-    ),
-    StdioServerParameters(
-        command="python3", 
-        args=["servers/json_file_tool.py"],
-        env={"UV_PYTHON": "3.12", **os.environ},
-    ),
-]
-
-# Use the StdioServerParameters object to create a MCPServerAdapter
-with MCPServerAdapter(server_params_list) as aggregated_tools:
-    print(f"Available tools from Stdio MCP server: {[tool.name for tool in aggregated_tools]}")
-
-    intention_planning_agent = Agent(
-        role="Character Intention Planner",
-        goal=(
-            "Given recent history and the character’s full record (stats, personality, "
-            "backstory, current conditions, etc.), decide what the character INTENDS to do next."
-        ),
-        backstory=(
-            "A seasoned D&D player who always speaks in-character, framing intentions the same "
-            "way a player would tell the DM: clear, actionable, and rooted in role-playing logic."
-        ),
-        tools=aggregated_tools,
-        verbose=True,
-        llm=llm,
-    )
-
-    lookup_character_task = Task(
-        name="lookup_character",
-        description="Lookup the character named '{current_character_name}', id '{current_character_id}'.",
-        expected_output="The character as a dictionary.",
-        agent=intention_planning_agent,
-        verbose=True,
-    )
-
-    intention_planning_task = Task(
-        name="intention_planning",
-        description=(
-            "## CONTEXT\n"
-            "- Character: **{current_character_name}** (id {current_character_id})\n"
-            "- Game ID: **{game_id}**, Request ID: **{request_id}**\n"
-            "- Room Description: **{room_description}**\n"
-            "- Recent events: **{history}**\n\n"
-            "- Character: {lookup_character_task.output.raw_output}\n"
-            "## INSTRUCTIONS\n"
-            "1. Use the available tools to retrieve the character’s **personality_profile**, "
-            "current hit points, spell slots, inventory, and any relevant conditions.\n"
-            "2. Decide ONE concrete intention—exactly what the character will announce to the DM "
-            "on their next turn. Phrase it in first-person present tense (e.g., "
-            "“I charge the ogre and swing my greataxe” or “I cast *Hold Person* on the cultist in the rear”).\n"
-            "3. Provide a brief **rationale** that cites at least one element from the personality "
-            "profile *or* the recent events.\n\n"
-            "## OUTPUT FORMAT (Markdown)\n"
-            "```yaml\n"
-            "intention: <one-sentence, first-person declaration>\n"
-            "rationale: <one short sentence referencing personality/history>\n"
-            "```\n\n"
-            "## EXAMPLES\n"
-            "### Example 1\n"
-            "History snippet: *The party is pinned down behind crates while hobgoblins fire arrows.*\n"
-            "Personality: ‘reckless, loyal, hates ranged combat’\n"
-            "\n"
-            "```yaml\n"
-            "intention: I leap over the crates and rush the nearest hobgoblin, drawing their fire away from my friends!\n"
-            "rationale: My recklessness and loyalty drive me to protect the party even if it means exposing myself.\n"
-            "```\n"
-            "### Example 2\n"
-            "History snippet: *The necromancer just raised two skeletons; the cleric is out of spell slots.*\n"
-            "Personality: ‘strategic thinker, values efficiency’\n"
-            "\n"
-            "```yaml\n"
-            "intention: I hurl a flask of holy water to shatter between the skeletons and the necromancer.\n"
-            "rationale: A single action that can damage multiple undead aligns with my efficiency-first mindset.\n"
-            "```\n"
-        ),
-        expected_output=(
-            "A YAML block with **intention** and **rationale** fields exactly as shown above, "
-            "no extra keys, no narrative prose."
-        ),
-        agent=intention_planning_agent,
-        verbose=True,
-    )
+room_description = "Aentzheigkeishcrast, Vegjeafoeaest, and Eataiouth are in Eataiouth's home discussing Bruaplueshee. It's late and raining outside."
 
+with tracer.start_as_current_span("Actor Crew") as span:
+    span.set_attribute("langfuse.user.id", "user-123")
+    span.set_attribute("langfuse.session.id", "123456789")
+    span.set_attribute("client_id", "123456789")
 
-    crew = Crew(
-        agents=[intention_planning_agent],
-        tasks=[lookup_character_task, intention_planning_task],
-        process=Process.sequential,
-        verbose=True,
+    llm = build_llm(max_tokens=350)
+    summarizer = llm_summarizer(llm) if os.getenv("HISTORY_SUMMARIZER") == "llm" else extractive_summarizer
+    engine = TurnEngine(
+        build_acting_crew(llm, callback_factory),
+        GAME_ID,
+        character_ids=[event["character_id"] for event in history],
+        room_description=room_description,
+        scene_id=SCENE_ID,
+        history=RollingHistory(summarizer=summarizer),
     )
-    result = crew.kickoff(inputs=crew_input)
-    print(result)
\ No newline at end of file
+    if engine.turn == 0:
+        engine.seed(history)
+    if ROUNDS:
+        results = asyncio.run(run_rounds(engine, lambda: build_acting_crew(llm, callback_factory), ROUNDS, CONCURRENCY))
+        for result in results:
+            print(f"Round {result['round']}: {result['wall_time_s']}s wall, {result['sequential_time_s']}s sequential")
+            for entry in result["turns"]:
+                print(f"  [{entry['turn']}] {entry['event']['character_name']} {entry['event']['action']}")
+            for error in result["errors"]:
+                print(f"  {error['character_id']} failed: {error['error']}")
+    else:
+        for entry in engine.run(TURNS):
+            print(f"[{entry['turn']}] {entry['event']['character_name']} {entry['event']['action']} ({entry['latency_s']}s)")
+    print(f"Turn log: {engine.turn_log_path}")
+    span.set_attribute("output.value", json.dumps({"scene_id": engine.scene_id, "turns": engine.turn}))
@@ -0,0 +1,47 @@
+"""Run a batch of creation requests from a JSONL file through concurrent crews.
+
+Example:
+    uv run batch_crew.py town.jsonl --concurrency 4 --output output/batch_results.jsonl
+
+Each input line looks like:
+    {"kind": "environment", "description": "The blacksmith of Unka"}
+"""
+import argparse
+import asyncio
+import json
+
+from instrumentation.langfuse import callback_factory, get_tracer
+from crewai_tools import MCPServerAdapter
+
+from crews.batch import load_requests, run_batch
+from crews.llm import build_llm
+from crews.servers import game_entity_server_params, json_file_tool_server_params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many creation crews concurrently.")
+    parser.add_argument("requests", help="JSONL file with one request per line")
+    parser.add_argument("--output", default="batch_results.jsonl", help="Where to write per-request results (JSONL)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum crews running at once")
+    args = parser.parse_args()
+
+    requests = load_requests(args.requests)
+    llm = build_llm(max_tokens=1_000)
+
+    # One pair of MCP servers is started once and shared by every crew in the batch.
+    with MCPServerAdapter(game_entity_server_params()) as game_entity_tools, MCPServerAdapter(json_file_tool_server_params()) as json_file_tools:
+        summary = asyncio.run(run_batch(
+            requests,
+            llm,
+            game_entity_tools,
+            json_file_tools,
+            callback_factory,
+            args.output,
+            concurrency=args.concurrency,
+            tracer=get_tracer(),
+        ))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
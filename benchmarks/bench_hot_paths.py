@@ -0,0 +1,84 @@
+import random
+import shutil
+import uuid
+
+import pytest
+
+from servers.file_utils.ripgrep import find_entity_by_id, find_entities_fn
+from servers.file_utils.json import read_game_entity_fn, update_entity_field_fn, save_game_entity_fn
+from servers.character_creator.character import build_random_character
+from servers.environments.environments import build_random_environment
+from servers.stat_block_maker import make_stat_block
+from benchmarks.conftest import NEEDLE
+
+
+def pick_ids(campaign, count=64):
+    rng = random.Random(1)
+    return [e["id"] for e in rng.sample(campaign["entities"], k=min(count, len(campaign["entities"])))]
+
+
+def cycle(values):
+    iterator = iter(values)
+    def next_value():
+        nonlocal iterator
+        try:
+            return next(iterator)
+        except StopIteration:
+            iterator = iter(values)
+            return next(iterator)
+    return next_value
+
+
+# ── Storage ─────────────────────────────────────────────────────────────────────
+
+def test_find_entity_by_id(benchmark, campaign):
+    next_id = cycle(pick_ids(campaign))
+    matches = benchmark(lambda: find_entity_by_id(next_id(), campaign["game_id"]))
+    assert len(matches) == 1
+
+
+def test_read_game_entity_fn(benchmark, campaign):
+    next_id = cycle(pick_ids(campaign))
+    match = benchmark(lambda: read_game_entity_fn(next_id()))
+    assert match["game_id"] == campaign["game_id"]
+
+
+def test_update_entity_field_fn(benchmark, mutable_campaign):
+    next_id = cycle(pick_ids(mutable_campaign))
+    entity = benchmark(lambda: update_entity_field_fn(next_id(), "state.visited", True))
+    assert entity["state"]["visited"] is True
+
+
+def test_save_game_entity_fn(benchmark, mutable_campaign):
+    # Without the needle word, so saves never change what the search benchmarks find
+    template = next(dict(e) for e in mutable_campaign["entities"] if NEEDLE not in e["description"])
+
+    def save():
+        return save_game_entity_fn({**template, "id": str(uuid.uuid4())})
+
+    assert benchmark(save).endswith(".json")
+
+
+# ── Search ──────────────────────────────────────────────────────────────────────
+
+@pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep (rg) is not installed")
+def test_find_entities_fn(benchmark, campaign):
+    result = benchmark(lambda: find_entities_fn(NEEDLE, campaign["game_id"]))
+    assert isinstance(result, list) and len(result) >= 1
+
+
+# ── Generation ──────────────────────────────────────────────────────────────────
+
+def test_build_random_character(benchmark, scratch_dir):
+    character = benchmark(lambda: build_random_character(game_id="benchgame", description="a benchmark"))
+    assert character.max_hp > 0
+
+
+def test_build_random_environment(benchmark, scratch_dir):
+    environment = benchmark(lambda: build_random_environment(game_id="benchgame"))
+    assert environment.name
+
+
+def test_make_stat_block(benchmark, scratch_dir):
+    stat_block = benchmark(lambda: make_stat_block("req", "benchgame", "a grizzled bandit"))
+    assert stat_block["derived_stats"]["hp"]
@@ -0,0 +1,101 @@
+"""Fixtures for the storage/search/generation benchmark suite.
+
+Run (from the repo root):
+    uv run --with pytest-benchmark pytest benchmarks
+
+Save a new baseline after an intentional change:
+    uv run --with pytest-benchmark pytest benchmarks --benchmark-save=baseline
+
+Fail when any benchmark's median regressed more than 25% against the latest baseline:
+    uv run --with pytest-benchmark pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:25%
+
+Campaign sizes default to 1k and 10k entities; add 100k with --bench-sizes=1000,10000,100000.
+Baselines are JSON files under benchmarks/baselines/<machine>/.
+"""
+import json
+import os
+import random
+import shutil
+import uuid
+
+import pytest
+
+GAME_ID = "benchgame"
+# Every Nth entity gets a marker word so searches have a known, small result set.
+NEEDLE = "quillfeather"
+NEEDLE_EVERY = 500
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-sizes", default="1000,10000", help="Comma separated synthetic campaign sizes")
+
+
+def pytest_generate_tests(metafunc):
+    if "campaign" in metafunc.fixturenames:
+        sizes = [int(s) for s in metafunc.config.getoption("--bench-sizes").split(",") if s.strip()]
+        metafunc.parametrize("campaign", sizes, indirect=True, ids=[f"{s}_entities" for s in sizes])
+
+
+def synthetic_entity(index: int, rng: random.Random) -> dict:
+    entity_type = "character" if index % 2 else "environment"
+    words = ["ash", "oak", "river", "stone", "ember", "salt", "iron", "moss", "wind", "thorn"]
+    text = " ".join(rng.choice(words) for _ in range(40))
+    if index % NEEDLE_EVERY == 0:
+        text += f" {NEEDLE}"
+    entity = {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "entity_type": entity_type,
+        "name": f"Entity{index}",
+        "description": text,
+        "game_id": GAME_ID,
+        "request_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "schema_version": 1,
+        "state": {},
+    }
+    if entity_type == "character":
+        entity.update({"level": rng.randint(1, 20), "class": rng.choice(["Rogue", "Wizard", "Fighter"])})
+    else:
+        entity.update({"kind": rng.choice(["Open:Forest", "Closed:Cavern"]), "creatures": []})
+    return entity
+
+
+def write_campaign(root: str, size: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    entities = [synthetic_entity(i, rng) for i in range(size)]
+    for entity in entities:
+        directory = os.path.join(root, "output", GAME_ID, entity["entity_type"])
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{entity['name']}.{entity['id']}.json"), "w") as f:
+            json.dump(entity, f)
+    return entities
+
+
+@pytest.fixture(scope="session")
+def campaign(request, tmp_path_factory):
+    """A synthetic campaign of `request.param` entities; the cwd is switched to its root."""
+    size = request.param
+    root = tmp_path_factory.mktemp(f"campaign_{size}")
+    entities = write_campaign(str(root), size)
+    previous = os.getcwd()
+    os.chdir(root)
+    yield {"root": str(root), "game_id": GAME_ID, "entities": entities}
+    os.chdir(previous)
+
+
+@pytest.fixture
+def mutable_campaign(campaign, tmp_path):
+    """A private copy of the session campaign for benchmarks that write, so the others keep measuring the original."""
+    root = tmp_path / "campaign"
+    shutil.copytree(os.path.join(campaign["root"], "output"), root / "output")
+    previous = os.getcwd()
+    os.chdir(root)
+    yield {**campaign, "root": str(root)}
+    os.chdir(previous)
+
+
+@pytest.fixture
+def scratch_dir(tmp_path):
+    previous = os.getcwd()
+    os.chdir(tmp_path)
+    yield tmp_path
+    os.chdir(previous)
@@ -0,0 +1,86 @@
+"""Crew-level benchmark that replays recorded LLM transcripts offline.
+
+Record a transcript once with a real model:
+    LLM_BACKEND=record LLM_TRANSCRIPT=benchmarks/environment.jsonl uv run environment_crew.py
+
+Then replay it as often as needed, with no network calls and a fixed model latency:
+    uv run -m benchmarks.crew_benchmark benchmarks/environment.jsonl --kind environment --runs 5 --latency-ms 0
+
+The report separates MCP server startup, total crew time and simulated model time;
+crew time minus model time is our own tool/server/storage overhead.
+"""
+import argparse
+import json
+import os
+import time
+from uuid import uuid4
+
+from crewai_tools import MCPServerAdapter
+
+from crews.pipelines import CREW_BUILDERS
+from crews.replay import ReplayLLM
+from crews.servers import game_entity_server_params, json_file_tool_server_params
+from utils.game import get_campaign_context
+
+
+def noop_callback_factory(span_name: str, tags: list[str] = []):
+    def callback(data):
+        pass
+    return callback
+
+
+def run_benchmark(transcript_path: str, kind: str, description: str, game_id: str, runs: int, latency_ms: float, jitter_ms: float, seed: int) -> dict:
+    llm = ReplayLLM(transcript_path, latency_s=latency_ms / 1000, jitter_s=jitter_ms / 1000, seed=seed)
+    campaign_context = get_campaign_context(game_id)
+    samples = []
+    for _ in range(runs):
+        llm.reset()
+        calls_before, model_time_before = llm.calls, llm.simulated_latency_s
+
+        started = time.perf_counter()
+        with MCPServerAdapter(game_entity_server_params()) as game_entity_tools, MCPServerAdapter(json_file_tool_server_params()) as json_file_tools:
+            startup_s = time.perf_counter() - started
+            crew = CREW_BUILDERS[kind](llm, game_entity_tools, json_file_tools, campaign_context, noop_callback_factory)
+            kickoff_started = time.perf_counter()
+            crew.kickoff(inputs={"request_id": str(uuid4()), "description": description, "game_id": game_id})
+            crew_s = time.perf_counter() - kickoff_started
+
+        model_s = llm.simulated_latency_s - model_time_before
+        samples.append({
+            "mcp_startup_s": round(startup_s, 4),
+            "crew_s": round(crew_s, 4),
+            "model_s": round(model_s, 4),
+            "overhead_s": round(crew_s - model_s, 4),
+            "llm_calls": llm.calls - calls_before,
+        })
+
+    def mean(key):
+        return round(sum(s[key] for s in samples) / len(samples), 4)
+
+    return {
+        "kind": kind,
+        "runs": runs,
+        "latency_ms": latency_ms,
+        "mean": {key: mean(key) for key in ("mcp_startup_s", "crew_s", "model_s", "overhead_s", "llm_calls")},
+        "samples": samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded crew transcript and time our own overhead.")
+    parser.add_argument("transcript", help="JSONL transcript written with LLM_BACKEND=record")
+    parser.add_argument("--kind", choices=sorted(CREW_BUILDERS), default="environment")
+    parser.add_argument("--description", default="The Great Tree in the center of Unka")
+    parser.add_argument("--game-id", default=os.getenv("GAME_ID"))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected model latency per LLM call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra seeded random latency per LLM call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = run_benchmark(args.transcript, args.kind, args.description, args.game_id, args.runs, args.latency_ms, args.jitter_ms, args.seed)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Generate a large, realistic synthetic campaign under output/<game_id>/ for load testing.
+
+Characters and environments come from the normal builders (build_random_character,
+build_random_environment, FantasyNameGenerator) and are written through
+save_game_entity_fn, so the tree looks exactly like one produced by the crews.
+Environments reference characters through their `creatures` id lists.
+
+Example:
+    uv run -m benchmarks.generate_campaign --game-id loadtest --characters 20000 --environments 5000 --workers 8
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from servers.character_creator.character import build_random_character
+from servers.character_creator.name_generator import FantasyNameGenerator
+from servers.environments.environments import build_random_environment
+from servers.file_utils.json import save_game_entity_fn
+
+WORDS = (
+    "ancient ash banner bridge candle cellar chapel cliff crown dagger dusk ember feast ferry "
+    "forge frost grove harbor hearth hollow iron lantern ledger market mist moor oath orchard "
+    "plague quarry raven relic river ruin salt shrine smoke spire storm tavern thorn tide tower "
+    "vault village vow watch well wind wolf"
+).split()
+
+ENVIRONMENT_SUFFIXES = ["Keep", "Crossing", "Market", "Hollow", "Inn", "Shrine", "Docks", "Watchtower", "Cellar", "Grove"]
+
+
+def long_text(rng: random.Random, words: int) -> str:
+    sentences, current = [], []
+    for _ in range(words):
+        current.append(rng.choice(WORDS))
+        if len(current) >= rng.randint(8, 16):
+            sentences.append(" ".join(current).capitalize() + ".")
+            current = []
+    if current:
+        sentences.append(" ".join(current).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def make_characters(game_id: str, start: int, count: int, seed: int, text_words: int) -> list[str]:
+    # The name generator draws from the global RNG, so seed it too for reproducible runs.
+    random.seed(seed + start)
+    rng = random.Random(seed + start)
+    ids = []
+    for index in range(start, start + count):
+        character = build_random_character(
+            rng=rng,
+            request_id=f"synthetic-{index}",
+            game_id=game_id,
+            description=long_text(rng, 6),
+            personality_profile=long_text(rng, text_words),
+        )
+        for _ in range(rng.randint(0, 9)):
+            character.level_up(rng=rng)
+        save_game_entity_fn(character.as_dict())
+        ids.append(character.id)
+    return ids
+
+
+def make_environments(game_id: str, start: int, count: int, seed: int, text_words: int, character_ids: list[str], max_creatures: int) -> int:
+    random.seed(seed + 1_000_003 + start)
+    rng = random.Random(seed + 1_000_003 + start)
+    names = FantasyNameGenerator()
+    for index in range(start, start + count):
+        environment = build_random_environment(
+            name=f"{names.generate_name()} {rng.choice(ENVIRONMENT_SUFFIXES)}",
+            rng=rng,
+            request_id=f"synthetic-{index}",
+            game_id=game_id,
+            description=long_text(rng, text_words),
+        )
+        if character_ids and max_creatures:
+            environment.creatures = rng.sample(character_ids, k=min(len(character_ids), rng.randint(0, max_creatures)))
+        environment.hooks = long_text(rng, max(8, text_words // 4))
+        save_game_entity_fn(environment.as_dict())
+    return count
+
+
+def chunks(total: int, workers: int) -> list[tuple[int, int]]:
+    size = max(1, -(-total // max(1, workers)))
+    return [(start, min(size, total - start)) for start in range(0, total, size)]
+
+
+def generate_campaign(game_id: str, characters: int, environments: int, workers: int = os.cpu_count() or 1, seed: int = 0, text_words: int = 120, max_creatures: int = 6) -> dict:
+    started = time.perf_counter()
+    os.makedirs(f"output/{game_id}", exist_ok=True)
+    information_path = f"output/{game_id}/game_information.json"
+    if not os.path.exists(information_path):
+        with open(information_path, "w") as f:
+            json.dump({"game_id": game_id, "background": long_text(random.Random(seed), 80)}, f, indent=4)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        character_ids = []
+        for ids in pool.map(make_characters, *zip(*[(game_id, s, c, seed, text_words) for s, c in chunks(characters, workers)])):
+            character_ids.extend(ids)
+        characters_done = time.perf_counter()
+        environment_jobs = [(game_id, s, c, seed, text_words, character_ids, max_creatures) for s, c in chunks(environments, workers)]
+        written = sum(pool.map(make_environments, *zip(*environment_jobs))) if environment_jobs else 0
+
+    finished = time.perf_counter()
+    return {
+        "game_id": game_id,
+        "characters": len(character_ids),
+        "environments": written,
+        "characters_s": round(characters_done - started, 3),
+        "environments_s": round(finished - characters_done, 3),
+        "entities_per_s": round((len(character_ids) + written) / (finished - started), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic campaign for load testing.")
+    parser.add_argument("--game-id", default="loadtest")
+    parser.add_argument("--characters", type=int, default=1000)
+    parser.add_argument("--environments", type=int, default=250)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--text-words", type=int, default=120, help="Approximate words in long text fields")
+    parser.add_argument("--max-creatures", type=int, default=6, help="Max character ids referenced per environment")
+    args = parser.parse_args()
+    summary = generate_campaign(args.game_id, args.characters, args.environments, args.workers, args.seed, args.text_words, args.max_creatures)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
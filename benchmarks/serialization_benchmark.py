@@ -0,0 +1,83 @@
+"""Compare on-disk size and parse throughput of the entity serialization formats.
+
+    uv run -m benchmarks.serialization_benchmark --entities 2000
+
+"legacy" is the tab-indented JSON that save_game_entity_fn used to write.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from servers.character_creator.character import build_random_character
+from servers.environments.environments import build_random_environment
+from servers.file_utils.serialization import FORMATS, dumps_entity, loads_entity, msgpack, orjson
+from benchmarks.generate_campaign import long_text
+
+
+def sample_entities(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    entities = []
+    for index in range(count):
+        if index % 2:
+            entity = build_random_character(rng=rng, game_id="bench", description=long_text(rng, 6),
+                                            personality_profile=long_text(rng, 80)).as_dict()
+        else:
+            entity = build_random_environment(rng=rng, game_id="bench", description=long_text(rng, 120)).as_dict()
+        entities.append(entity)
+    return entities
+
+
+def encoders() -> dict:
+    available = {"legacy": lambda e: json.dumps(e, indent="\t").encode("utf-8")}
+    for fmt in FORMATS:
+        if fmt == "orjson" and orjson is None:
+            continue
+        if fmt == "msgpack" and msgpack is None:
+            continue
+        available[fmt] = lambda e, fmt=fmt: dumps_entity(e, fmt)
+    return available
+
+
+def run_benchmark(entities: list[dict], repeats: int = 3) -> list[dict]:
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, encode in encoders().items():
+            blobs = [encode(e) for e in entities]
+            path = os.path.join(directory, name)
+            with open(path, "wb") as f:
+                for blob in blobs:
+                    f.write(blob)
+            best = float("inf")
+            for _ in range(repeats):
+                started = time.perf_counter()
+                for blob in blobs:
+                    loads_entity(blob)
+                best = min(best, time.perf_counter() - started)
+            total_bytes = sum(len(b) for b in blobs)
+            rows.append({
+                "format": name,
+                "bytes_total": total_bytes,
+                "bytes_per_entity": round(total_bytes / len(blobs), 1),
+                "parse_entities_per_s": round(len(blobs) / best, 1),
+                "parse_mb_per_s": round(total_bytes / best / 1e6, 2),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entity serialization size/throughput benchmark.")
+    parser.add_argument("--entities", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    rows = run_benchmark(sample_entities(args.entities), args.repeats)
+    print(f"{'format':<10}{'bytes/entity':>14}{'entities/s':>14}{'MB/s':>10}")
+    for row in rows:
+        print(f"{row['format']:<10}{row['bytes_per_entity']:>14}{row['parse_entities_per_s']:>14}{row['parse_mb_per_s']:>10}")
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Cold-start import cost of the MCP servers and crew entry points.
+
+    uv run -m benchmarks.startup_benchmark
+    uv run -m benchmarks.startup_benchmark --modules servers.json_file_tool --runs 5 --budget-ms 700
+
+Each module is imported in a fresh interpreter under `python -X importtime`, the way every
+MCPServerAdapter spawn pays for it. The report gives the median cumulative import time of
+the module, the wall time of the whole interpreter start and the heaviest imports by self
+time. With --budget-ms the run exits non-zero when any module's median import time is over
+budget, so regressions (a heavy dependency imported at module level) are caught.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = (
+    "servers.json_file_tool",
+    "servers.game_entity_maker",
+    "servers.combat_server",
+    "instrumentation.langfuse",
+    "crews.pipelines",
+)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """-X importtime output -> {module: (self_us, cumulative_us)}."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_once(module: str, python: str = sys.executable) -> dict:
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    started = time.perf_counter()
+    completed = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1]}
+    timings = parse_importtime(completed.stderr)
+    return {"wall_ms": wall_ms, "import_ms": timings.get(module, (0, 0))[1] / 1000, "timings": timings}
+
+
+def measure(module: str, runs: int = 3, top: int = 10) -> dict:
+    samples = [measure_once(module) for _ in range(runs)]
+    if "error" in samples[0]:
+        return {"module": module, "error": samples[0]["error"]}
+    samples.sort(key=lambda sample: sample["import_ms"])
+    median = samples[len(samples) // 2]
+    heaviest = sorted(median["timings"].items(), key=lambda item: -item[1][0])[:top]
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "wall_ms": round(statistics.median(s["wall_ms"] for s in samples), 1),
+        "modules_imported": len(median["timings"]),
+        "heaviest_self_ms": {name: round(self_us / 1000, 1) for name, (self_us, _) in heaviest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of server and crew modules.")
+    parser.add_argument("--modules", nargs="+", default=list(DEFAULT_MODULES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Heaviest imports (by self time) to report per module")
+    parser.add_argument("--budget-ms", type=float, help="Fail when a module's median import time exceeds this")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    rows = [measure(module, args.runs, args.top) for module in args.modules]
+    print(f"{'module':<30}{'import ms':>11}{'wall ms':>10}{'modules':>9}")
+    for row in rows:
+        if "error" in row:
+            print(f"{row['module']:<30}  failed: {row['error']}")
+            continue
+        print(f"{row['module']:<30}{row['import_ms']:>11}{row['wall_ms']:>10}{row['modules_imported']:>9}")
+        for name, self_ms in row["heaviest_self_ms"].items():
+            print(f"    {self_ms:>8} ms  {name}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+    over = [row["module"] for row in rows if args.budget_ms and row.get("import_ms", 0) > args.budget_ms]
+    if over:
+        print(f"Over the {args.budget_ms} ms budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,11 @@ import warnings
 from pydantic import PydanticDeprecatedSince20
 from uuid import uuid4
 from crewai import LLM
-import instrumentation.langfuse
+from instrumentation.langfuse import init_tracing
 import openlit
+from crews.saving.saving import build_save_check_hook
 
+init_tracing()
 openlit.init()
 
 llm = LLM(
@@ -38,7 +40,7 @@ crew_input = {
 server_params_list = [
     StdioServerParameters(
         command="python3", 
-        args=["servers/character_maker.py"],
+        args=["servers/game_entity_maker.py"],
         env={"UV_PYTHON": "3.12", **os.environ},
     ),
     StdioServerParameters(
@@ -61,10 +63,12 @@ with MCPServerAdapter(server_params_list) as aggregated_tools:
     )
     character_creation_task = Task(
         name="character_creation",
-        description="Make a character for the user's request with this description: '{description}'. Here is the request ID: '{request_id}' and the game ID: '{game_id}'. Do not make up values, just pass whatever values the user gives you to the tool and let it do the rest.",
-        expected_output="The resulting game entity (character) as a dictionary.",
+        description="Make a character for the user's request with this description: '{description}'. Here is the request ID: '{request_id}' and the game ID: '{game_id}'. Do not make up values, just pass whatever values the user gives you to the tool and let it do the rest. Call it with persist=true so it saves the character.",
+        expected_output='The {"id", "filename"} JSON object the tool returned.',
         agent=agent,
         verbose=True,
+        # The tool saves the character as it creates it, so the personality task can find it by id
+        callback=build_save_check_hook(),
     )
 
     personality_agent = Agent(
@@ -77,23 +81,15 @@ with MCPServerAdapter(server_params_list) as aggregated_tools:
     )
     personality_task = Task(
         name="personality_task",
-        description="Write a personality_profile for the character below and add it to the character using the tool. Here is the current character:\n\n{character_creation_task.output.raw_output}",
+        description="Load the character the previous task saved (get_game_entity_by_id with its id), write a personality_profile for it and add it to the character using the tool.",
         expected_output="Single 40-80 word sentence fragment",
         agent=personality_agent,
         tools=aggregated_tools,
         verbose=True,
     )
-
-    save_entity_task = Task(
-        name="save_entity_task",
-        description="Save the game entity (the character) as a JSON file:\n\n{personality_task.output.raw_output}",
-        expected_output="The filename where the character was saved.",
-        agent=agent,
-        verbose=True,
-    )
     crew = Crew(
         agents=[agent, personality_agent],
-        tasks=[character_creation_task, save_entity_task, personality_task],
+        tasks=[character_creation_task, personality_task],
         process=Process.sequential,
         verbose=True,
     )
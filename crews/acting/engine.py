@@ -0,0 +1,152 @@
+import json
+import os
+import re
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from constants.paths import BASE_PATH
+from crews.acting.history import RollingHistory
+from crews.outputs import Intention, OutputParseError, task_output
+from servers.file_utils.events import fold_pending
+from servers.file_utils.generation import get_generation
+from servers.file_utils.ripgrep import find_entities_by_ids
+from servers.file_utils.serialization import read_entity
+from servers.utils.context import pack_entity
+
+# Character fields the intention planner actually uses
+RECORD_FIELDS = (
+    "name", "race", "class", "level", "description", "personality_profile", "current_goal",
+    "max_hp", "ac", "spell_slots", "ability_scores",
+)
+RECORD_TOKEN_BUDGET = 400
+YAML_FIELD = re.compile(r"^\s*(intention|rationale)\s*:\s*(.+?)\s*$", re.MULTILINE)
+
+
+def get_turn_log_path(game_id: str, scene_id: str) -> str:
+    return BASE_PATH + game_id + "/.turns/" + scene_id + ".jsonl"
+
+
+def parse_intention(result) -> dict:
+    """
+    The intention of a crew result: the validated output when the task produced one, else
+    parsed from the raw text (JSON, then the older YAML form, then the text as it is).
+    """
+    try:
+        return task_output(result, Intention).model_dump()
+    except OutputParseError:
+        raw = getattr(result, "raw", str(result))
+        fields = dict(YAML_FIELD.findall(raw))
+        return {"intention": fields.get("intention", raw.strip()), "rationale": fields.get("rationale", "")}
+
+
+class CharacterCache:
+    """Compact character records, re-read only when the game's storage generation moves."""
+
+    def __init__(self, game_id: str):
+        self.game_id = game_id
+        self.generation = None
+        self.records: dict[str, dict] = {}
+
+    def get(self, character_id: str) -> dict:
+        return self.get_many([character_id])[character_id]
+
+    def get_many(self, character_ids: list[str]) -> dict[str, dict]:
+        """Records for all ids, loading every missing one in a single bulk lookup."""
+        generation = get_generation(self.game_id)
+        if generation != self.generation:
+            self.records.clear()
+            self.generation = generation
+        missing = [character_id for character_id in character_ids if character_id not in self.records]
+        if missing:
+            paths = find_entities_by_ids(missing, self.game_id, "character")
+            for character_id in missing:
+                if character_id not in paths:
+                    raise FileNotFoundError(f"No character found with id: {character_id}")
+                character = fold_pending(self.game_id, read_entity(paths[character_id]))
+                self.records[character_id] = pack_entity(character, RECORD_TOKEN_BUDGET, "character", RECORD_FIELDS)
+        return {character_id: self.records[character_id] for character_id in character_ids}
+
+
+class TurnEngine:
+    """
+    Cycle a scene's characters through intention-planning turns. The crew is built once and
+    kicked off per turn; each turn sees the cached character record and a RollingHistory
+    window instead of a re-lookup and the full history. Turns are appended to
+    output/<game_id>/.turns/<scene_id>.jsonl, and a scene with an existing log resumes.
+    """
+
+    def __init__(self, crew, game_id: str, character_ids: list[str], room_description: str,
+                 scene_id: str | None = None, history: RollingHistory | None = None):
+        self.crew = crew
+        self.game_id = game_id
+        self.character_ids = character_ids
+        self.room_description = room_description
+        self.scene_id = scene_id or str(uuid4())
+        self.history = history or RollingHistory()
+        self.characters = CharacterCache(game_id)
+        self.turn_log_path = get_turn_log_path(game_id, self.scene_id)
+        self.turn = 0
+        self.resume()
+
+    def resume(self):
+        if not os.path.exists(self.turn_log_path):
+            return
+        with open(self.turn_log_path, "r") as f:
+            for line in f:
+                if line.strip():
+                    self.history.append(json.loads(line)["event"])
+                    self.turn += 1
+
+    def seed(self, events: list[dict]):
+        """Add events that happened before the engine took over (not written to the turn log)."""
+        for event in events:
+            self.history.append(event)
+
+    def next_character_id(self) -> str:
+        return self.character_ids[self.turn % len(self.character_ids)]
+
+    def build_inputs(self, character_id: str, record: dict) -> dict:
+        return {
+            "request_id": str(uuid4()),
+            "game_id": self.game_id,
+            "current_character_id": character_id,
+            "current_character_name": record.get("name", character_id),
+            "character_record": json.dumps(record, separators=(",", ":")),
+            "room_description": self.room_description,
+            **self.history.prompt_inputs(),
+        }
+
+    def record_turn(self, inputs: dict, result, latency: float) -> dict:
+        """Add a planned intention to the history and append it to the turn log."""
+        parsed = parse_intention(result)
+        event = {
+            "character_id": inputs["current_character_id"],
+            "character_name": inputs["current_character_name"],
+            "action": parsed["intention"],
+        }
+        self.history.append(event)
+        entry = {
+            "turn": self.turn,
+            "request_id": inputs["request_id"],
+            "event": event,
+            "rationale": parsed["rationale"],
+            "latency_s": round(latency, 3),
+            "prompt_chars": len(inputs["character_record"]) + len(inputs["history_summary"]) + len(json.dumps(inputs["history"])),
+            "timestamp": datetime.now().isoformat(),
+        }
+        os.makedirs(os.path.dirname(self.turn_log_path), exist_ok=True)
+        with open(self.turn_log_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.turn += 1
+        return entry
+
+    def run_turn(self) -> dict:
+        character_id = self.next_character_id()
+        inputs = self.build_inputs(character_id, self.characters.get(character_id))
+        started = time.perf_counter()
+        result = self.crew.kickoff(inputs=inputs)
+        return self.record_turn(inputs, result, time.perf_counter() - started)
+
+    def run(self, turns: int) -> list[dict]:
+        return [self.run_turn() for _ in range(turns)]
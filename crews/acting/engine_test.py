@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+from crews.acting.engine import TurnEngine, parse_intention
+from crews.acting.history import RollingHistory
+from crews.acting.rounds import plan_round
+from servers.file_utils.json import save_game_entity_fn
+
+
+class FakeResult:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+class FakeCrew:
+    def __init__(self):
+        self.inputs = []
+
+    def kickoff(self, inputs):
+        self.inputs.append(inputs)
+        return FakeResult(f"```yaml\nintention: I speak, turn {len(self.inputs)}\nrationale: because\n```")
+
+
+def test_turn_engine_bounds_history_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for character_id, name in [("a1", "Ann"), ("b2", "Bob")]:
+        save_game_entity_fn({"id": character_id, "entity_type": "character", "name": name, "description": "x",
+                             "game_id": "g1", "personality_profile": "bold"})
+    crew = FakeCrew()
+    engine = TurnEngine(crew, "g1", ["a1", "b2"], "A tavern", scene_id="s1", history=RollingHistory(window=3))
+    engine.run(20)
+    assert [i["current_character_name"] for i in crew.inputs[:3]] == ["Ann", "Bob", "Ann"]
+    assert all(len(i["history"]) < 6 for i in crew.inputs)
+    assert "Bob I speak, turn 20" not in crew.inputs[-1]["history_summary"]
+    assert json.loads(crew.inputs[-1]["character_record"])["personality_profile"] == "bold"
+
+    resumed = TurnEngine(crew, "g1", ["a1", "b2"], "A tavern", scene_id="s1", history=RollingHistory(window=3))
+    assert resumed.turn == 20 and resumed.next_character_id() == "a1"
+    assert resumed.history.recent == engine.history.recent
+
+
+def test_parse_intention_falls_back_to_raw_text():
+    assert parse_intention("intention: I run\nrationale: fear") == {"intention": "I run", "rationale": "fear"}
+    assert parse_intention("I hide.")["intention"] == "I hide."
+
+
+class FakeAsyncCrew:
+    running = 0
+    peak = 0
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def kickoff_async(self, inputs):
+        FakeAsyncCrew.running += 1
+        FakeAsyncCrew.peak = max(FakeAsyncCrew.peak, FakeAsyncCrew.running)
+        await asyncio.sleep(0.01)
+        FakeAsyncCrew.running -= 1
+        self.calls.append(inputs)
+        if inputs["current_character_id"] == "c3":
+            raise RuntimeError("model timeout")
+        return FakeResult(json.dumps({"intention": f"{inputs['current_character_name']} acts", "rationale": "why not"}))
+
+
+def test_plan_round_plans_concurrently_and_merges_in_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for character_id, name in [("a1", "Ann"), ("b2", "Bob"), ("c3", "Cat")]:
+        save_game_entity_fn({"id": character_id, "entity_type": "character", "name": name, "description": "x",
+                             "game_id": "g1"})
+    calls = []
+    engine = TurnEngine(None, "g1", ["a1", "b2", "c3"], "A tavern", scene_id="s1")
+    result = asyncio.run(plan_round(engine, lambda: FakeAsyncCrew(calls), concurrency=2))
+    assert FakeAsyncCrew.peak == 2
+    # Every actor planned from the same starting history
+    assert all(call["history"] == [] for call in calls)
+    assert [entry["event"]["action"] for entry in result["turns"]] == ["Ann acts", "Bob acts"]
+    assert result["errors"] == [{"character_id": "c3", "error": "RuntimeError: model timeout"}]
+    assert engine.turn == 2 and len(engine.history.recent) == 2
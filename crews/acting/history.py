@@ -0,0 +1,66 @@
+import re
+
+# Events kept verbatim in the prompt; older ones are folded into the summary
+HISTORY_WINDOW = 6
+SUMMARY_MAX_CHARS = 1_200
+EVENT_MAX_CHARS = 160
+
+
+def describe_event(event: dict) -> str:
+    action = re.sub(r"\s+", " ", event.get("action", "")).strip()
+    if len(action) > EVENT_MAX_CHARS:
+        action = action[:EVENT_MAX_CHARS].rstrip() + "…"
+    return f"{event.get('character_name', 'Someone')} {action}"
+
+
+def extractive_summarizer(summary: str, events: list[dict], max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """
+    Append one clipped line per event and drop the oldest lines once over max_chars.
+    No model call, so folding costs nothing.
+    """
+    lines = [line for line in summary.split("\n") if line] + [describe_event(event) for event in events]
+    while lines and len("\n".join(lines)) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def llm_summarizer(llm, max_chars: int = SUMMARY_MAX_CHARS):
+    """Summarizer that asks the LLM to merge folded events into the running summary."""
+    def summarize(summary: str, events: list[dict]) -> str:
+        prompt = (
+            f"Rewrite this running summary of a role-playing scene so it also covers the new events. "
+            f"Keep names, promises, threats and unresolved conflicts; drop flavour. "
+            f"At most {max_chars} characters, plain prose.\n\n"
+            f"Summary so far:\n{summary or '(nothing yet)'}\n\nNew events:\n"
+            + "\n".join(describe_event(event) for event in events)
+        )
+        return str(llm.call(prompt)).strip()[:max_chars]
+    return summarize
+
+
+class RollingHistory:
+    """
+    Scene history as a bounded summary plus the last `window` events verbatim, so the prompt
+    stays the same size however long the scene runs. Events are folded into the summary in
+    batches of `window`, which keeps summarizer calls to one per `window` turns.
+    """
+
+    def __init__(self, window: int = HISTORY_WINDOW, summarizer=extractive_summarizer):
+        self.window = window
+        self.summarizer = summarizer
+        self.summary = ""
+        self.recent: list[dict] = []
+        self.total_events = 0
+
+    def append(self, event: dict):
+        self.recent.append(event)
+        self.total_events += 1
+        if len(self.recent) >= 2 * self.window:
+            folded, self.recent = self.recent[: self.window], self.recent[self.window:]
+            self.summary = self.summarizer(self.summary, folded)
+
+    def prompt_inputs(self) -> dict:
+        return {
+            "history_summary": self.summary or "(the scene has just started)",
+            "history": list(self.recent),
+        }
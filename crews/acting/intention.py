@@ -0,0 +1,66 @@
+from crewai import Agent, Task
+
+from crews.outputs import Intention
+
+def build_intention_agent(llm, tools=None):
+    return Agent(
+        role="Character Intention Planner",
+        goal=(
+            "Given recent history and the character’s full record (stats, personality, "
+            "backstory, current conditions, etc.), decide what the character INTENDS to do next."
+        ),
+        backstory=(
+            "A seasoned D&D player who always speaks in-character, framing intentions the same "
+            "way a player would tell the DM: clear, actionable, and rooted in role-playing logic."
+        ),
+        tools=tools or [],
+        verbose=True,
+        llm=llm,
+    )
+
+def build_intention_task(agent, callback_factory):
+    return Task(
+        name="intention_planning",
+        description=(
+            "## CONTEXT\n"
+            "- Character: **{current_character_name}** (id {current_character_id})\n"
+            "- Character record: {character_record}\n"
+            "- Game ID: **{game_id}**, Request ID: **{request_id}**\n"
+            "- Room Description: **{room_description}**\n"
+            "- Story so far: {history_summary}\n"
+            "- Recent events: **{history}**\n\n"
+            "## INSTRUCTIONS\n"
+            "1. Use the character record above: **personality_profile**, current goal, hit points, "
+            "spell slots and class. It is current; do not look the character up again.\n"
+            "2. Decide ONE concrete intention—exactly what the character will announce to the DM "
+            "on their next turn. Phrase it in first-person present tense (e.g., "
+            "“I charge the ogre and swing my greataxe” or “I cast *Hold Person* on the cultist in the rear”).\n"
+            "3. Provide a brief **rationale** that cites at least one element from the personality "
+            "profile *or* the recent events.\n\n"
+            "## OUTPUT FORMAT\n"
+            "A single JSON object:\n"
+            '{"intention": "<one-sentence, first-person declaration>", '
+            '"rationale": "<one short sentence referencing personality/history>"}\n\n'
+            "## EXAMPLES\n"
+            "### Example 1\n"
+            "History snippet: *The party is pinned down behind crates while hobgoblins fire arrows.*\n"
+            "Personality: ‘reckless, loyal, hates ranged combat’\n"
+            "\n"
+            '{"intention": "I leap over the crates and rush the nearest hobgoblin, drawing their fire away from my friends!", '
+            '"rationale": "My recklessness and loyalty drive me to protect the party even if it means exposing myself."}\n'
+            "### Example 2\n"
+            "History snippet: *The necromancer just raised two skeletons; the cleric is out of spell slots.*\n"
+            "Personality: ‘strategic thinker, values efficiency’\n"
+            "\n"
+            '{"intention": "I hurl a flask of holy water to shatter between the skeletons and the necromancer.", '
+            '"rationale": "A single action that can damage multiple undead aligns with my efficiency-first mindset."}\n'
+        ),
+        expected_output=(
+            "A JSON object with **intention** and **rationale** fields exactly as shown above, "
+            "no extra keys, no narrative prose."
+        ),
+        output_pydantic=Intention,
+        agent=agent,
+        verbose=True,
+        callback=callback_factory("intention_planning_task_callback", tags=["acting"]),
+    )
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+from crews.acting.engine import TurnEngine
+
+
+async def plan_round(engine: TurnEngine, crew_factory, concurrency: int = 4) -> dict:
+    """
+    Plan one intention per actor at once. Intentions within a round don't depend on each
+    other, so every actor sees the history as it stood when the round began; records come
+    from one bulk lookup and each actor gets its own crew (from crew_factory) so at most
+    `concurrency` kickoffs run in parallel. Results are merged in the engine's actor order.
+    """
+    records = engine.characters.get_many(engine.character_ids)
+    planned = [engine.build_inputs(character_id, records[character_id]) for character_id in engine.character_ids]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def plan_one(inputs):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await crew_factory().kickoff_async(inputs=inputs)
+                return inputs, result, time.perf_counter() - started, None
+            except Exception as e:
+                return inputs, None, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+    round_number = engine.turn // len(engine.character_ids)
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(plan_one(inputs) for inputs in planned))
+    wall_time = time.perf_counter() - started
+
+    turns, errors = [], []
+    for inputs, result, latency, error in outcomes:
+        if error:
+            errors.append({"character_id": inputs["current_character_id"], "error": error})
+        else:
+            turns.append(engine.record_turn(inputs, result, latency))
+    return {
+        "round": round_number,
+        "wall_time_s": round(wall_time, 3),
+        "sequential_time_s": round(sum(latency for _, _, latency, _ in outcomes), 3),
+        "turns": turns,
+        "errors": errors,
+    }
+
+
+async def run_rounds(engine: TurnEngine, crew_factory, rounds: int, concurrency: int = 4) -> list[dict]:
+    return [await plan_round(engine, crew_factory, concurrency) for _ in range(rounds)]
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import os
+import time
+from uuid import uuid4
+
+from crews.pipelines import CREW_BUILDERS
+from utils.game import get_campaign_context
+
+
+def load_requests(path: str) -> list[dict]:
+    """
+    Load crew requests from a JSONL file. Each line needs a description and may set
+    kind ("environment" or "character", default environment), request_id and game_id.
+    """
+    requests = []
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            request = json.loads(line)
+            if "description" not in request:
+                raise ValueError(f"{path}:{line_number}: request is missing 'description'")
+            kind = request.get("kind", "environment")
+            if kind not in CREW_BUILDERS:
+                raise ValueError(f"{path}:{line_number}: unknown kind '{kind}', use one of {sorted(CREW_BUILDERS)}")
+            requests.append({
+                "kind": kind,
+                "description": request["description"],
+                "request_id": request.get("request_id") or str(uuid4()),
+                "game_id": request.get("game_id") or os.getenv("GAME_ID"),
+            })
+    return requests
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(results: list[dict], wall_time: float) -> dict:
+    latencies = [r["latency_s"] for r in results]
+    succeeded = [r for r in results if r["status"] == "ok"]
+    return {
+        "requests": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(results) / wall_time, 4) if wall_time else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 3),
+        "latency_p95_s": round(percentile(latencies, 95), 3),
+        "latency_max_s": round(max(latencies, default=0.0), 3),
+    }
+
+
+async def run_batch(requests, llm, game_entity_tools, json_file_tools, callback_factory, output_path: str, concurrency: int = 4, tracer=None) -> dict:
+    """
+    Run one crew per request with at most `concurrency` crews in flight.
+
+    Every crew gets fresh agents and tasks but shares the same warm MCP tool adapters and
+    LLM client. Results are appended to output_path as they complete, one JSON object per
+    line, and a summary with latency percentiles and throughput is returned.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    with open(output_path, "w") as output_file:
+        async def run_one(request):
+            async with semaphore:
+                started = time.perf_counter()
+                row = {**request, "status": "ok", "output": None, "error": None}
+                try:
+                    campaign_context = get_campaign_context(request["game_id"])
+                    crew = CREW_BUILDERS[request["kind"]](llm, game_entity_tools, json_file_tools, campaign_context, callback_factory)
+                    inputs = {k: request[k] for k in ("request_id", "description", "game_id")}
+                    if tracer is not None:
+                        with tracer.start_as_current_span(f"Batch {request['kind']} crew") as span:
+                            span.set_attribute("input.value", json.dumps(inputs))
+                            result = await crew.kickoff_async(inputs=inputs)
+                            span.set_attribute("output.value", str(result))
+                    else:
+                        result = await crew.kickoff_async(inputs=inputs)
+                    row["output"] = str(result)
+                except Exception as e:
+                    row["status"] = "error"
+                    row["error"] = f"{type(e).__name__}: {e}"
+                row["latency_s"] = round(time.perf_counter() - started, 3)
+                results.append(row)
+                output_file.write(json.dumps(row) + "\n")
+                output_file.flush()
+                print(f"[{len(results)}/{len(requests)}] {row['status']} {row['kind']} '{row['description']}' in {row['latency_s']}s")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run_one(request) for request in requests))
+        wall_time = time.perf_counter() - started
+
+    return summarize(results, wall_time)
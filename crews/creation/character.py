@@ -0,0 +1,36 @@
+from crewai import Agent, Task
+
+from crews.outputs import SavedEntity
+
+def build_character_creator_agent(llm, tools, campaign_context):
+    return Agent(
+            role="Character Maker",
+            goal="Make a character for the player.",
+            backstory=(
+                "An experienced Dungeon Master that can make characters for the player. "
+                "Characters are created and saved in one step, by calling the make_character "
+                "tool with persist=true. Here is some information about the world in which this "
+                "story takes place: "
+                f"{campaign_context['prompt_prefix']}"
+            ),
+            tools=tools,
+            verbose=True,
+            cache=False,
+            llm=llm,
+        )
+
+def build_character_creation_task(agent, callback_factory):
+    return Task(
+            name="character_creation",
+            description=(
+                "Make a character for the user's request with this description: '{description}'. "
+                "Here is the request ID: '{request_id}' and the game ID: '{game_id}'. "
+                "Do not make up values, just pass whatever values the user gives you to the tool "
+                "and let it do the rest. Call it with persist=true so it saves the character."
+            ),
+            expected_output='The {"id", "filename"} JSON object the tool returned, exactly as returned.',
+            output_pydantic=SavedEntity,
+            agent=agent,
+            verbose=True,
+            callback=callback_factory("character_creation_task_callback", tags=["character_creation"]),
+        )
@@ -1,6 +1,8 @@
 from crewai import Agent, Task
 
-def build_environment_creator_agent(llm, tools, game_information):
+from crews.outputs import SavedEntity
+
+def build_environment_creator_agent(llm, tools, campaign_context):
     return Agent(
             role="Environment Creator",
             goal=(
@@ -13,13 +15,11 @@ def build_environment_creator_agent(llm, tools, game_information):
                 "spaces for the story to unfold in rich ways. It is important for game entities to be"
                 "consistent with the world in which they exist. So, usually the work flow when creating"
                 "a new entity is to first do research by searching for existing entities"
-                "(using the find_entities tool) and then create a new entity (using the create_entity tool)."
-                "Generally, game entities like characters"
-                "and environments need to be CREATED first before they can be SAVED. So, tool calls"
-                "should happen in that order -- creation tools return properly formatted JSON objects"
-                "and save functions use those as input. Here is some information about the world in"
-                "which this story takes place: "
-                f"{game_information['background']}"
+                "(using the find_entities tool) and then create a new entity (using the create_environment tool)."
+                " Creation tools save the entity themselves when called with persist=true, so no"
+                " separate save call is needed. Here is some information about the world in"
+                " which this story takes place: "
+                f"{campaign_context['prompt_prefix']}"
             ),
             tools=tools,
             verbose=True,
@@ -34,9 +34,11 @@ def build_environment_creation_task(agent, callback_factory):
                 "Use the appropriate tools to create an environment for the user's request with this "
                 "description: '{description}'. "
                 "Here is the request ID: '{request_id}' and the game ID: '{game_id}'. "
-                "Be creative and elaborate in rich detail for story and game hooks."
+                "Be creative and elaborate in rich detail for story and game hooks. "
+                "Call create_environment with persist=true so it saves the environment."
             ),
-            expected_output="The resulting game entity (environment) as a dictionary.",
+            expected_output='The {"id", "filename"} JSON object the tool returned, exactly as returned.',
+            output_pydantic=SavedEntity,
             agent=agent,
             verbose=True,
             callback=callback_factory("environment_creation_task_callback", tags=["environment_creation"]),
@@ -0,0 +1,40 @@
+import os
+from crewai import LLM
+
+
+def build_llm(max_tokens: int = 1_000):
+    """
+    Build the crew LLM. LLM_BACKEND selects the backend:
+        live (default)  - call the provider;
+        record          - call the provider and append exchanges to LLM_TRANSCRIPT;
+        replay          - answer offline from LLM_TRANSCRIPT, sleeping LLM_REPLAY_LATENCY_MS per call
+                          ("recorded" replays the latency measured while recording).
+    """
+    backend = os.getenv("LLM_BACKEND", "live")
+    transcript_path = os.getenv("LLM_TRANSCRIPT", "llm_transcript.jsonl")
+    if backend == "replay":
+        from crews.replay import ReplayLLM
+        latency_ms = os.getenv("LLM_REPLAY_LATENCY_MS", "0")
+        return ReplayLLM(
+            transcript_path,
+            latency_s=None if latency_ms == "recorded" else float(latency_ms) / 1000,
+            jitter_s=float(os.getenv("LLM_REPLAY_JITTER_MS", "0")) / 1000,
+            seed=int(os.getenv("LLM_REPLAY_SEED", "0")),
+        )
+
+    llm = LLM(
+        model="openai/gpt-4o-mini", # call model by provider/model_name
+        temperature=0.8,
+        max_tokens=max_tokens,
+        top_p=0.9,
+        frequency_penalty=0.1,
+        presence_penalty=0.1,
+        stop=["END"],
+        api_key=os.getenv("OPENAI_API_KEY"),
+    )
+    if backend == "record":
+        from crews.replay import RecordingLLM
+        return RecordingLLM(llm, transcript_path)
+    if backend != "live":
+        raise ValueError(f"Unknown LLM_BACKEND '{backend}'; use live, record or replay")
+    return llm
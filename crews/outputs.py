@@ -0,0 +1,104 @@
+"""Structured outputs of crew tasks.
+
+Tasks set output_pydantic to one of these models, so crewai validates the final answer and
+downstream code reads result.pydantic instead of re-parsing text. parse_output() is the same
+validation for raw text (old transcripts, crews run without output_pydantic): it pulls the
+JSON out of a fenced block or surrounding prose, validates it, and on failure makes at most
+one repair attempt before raising OutputParseError.
+"""
+import json
+import re
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+FENCED_BLOCK = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+class ResearchDossier(BaseModel):
+    related_entities: list[str] = Field(default_factory=list, description="IDs or filenames of related entities")
+    narrative_clues: list[str] = Field(default_factory=list, description="Facts that must stay coherent")
+    tonal_guidelines: list[str] = Field(default_factory=list, description="Short phrases describing mood and aesthetic")
+
+
+class Intention(BaseModel):
+    intention: str = Field(description="One-sentence, first-person declaration of what the character does")
+    rationale: str = Field(default="", description="One short sentence referencing personality or history")
+
+
+class GameEntity(BaseModel):
+    """
+    A created or stored entity; fields beyond the common ones are kept as they are. Only id
+    and name are required: packed tool results (servers/utils/context.py) drop the rest first.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    entity_type: str = ""
+    name: str
+    description: str = ""
+    game_id: str = ""
+
+
+class SavedEntity(BaseModel):
+    """What make_character and create_environment return when called with persist=True."""
+    id: str
+    filename: str
+
+
+class EntitySearchResult(BaseModel):
+    entities: list[GameEntity] = Field(default_factory=list)
+
+
+class OutputParseError(ValueError):
+    pass
+
+
+def extract_json(raw: str) -> str:
+    """The JSON document inside raw: a fenced block if there is one, else the outermost {...} or [...]."""
+    raw = raw or ""
+    fenced = FENCED_BLOCK.search(raw)
+    if fenced:
+        return fenced.group(1).strip()
+    starts = [i for i in (raw.find("{"), raw.find("[")) if i != -1]
+    if not starts:
+        return raw.strip()
+    start = min(starts)
+    end = raw.rfind("}" if raw[start] == "{" else "]")
+    return raw[start : end + 1] if end > start else raw[start:]
+
+
+def parse_output(raw: str, model: type[BaseModel], repair=None) -> BaseModel:
+    """
+    Validate raw LLM text against model. When that fails and `repair` is given, it is called
+    once as repair(raw, model, error) and must return corrected text.
+    """
+    try:
+        return model.model_validate_json(extract_json(raw))
+    except ValidationError as e:
+        error = e
+    if repair is None:
+        raise OutputParseError(f"Output does not match {model.__name__}: {error}") from error
+    repaired = repair(raw, model, str(error))
+    try:
+        return model.model_validate_json(extract_json(repaired))
+    except ValidationError as e:
+        raise OutputParseError(f"Output does not match {model.__name__} after repair: {e}") from e
+
+
+def llm_repair(llm):
+    """A repair function that asks the LLM to rewrite the output as JSON matching the schema."""
+    def repair(raw: str, model: type[BaseModel], error: str) -> str:
+        prompt = (
+            f"Rewrite the text below as a single JSON object matching this JSON schema. "
+            f"Return only the JSON.\n\nSchema:\n{json.dumps(model.model_json_schema())}\n\n"
+            f"Validation errors:\n{error}\n\nText:\n{raw}"
+        )
+        return str(llm.call(prompt))
+    return repair
+
+
+def task_output(result, model: type[BaseModel], repair=None) -> BaseModel:
+    """The validated model of a crew or task result, parsing its raw text only when crewai did not."""
+    if isinstance(getattr(result, "pydantic", None), model):
+        return result.pydantic
+    return parse_output(getattr(result, "raw", str(result)), model, repair)
@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+from crews.outputs import (
+    EntitySearchResult, GameEntity, Intention, OutputParseError, ResearchDossier, parse_output, task_output,
+)
+from servers.file_utils.serialization import read_entity
+from servers.utils.context import pack_entity
+
+CHARACTERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output", "errotin", "character")
+
+
+def test_parse_output_reads_fenced_and_embedded_json():
+    raw = 'Here you go:\n```json\n{"intention": "I run", "rationale": "fear"}\n```'
+    assert parse_output(raw, Intention) == Intention(intention="I run", rationale="fear")
+    dossier = parse_output('Final answer: {"related_entities": ["a1"], "narrative_clues": []} END', ResearchDossier)
+    assert dossier.related_entities == ["a1"] and dossier.tonal_guidelines == []
+
+
+def test_parse_output_repairs_once_then_gives_up():
+    calls = []
+
+    def repair(raw, model, error):
+        calls.append(error)
+        return '{"id": "e1", "entity_type": "character", "name": "Ann", "level": 3}'
+
+    entity = parse_output('{"name": "Ann"}', GameEntity, repair)
+    assert len(calls) == 1 and entity.id == "e1" and entity.model_extra == {"level": 3}
+    with pytest.raises(OutputParseError):
+        parse_output("no json here", Intention, lambda raw, model, error: "still none")
+
+
+def test_task_output_prefers_validated_result():
+    class Result:
+        pydantic = Intention(intention="I hide")
+        raw = "not json"
+
+    assert task_output(Result(), Intention).intention == "I hide"
+
+
+def test_entity_search_result_accepts_packed_tool_output():
+    entities = [read_entity(os.path.join(CHARACTERS_DIR, fname)) for fname in sorted(os.listdir(CHARACTERS_DIR))]
+    packed = [pack_entity(entity, budget) for entity in entities for budget in (40, 300)]
+    result = parse_output(json.dumps({"entities": packed}), EntitySearchResult)
+    assert [entity.id for entity in result.entities] == [entity["id"] for entity in packed]
@@ -0,0 +1,67 @@
+from crewai import Crew, Process
+
+from crews.research.research_agent import build_research_agent
+from crews.research.research_task import build_research_task
+from crews.creation.environment import build_environment_creator_agent, build_environment_creation_task
+from crews.creation.character import build_character_creator_agent, build_character_creation_task
+from crews.saving.saving import build_save_check_hook
+from crews.acting.intention import build_intention_agent, build_intention_task
+
+
+def build_environment_crew(llm, game_entity_tools, json_file_tools, campaign_context, callback_factory):
+    """
+    Research -> create environment, saved by the creation tool and checked by a post-task
+    hook. Agents are fresh per call; tools can be shared.
+    """
+    research_agent = build_research_agent(llm, json_file_tools)
+    research_task = build_research_task(research_agent, callback_factory)
+
+    environment_creator_agent = build_environment_creator_agent(llm, game_entity_tools, campaign_context)
+    environment_creation_task = build_environment_creation_task(environment_creator_agent, callback_factory)
+    environment_creation_task.callback = build_save_check_hook(environment_creation_task.callback)
+
+    return Crew(
+        agents=[research_agent, environment_creator_agent],
+        tasks=[research_task, environment_creation_task],
+        process=Process.sequential,
+        verbose=True,
+        step_callback=callback_factory("crew_step_callback"),
+        task_callback=callback_factory("crew_task_callback"),
+    )
+
+
+def build_character_crew(llm, game_entity_tools, json_file_tools, campaign_context, callback_factory):
+    """Create character, saved by the creation tool and checked by a post-task hook."""
+    character_creator_agent = build_character_creator_agent(llm, game_entity_tools, campaign_context)
+    character_creation_task = build_character_creation_task(character_creator_agent, callback_factory)
+    character_creation_task.callback = build_save_check_hook(character_creation_task.callback)
+
+    return Crew(
+        agents=[character_creator_agent],
+        tasks=[character_creation_task],
+        process=Process.sequential,
+        verbose=True,
+        step_callback=callback_factory("crew_step_callback"),
+        task_callback=callback_factory("crew_task_callback"),
+    )
+
+
+def build_acting_crew(llm, callback_factory):
+    """Plan one character's intention. Needs no tools: the turn engine passes the character record in."""
+    intention_agent = build_intention_agent(llm)
+    intention_task = build_intention_task(intention_agent, callback_factory)
+
+    return Crew(
+        agents=[intention_agent],
+        tasks=[intention_task],
+        process=Process.sequential,
+        verbose=True,
+        step_callback=callback_factory("crew_step_callback"),
+        task_callback=callback_factory("crew_task_callback"),
+    )
+
+
+CREW_BUILDERS = {
+    "environment": build_environment_crew,
+    "character": build_character_crew,
+}
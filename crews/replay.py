@@ -0,0 +1,158 @@
+"""Record/replay LLM backends for offline, deterministic crew runs.
+
+RecordingLLM wraps a real LLM and appends every exchange to a JSONL transcript.
+ReplayLLM answers from that transcript with no network access and an injected,
+seeded latency. Crews still execute their real tools, so a replayed run measures
+our own overhead (MCP startup, search, saves) without model time or variance.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+
+from crewai.llms.base_llm import BaseLLM
+
+# Ids and timestamps differ on every run; mask them so recorded prompts still match.
+VOLATILE_PATTERNS = [
+    re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE),
+    re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?"),
+]
+
+
+def normalize_text(text: str) -> str:
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub("<volatile>", text)
+    return text
+
+
+def as_messages(messages) -> list[dict]:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return list(messages)
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def prompt_key(messages) -> str:
+    """Key for one exact exchange: every message, with volatile values masked."""
+    normalized = [{"role": m.get("role"), "content": normalize_text(str(m.get("content", "")))} for m in as_messages(messages)]
+    return hash_text(json.dumps(normalized, sort_keys=True))
+
+
+def stream_key(messages) -> str:
+    """Key for one agent conversation: the first (system) message only."""
+    first = as_messages(messages)[0] if messages else {}
+    return hash_text(normalize_text(str(first.get("content", ""))))
+
+
+class RecordingLLM(BaseLLM):
+    """Pass-through LLM that appends every exchange to a JSONL transcript."""
+
+    def __init__(self, llm, transcript_path: str):
+        super().__init__(model=llm.model, temperature=llm.temperature)
+        self.stop = list(llm.stop or [])
+        self.llm = llm
+        self.transcript_path = transcript_path
+        self._lock = threading.Lock()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        # The executor appends its stop words to self.stop; keep the wrapped LLM in sync.
+        self.llm.stop = self.stop
+        started = time.perf_counter()
+        response = self.llm.call(messages, tools=tools, callbacks=callbacks, available_functions=available_functions)
+        record = {
+            "prompt_key": prompt_key(messages),
+            "stream_key": stream_key(messages),
+            "latency_s": round(time.perf_counter() - started, 4),
+            "response": response if isinstance(response, str) else str(response),
+        }
+        with self._lock:
+            with open(self.transcript_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return self.llm.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
+
+
+class ReplayLLM(BaseLLM):
+    """
+    Deterministic stand-in that answers from a RecordingLLM transcript.
+
+    Lookup order for each call:
+        1. the next unused response recorded for exactly this (masked) prompt;
+        2. otherwise the next unused response of the same agent conversation;
+        3. otherwise the next unused response in transcript order.
+
+    Args:
+        transcript_path (str): JSONL transcript written by RecordingLLM.
+        latency_s (float): Fixed delay injected before every response. Use None to
+            replay the latency measured while recording.
+        jitter_s (float): Extra uniform delay in [0, jitter_s], drawn from a seeded RNG.
+        seed (int): Seed for the jitter RNG.
+    """
+
+    def __init__(self, transcript_path: str, latency_s: float | None = 0.0, jitter_s: float = 0.0, seed: int = 0, model: str = "replay"):
+        super().__init__(model=model)
+        with open(transcript_path, "r") as f:
+            self.records = [json.loads(line) for line in f if line.strip()]
+        if not self.records:
+            raise ValueError(f"Transcript {transcript_path} is empty")
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.rng = random.Random(seed)
+        self.used = [False] * len(self.records)
+        self.by_prompt = defaultdict(list)
+        self.by_stream = defaultdict(list)
+        for index, record in enumerate(self.records):
+            self.by_prompt[record["prompt_key"]].append(index)
+            self.by_stream[record["stream_key"]].append(index)
+        self.calls = 0
+        self.simulated_latency_s = 0.0
+        self._lock = threading.Lock()
+
+    def _take(self, candidates) -> int | None:
+        for index in candidates:
+            if not self.used[index]:
+                self.used[index] = True
+                return index
+        return None
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        with self._lock:
+            index = self._take(self.by_prompt.get(prompt_key(messages), []))
+            if index is None:
+                index = self._take(self.by_stream.get(stream_key(messages), []))
+            if index is None:
+                index = self._take(range(len(self.records)))
+            if index is None:
+                raise RuntimeError("Replay transcript exhausted; record a longer run or reset() between crews")
+            record = self.records[index]
+            delay = record.get("latency_s", 0.0) if self.latency_s is None else self.latency_s
+            if self.jitter_s:
+                delay += self.rng.uniform(0, self.jitter_s)
+            self.calls += 1
+            self.simulated_latency_s += delay
+        if delay:
+            time.sleep(delay)
+        return record["response"]
+
+    def reset(self):
+        """Mark every record unused so the same transcript can drive another crew run."""
+        with self._lock:
+            self.used = [False] * len(self.records)
+
+    def supports_function_calling(self) -> bool:
+        # Recorded responses are ReAct text; crewai parses the tool calls and runs the real tools.
+        return False
@@ -18,5 +18,6 @@ def build_research_agent(llm, tools):
         tools=tools,
         verbose=True,
         llm=llm,
-        cache=False
+        # Safe to cache: the search tools are read-only and memoized server-side per storage generation.
+        cache=True
     )
\ No newline at end of file
@@ -1,30 +1,30 @@
-from crewai import Agent, Task
+import os
 
-def build_saving_agent(llm, tools):
-    return Agent(
-            role="Lore Chronicler",
-            goal=(
-                "Use the tools available to save the entity passed to you."
-            ),
-            backstory=(
-                "You are a meticulous collector and curator of story cannon. You are"
-                "excellent at documenting all pieces of history, persons, environments"
-                "characters, monsters, and items."
-            ),
-            tools=tools,
-            verbose=True,
-            llm=llm,
-            cache=False
-        )
+from crews.outputs import SavedEntity, task_output
+from servers.file_utils.ripgrep import find_entity_by_id
 
-def build_saving_task(agent, callback_factory):
-    return Task(
-            name="save_entity_task",
-            description=(
-                "Use the appropriate tools to save the entity by passing it to the right tool."
-            ),
-            expected_output="The tool call to save the environment will return the filename where the environment was saved and looks something like this: The_Barbers_Tavern.3d0dc1e1-89de-497c-9d43-9ba9b8442744.json",
-            agent=agent,
-            verbose=True,
-            callback=callback_factory("save_entity_task_callback"),
-        )
\ No newline at end of file
+
+def check_saved_output(output) -> str:
+    """
+    Path of the entity a creation task saved through its tool (persist=True). The task only
+    reports {"id", "filename"}; the file is looked up so a made-up answer cannot pass.
+    """
+    saved = task_output(output, SavedEntity)
+    matches = [path for path in find_entity_by_id(saved.id) if os.path.basename(path) == saved.filename]
+    if not matches:
+        raise FileNotFoundError(f"Task reported {saved.filename} for entity {saved.id}, but no such file was saved")
+    return matches[0]
+
+
+def build_save_check_hook(callback=None):
+    """
+    Task callback that checks the task's entity was saved, then runs `callback`. The creation
+    tool saves the entity it built itself, so what lands on disk is exactly what the tool
+    made, not the LLM's retyping of it. An output that does not point at a saved entity
+    raises, failing the crew instead of going on without the entity.
+    """
+    def save_check_hook(output):
+        check_saved_output(output)
+        if callback is not None:
+            callback(output)
+    return save_check_hook
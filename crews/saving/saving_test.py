@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from crews.outputs import OutputParseError
+from crews.saving.saving import build_save_check_hook
+from servers.file_utils.json import save_game_entity_fn
+from servers.game_entity_maker import create_environment
+
+
+class FakeTaskOutput:
+    pydantic = None
+
+    def __init__(self, raw):
+        self.raw = raw
+
+
+def test_save_check_hook_accepts_what_the_tool_saved(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen = []
+    saved = create_environment("r1", "g1", "Old Mill", "Closed:Mill", "A creaking watermill", persist=True)
+    assert set(saved) == {"id", "filename"}
+    build_save_check_hook(seen.append)(FakeTaskOutput(f"Done: {json.dumps(saved)}"))
+    assert len(seen) == 1
+
+
+def test_save_check_hook_rejects_unsaved_or_malformed_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = save_game_entity_fn({"id": "e1", "entity_type": "environment", "name": "Old Mill", "game_id": "g1"})
+    hook = build_save_check_hook()
+    with pytest.raises(FileNotFoundError):
+        hook(FakeTaskOutput(json.dumps({"id": "e2", "filename": filename})))
+    with pytest.raises(FileNotFoundError):
+        hook(FakeTaskOutput(json.dumps({"id": "e1", "filename": "Made_Up.e1.json"})))
+    with pytest.raises(OutputParseError):
+        hook(FakeTaskOutput("I saved it for you!"))
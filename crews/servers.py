@@ -0,0 +1,28 @@
+import os
+from mcp import StdioServerParameters
+
+
+def build_server_params(module: str) -> StdioServerParameters:
+    # With a warm pool running (python -m servers.pool serve), spawn only its small client
+    pool_socket = os.getenv("MCP_POOL_SOCKET")
+    if pool_socket and os.path.exists(pool_socket):
+        args = ["-S", "-m", "servers.pool", "connect", module, "--socket", pool_socket]
+    else:
+        args = ["-m", module]
+    return StdioServerParameters(
+        command="python3",
+        args=args,
+        env={"UV_PYTHON": "3.12", **os.environ},
+    )
+
+
+def game_entity_server_params() -> StdioServerParameters:
+    return build_server_params("servers.game_entity_maker")
+
+
+def json_file_tool_server_params() -> StdioServerParameters:
+    return build_server_params("servers.json_file_tool")
+
+
+def combat_server_params() -> StdioServerParameters:
+    return build_server_params("servers.combat_server")
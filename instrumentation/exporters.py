@@ -0,0 +1,84 @@
+import random
+import socket
+import threading
+from typing import Optional, Sequence
+from urllib.parse import urlparse
+
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import get_current_span
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to a local JSONL file, one span per line (for offline runs)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence) -> SpanExportResult:
+        lines = [span.to_json(indent=None) + "\n" for span in spans]
+        try:
+            with self._lock, open(self.path, "a") as f:
+                f.writelines(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+class SpanNameSampler(Sampler):
+    """
+    Sample spans by name. Names with a rule are kept with that probability, independently
+    of their parent, so chatty callback spans can be thinned inside a sampled trace.
+    Everything else follows the parent, or the default ratio for root spans.
+    """
+
+    def __init__(self, rules: dict[str, float], default_ratio: float = 1.0, rng: Optional[random.Random] = None):
+        self.rules = rules
+        self.default = ParentBased(TraceIdRatioBased(default_ratio))
+        self.rng = rng or random.Random()
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        ratio = self.rules.get(name)
+        if ratio is None:
+            return self.default.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+        parent_trace_state = get_current_span(parent_context).get_span_context().trace_state
+        if ratio >= 1.0 or (ratio > 0.0 and self.rng.random() < ratio):
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes, parent_trace_state)
+        return SamplingResult(Decision.DROP, None, parent_trace_state)
+
+    def get_description(self) -> str:
+        return f"SpanNameSampler{{rules={self.rules}, default={self.default.get_description()}}}"
+
+
+def parse_sample_rules(value: str) -> dict[str, float]:
+    """Parse "span_a=0.1,span_b=0" into {"span_a": 0.1, "span_b": 0.0}."""
+    rules = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        name, _, ratio = item.partition("=")
+        rules[name.strip()] = min(1.0, max(0.0, float(ratio)))
+    return rules
+
+
+def collector_reachable(endpoint: str, timeout: float = 0.5) -> bool:
+    """Cheap TCP connect check so a missing collector is detected once, up front."""
+    parsed = urlparse(endpoint or "")
+    if not parsed.hostname:
+        return False
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        with socket.create_connection((parsed.hostname, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
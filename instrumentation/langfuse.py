@@ -1,38 +1,140 @@
+"""Tracing setup for crews.
+
+Spans go through a BatchSpanProcessor by default, so exports happen on a background
+thread instead of on the crew's hot path. Behaviour is configured through env vars:
+
+    TRACING_EXPORTER        otlp (default) | file | memory | none
+    TRACING_PROCESSOR       batch (default) | simple
+    TRACING_FILE_PATH       JSONL file for the file exporter (default traces.jsonl)
+    TRACING_MAX_QUEUE_SIZE  batch queue limit; spans beyond it are dropped (default 2048)
+    TRACING_BATCH_SIZE      max spans per export (default 256)
+    TRACING_SCHEDULE_DELAY_MS  delay between background exports (default 2000)
+    TRACING_EXPORT_TIMEOUT_MS  per-export timeout (default 3000)
+    TRACING_SAMPLE_RULES    per span name ratios, e.g. "crew_step_callback=0.1"
+    TRACING_SAMPLE_DEFAULT  ratio for root spans without a rule (default 1.0)
+
+When the OTLP collector (LANGFUSE_HOST) is unset or unreachable, tracing falls back to
+the "none" exporter after one short connect check instead of timing out on every span.
+
+Nothing is configured at import time. init_tracing() imports OpenTelemetry and openlit,
+builds the exporter and sets the global tracer provider; it runs on first access to
+`tracer` (or `trace_provider` / `memory_exporter`), on get_tracer(), or when a
+callback_factory callback first fires. Importing this module for callback_factory alone
+costs nothing until a span is actually recorded.
+"""
 import os
 import base64
-import dotenv
+import json
+import threading
+
+DEFAULT_SAMPLE_RULES = "crew_step_callback=0.25"
+
+_lock = threading.Lock()
+# tracer, trace_provider and memory_exporter once init_tracing() has run
+_state: dict = {}
+
+
+def configure_otlp_environment() -> str | None:
+    """Point the OTLP exporter at Langfuse; returns LANGFUSE_HOST."""
+    import dotenv
+    dotenv.load_dotenv()
+    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
+    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
+    host = os.getenv("LANGFUSE_HOST")
+    auth = base64.b64encode(f"{public_key}:{secret_key}".encode()).decode()
+    os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = f"{host}/api/public/otel"
+    os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = f"Authorization=Basic {auth}"
+    return host
+
+
+def build_exporter(name: str, host: str | None = None):
+    if name == "otlp":
+        from instrumentation.exporters import collector_reachable
+        if not host or not collector_reachable(host):
+            print(f"Tracing collector '{host}' is not reachable; spans will not be exported.")
+            return None
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        timeout_s = int(os.getenv("TRACING_EXPORT_TIMEOUT_MS", "3000")) / 1000
+        return OTLPSpanExporter(timeout=timeout_s)
+    if name == "file":
+        from instrumentation.exporters import JsonLinesSpanExporter
+        return JsonLinesSpanExporter(os.getenv("TRACING_FILE_PATH", "traces.jsonl"))
+    if name == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        # Kept so tests and benchmarks can inspect finished spans
+        _state["memory_exporter"] = InMemorySpanExporter()
+        return _state["memory_exporter"]
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown TRACING_EXPORTER '{name}'; use otlp, file, memory or none")
+
+
+def build_span_processor(exporter, name: str):
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+    if name == "simple":
+        return SimpleSpanProcessor(exporter)
+    if name == "batch":
+        return BatchSpanProcessor(
+            exporter,
+            max_queue_size=int(os.getenv("TRACING_MAX_QUEUE_SIZE", "2048")),
+            max_export_batch_size=int(os.getenv("TRACING_BATCH_SIZE", "256")),
+            schedule_delay_millis=int(os.getenv("TRACING_SCHEDULE_DELAY_MS", "2000")),
+            export_timeout_millis=int(os.getenv("TRACING_EXPORT_TIMEOUT_MS", "3000")),
+        )
+    raise ValueError(f"Unknown TRACING_PROCESSOR '{name}'; use batch or simple")
+
+
+def configure_tracing():
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+    from instrumentation.exporters import SpanNameSampler, parse_sample_rules
 
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    host = configure_otlp_environment()
+    exporter = build_exporter(os.getenv("TRACING_EXPORTER", "otlp"), host)
+    if exporter is None:
+        # Nothing will be exported, so don't record spans at all.
+        return TracerProvider(sampler=ALWAYS_OFF)
+    sampler = SpanNameSampler(
+        parse_sample_rules(os.getenv("TRACING_SAMPLE_RULES", DEFAULT_SAMPLE_RULES)),
+        default_ratio=float(os.getenv("TRACING_SAMPLE_DEFAULT", "1.0")),
+    )
+    provider = TracerProvider(sampler=sampler)
+    provider.add_span_processor(build_span_processor(exporter, os.getenv("TRACING_PROCESSOR", "batch")))
+    return provider
 
-from opentelemetry import trace
 
-import openlit
+def init_tracing():
+    """Configure tracing once per process and return the tracer."""
+    with _lock:
+        if "tracer" not in _state:
+            from opentelemetry import trace
+            import openlit
 
-dotenv.load_dotenv()
+            _state.setdefault("memory_exporter", None)
+            _state["trace_provider"] = configure_tracing()
+            trace.set_tracer_provider(_state["trace_provider"])
+            # Creates a tracer from the global tracer provider
+            _state["tracer"] = trace.get_tracer(__name__)
+            openlit.init(tracer=_state["tracer"], disable_batch=os.getenv("TRACING_PROCESSOR", "batch") == "simple")
+        return _state["tracer"]
 
-LANGFUSE_PUBLIC_KEY=os.getenv("LANGFUSE_PUBLIC_KEY")
-LANGFUSE_SECRET_KEY=os.getenv("LANGFUSE_SECRET_KEY")
-LANGFUSE_HOST=os.getenv("LANGFUSE_HOST")
-LANGFUSE_AUTH=base64.b64encode(f"{LANGFUSE_PUBLIC_KEY}:{LANGFUSE_SECRET_KEY}".encode()).decode()
 
-os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = f"{LANGFUSE_HOST}/api/public/otel"
-os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = f"Authorization=Basic {LANGFUSE_AUTH}"
- 
-trace_provider = TracerProvider()
-trace_provider.add_span_processor(SimpleSpanProcessor(OTLPSpanExporter()))
+def get_tracer():
+    return init_tracing()
 
-trace.set_tracer_provider(trace_provider)
- 
-# Creates a tracer from the global tracer provider
-tracer = trace.get_tracer(__name__)
 
-openlit.init(tracer=tracer, disable_batch=True)
+def __getattr__(name: str):
+    if name in ("tracer", "trace_provider", "memory_exporter"):
+        init_tracing()
+        return _state[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def callback_factory(span_name: str, tags: list[str] = []):
     def callback(data):
-        with tracer.start_span(span_name) as span:
+        with get_tracer().start_span(span_name) as span:
+            # Sampled-out spans are non-recording; skip serializing the payload for them.
+            if not span.is_recording():
+                return
             span.set_attribute("langfuse.user.id", "user-123")
             span.set_attribute("langfuse.session.id", "123456789")
             if tags and len(tags) > 0:
@@ -43,4 +145,4 @@ def callback_factory(span_name: str, tags: list[str] = []):
                 span.set_attribute("output.value", json.dumps(data))
             else:
                 span.set_attribute("output.value", str(data))
-    return callback
\ No newline at end of file
+    return callback
@@ -8,10 +8,11 @@ from pydantic import PydanticDeprecatedSince20
 from datetime import datetime
 from uuid import uuid4
 from crewai import LLM
-import json
-import instrumentation.langfuse
+from instrumentation.langfuse import init_tracing
+from crews.outputs import EntitySearchResult, OutputParseError, llm_repair, task_output
 import openlit
 
+init_tracing()
 openlit.init()
 
 llm = LLM(
@@ -63,7 +64,8 @@ with MCPServerAdapter(server_params_list) as aggregated_tools:
     )
     task = Task(
         description="Search for all the game entities with this query: '{search_query}'. Here is the request ID: '{request_id}' and the game ID: '{game_id}'. Do not make up values, just pass whatever values the user gives you to the tool and let it do the rest.",
-        expected_output="An array of all the game entities that match the search query.",
+        expected_output='A JSON object {"entities": [...]} holding all the game entities that match the search query.',
+        output_pydantic=EntitySearchResult,
         agent=agent,
         verbose=True,
     )
@@ -73,9 +75,7 @@ with MCPServerAdapter(server_params_list) as aggregated_tools:
         verbose=True,
     )
     result = crew.kickoff(inputs=crew_input)
-    # check to see if output is json serialized
     try:
-        result = json.loads(result)
-        print(json.dumps(result, indent=2))
-    except:
-        print(result)
\ No newline at end of file
+        print(task_output(result, EntitySearchResult, llm_repair(llm)).model_dump_json(indent=2))
+    except OutputParseError as e:
+        print(f"{e}\n\n{result.raw}")
\ No newline at end of file
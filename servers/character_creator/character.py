@@ -72,6 +72,60 @@ BACKGROUNDS: Dict[str, Dict] = {
     "Wayfarer": dict(ability_options=["DEX", "WIS", "CHA"], skills=["Insight", "Stealth"], tool="Thieves' Tools", origin_feat="Lucky"),
 }
 
+# ---------- Class progression tables -----------------------------------
+ASI_LEVELS = (4, 8, 12, 16, 19)
+CLASS_ASI_LEVELS: Dict[str, tuple] = {
+    "Fighter": (4, 6, 8, 12, 14, 16, 19),
+    "Rogue": (4, 8, 10, 12, 16, 19),
+}
+
+# Ability an Ability Score Improvement goes to first; CON and DEX next, then the rest
+PRIMARY_ABILITY: Dict[str, str] = {
+    "Barbarian": "STR", "Bard": "CHA", "Cleric": "WIS", "Druid": "WIS", "Fighter": "STR", "Monk": "DEX",
+    "Paladin": "STR", "Ranger": "DEX", "Rogue": "DEX", "Sorcerer": "CHA", "Warlock": "CHA", "Wizard": "INT",
+}
+ABILITY_SCORE_MAX = 20
+
+CASTER_PROGRESSION: Dict[str, str] = {
+    "Bard": "full", "Cleric": "full", "Druid": "full", "Sorcerer": "full", "Wizard": "full",
+    "Paladin": "half", "Ranger": "half", "Warlock": "pact",
+}
+
+# Full caster level -> slots per spell level (1st..9th)
+FULL_CASTER_SLOTS: Dict[int, tuple] = {
+    1: (2,), 2: (3,), 3: (4, 2), 4: (4, 3), 5: (4, 3, 2), 6: (4, 3, 3), 7: (4, 3, 3, 1),
+    8: (4, 3, 3, 2), 9: (4, 3, 3, 3, 1), 10: (4, 3, 3, 3, 2), 11: (4, 3, 3, 3, 2, 1),
+    12: (4, 3, 3, 3, 2, 1), 13: (4, 3, 3, 3, 2, 1, 1), 14: (4, 3, 3, 3, 2, 1, 1),
+    15: (4, 3, 3, 3, 2, 1, 1, 1), 16: (4, 3, 3, 3, 2, 1, 1, 1), 17: (4, 3, 3, 3, 2, 1, 1, 1, 1),
+    18: (4, 3, 3, 3, 3, 1, 1, 1, 1), 19: (4, 3, 3, 3, 3, 2, 1, 1, 1), 20: (4, 3, 3, 3, 3, 2, 2, 1, 1),
+}
+
+# Warlock level -> (pact slots, slot level)
+PACT_SLOTS: Dict[int, tuple] = {
+    level: (1 if level == 1 else 2 if level <= 10 else 3 if level <= 16 else 4, min(5, (level + 1) // 2))
+    for level in range(1, 21)
+}
+
+
+def spell_slots_for(char_class: str, level: int) -> Dict[str, int]:
+    """Spell slots by spell level ("1".."9") for a single-class character."""
+    progression = CASTER_PROGRESSION.get(char_class)
+    if progression == "pact":
+        count, slot_level = PACT_SLOTS[level]
+        return {str(slot_level): count}
+    if progression == "half":
+        # Half casters get slots from level 2, tracking a full caster of half their level
+        level = (level + 1) // 2 if level >= 2 else 0
+    if not progression or level == 0:
+        return {}
+    return {str(i + 1): count for i, count in enumerate(FULL_CASTER_SLOTS[level])}
+
+
+def proficiency_bonus_for(level: int) -> int:
+    # Proficiency bonus increases at 5, 9, 13, 17 (5e rules)
+    return 2 + ((level - 1) // 4)
+
+
 SCHEMA_VERSION = "1.0.0"
 
 def log(data, label):
@@ -105,6 +159,8 @@ class Character:
         self.cr = max(1, self.level // 4)
         self.max_hp = self.ac = None
         self.hp_history = []  # track HP gained per level for reproducibility
+        self.asi_history = []  # (level, {ability: increase}) per Ability Score Improvement
+        self.spell_slots = {}
         self.request_id = request_id
         self.game_id = game_id
         self.description = description
@@ -128,11 +184,12 @@ class Character:
         self.current_goal = value
 
     def level_up(self, rng=random, average_hp=False):
-        """Increase level by 1, update HP, proficiency, CR, and stub for features/ASI."""
+        """Increase level by 1, apply any Ability Score Improvement, then update HP, proficiency, CR and spell slots."""
         self.level += 1
-        # Proficiency bonus increases at 5, 9, 13, 17 (5e rules)
-        self.proficiency_bonus = 2 + ((self.level - 1) // 4)
+        self.proficiency_bonus = proficiency_bonus_for(self.level)
         self.cr = max(1, self.level // 4)
+        if self.level in self.asi_levels():
+            self.apply_asi()
         # HP gain: roll or average hit die + CON mod
         con_mod = ability_mod(self.ability_scores["CON"])
         if average_hp:
@@ -141,11 +198,69 @@ class Character:
             gain = rng.randint(1, self.hit_die) + con_mod
         self.max_hp += max(gain, 1)  # minimum 1 HP per level
         self.hp_history.append(gain)
-        # TODO: Handle ASI/feat at levels 4, 8, etc.
-        # TODO: Handle class features, spell slots, etc.
+        # TODO: Handle class features
         # TODO: Handle skill/saving throw increases if needed
         self.compute_derived()
 
+    def advance_to(self, level: int, rng=random, average_hp=False):
+        """
+        Level up to `level` in one step; equivalent to calling level_up() once per level.
+        HP gains are computed per stretch of levels between Ability Score Improvements (the
+        only points where the CON modifier can change) and derived stats once at the end.
+        """
+        if level > 20:
+            raise ValueError("Characters advance to level 20 at most")
+        if level <= self.level:
+            return self
+        gains = []
+        for first, last, con_mod in self._advancement_segments(level):
+            count = last - first
+            if average_hp:
+                gains.extend([(self.hit_die // 2) + 1 + con_mod] * count)
+            else:
+                gains.extend(rng.randint(1, self.hit_die) + con_mod for _ in range(count))
+        self._finish_advance(level, gains)
+        return self
+
+    def _advancement_segments(self, level: int) -> list:
+        """
+        Apply the Ability Score Improvements between the current level and `level`, returning
+        (first, last_exclusive, con_mod) for each stretch of levels sharing a CON modifier.
+        """
+        start = self.level + 1
+        milestones = [m for m in self.asi_levels() if start <= m <= level]
+        boundaries = sorted(set([start] + milestones))
+        segments = []
+        for i, first in enumerate(boundaries):
+            if first in milestones:
+                self.level = first
+                self.apply_asi()
+            last = boundaries[i + 1] if i + 1 < len(boundaries) else level + 1
+            segments.append((first, last, ability_mod(self.ability_scores["CON"])))
+        return segments
+
+    def _finish_advance(self, level: int, gains: list):
+        self.hp_history.extend(gains)
+        self.level = level
+        self.proficiency_bonus = proficiency_bonus_for(level)
+        self.cr = max(1, level // 4)
+        self.compute_derived()
+
+    def asi_levels(self) -> tuple:
+        return CLASS_ASI_LEVELS.get(self.char_class, ASI_LEVELS)
+
+    def apply_asi(self):
+        """+2 ability points, one at a time, to the class's primary ability, then CON and DEX, capped at 20."""
+        primary = PRIMARY_ABILITY.get(self.char_class, "CON")
+        priority = [primary] + [a for a in ("CON", "DEX") if a != primary] + [a for a in ABILITIES if a not in (primary, "CON", "DEX")]
+        increases = {}
+        for _ in range(2):
+            for ability in priority:
+                if self.ability_scores[ability] < ABILITY_SCORE_MAX:
+                    self.ability_scores[ability] += 1
+                    increases[ability] = increases.get(ability, 0) + 1
+                    break
+        self.asi_history.append((self.level, increases))
 
     # ---- Race ----
     def apply_race(self, race: str, rng=random):
@@ -203,6 +318,7 @@ class Character:
             self.ac = base_ac + wis_mod
         else:
             self.ac = base_ac
+        self.spell_slots = spell_slots_for(self.char_class, self.level)
 
     # ---- Export helpers ----
     def as_dict(self) -> Dict:
@@ -225,6 +341,7 @@ class Character:
             "skills": sorted(self.skills),
             "tools": sorted(self.tool_proficiencies),
             "feats": sorted(self.feats),
+            "spell_slots": dict(self.spell_slots),
             "request_id": self.request_id,
             "game_id": self.game_id,
             "description": self.description,
@@ -264,12 +381,37 @@ def build_random_character(name: str = None, rng=random, request_id: str = str(u
     pc.compute_derived()
     return pc
 
+def advance_cohort(characters: List[Character], level: int, average_hp: bool = False, seed: int | None = None) -> List[Character]:
+    """
+    advance_to(level) for many characters at once; rolled HP for the whole cohort comes from
+    a single numpy draw of shape (characters, levels).
+    """
+    import numpy as np
+
+    if level > 20:
+        raise ValueError("Characters advance to level 20 at most")
+    characters = [c for c in characters if c.level < level]
+    if not characters:
+        return []
+    spans = max(level - c.level for c in characters)
+    hit_dice = np.array([c.hit_die for c in characters])
+    if average_hp:
+        dice = np.broadcast_to((hit_dice // 2 + 1)[:, None], (len(characters), spans))
+    else:
+        dice = np.random.default_rng(seed).integers(1, hit_dice[:, None] + 1, size=(len(characters), spans))
+    for character, row in zip(characters, dice.tolist()):
+        gains, position = [], 0
+        for first, last, con_mod in character._advancement_segments(level):
+            gains.extend(die + con_mod for die in row[position:position + last - first])
+            position += last - first
+        character._finish_advance(level, gains)
+    return characters
+
 # ---------- Demo -----------------------------------------------------
 if __name__ == "__main__":
     dotenv.load_dotenv()
 
     hero = build_random_character(game_id=os.getenv("GAME_ID"))
     print(hero.to_json(indent=2))
-    for _ in range(15):
-        hero.level_up()
+    hero.advance_to(16)
     print(hero.to_json(indent=2))
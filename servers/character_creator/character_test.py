@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from servers.character_creator.character import advance_cohort, build_random_character, spell_slots_for
+
+
+def make(seed):
+    return build_random_character(name="Test", rng=random.Random(seed))
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_advance_to_matches_repeated_level_up(seed):
+    stepped, jumped = make(seed), make(seed)
+    stepped.id = jumped.id
+    for _ in range(19):
+        stepped.level_up(average_hp=True)
+    jumped.advance_to(20, average_hp=True)
+    assert jumped.as_dict() == stepped.as_dict()
+    assert jumped.hp_history == stepped.hp_history
+    assert [level for level, _ in jumped.asi_history] == list(jumped.asi_levels())
+
+
+def test_advance_cohort_and_spell_slot_tables():
+    cohort = [make(seed) for seed in range(50)]
+    expected = [make(seed).advance_to(12, average_hp=True).as_dict() for seed in range(50)]
+    advance_cohort(cohort, 12, average_hp=True)
+    assert [c.as_dict() | {"id": None} for c in cohort] == [e | {"id": None} for e in expected]
+    rolled = advance_cohort([make(seed) for seed in range(50)], 20, seed=3)
+    assert all(c.level == 20 and len(c.hp_history) == 19 for c in rolled)
+    assert spell_slots_for("Wizard", 5) == {"1": 4, "2": 3, "3": 2}
+    assert spell_slots_for("Paladin", 1) == {} and spell_slots_for("Paladin", 5) == {"1": 4, "2": 2}
+    assert spell_slots_for("Warlock", 11) == {"5": 3}
+    assert spell_slots_for("Fighter", 20) == {}
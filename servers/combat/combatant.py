@@ -0,0 +1,90 @@
+"""Combat-ready view of a stored character or a make_stat_block stat block."""
+import re
+
+from servers.character_creator.character import CLASSES, ability_mod
+
+DICE_PATTERN = re.compile(r"^\s*(\d+)d(\d+)\s*(?:([+-])\s*(\d+))?\s*$")
+STAT_BLOCK_ABILITIES = {
+    "strength": "STR", "dexterity": "DEX", "constitution": "CON",
+    "intelligence": "INT", "wisdom": "WIS", "charisma": "CHA",
+}
+# Weapon die by hit die when an entity does not name its attack: d12 classes swing greataxes, d6 casters daggers
+DAMAGE_DIE_BY_HIT_DIE = {12: 12, 10: 8, 8: 6, 6: 4}
+
+
+def parse_dice(expression: str) -> tuple[int, int, int]:
+    """"2d6+3" -> (2, 6, 3)."""
+    match = DICE_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Invalid dice expression: {expression}")
+    count, sides, sign, bonus = match.groups()
+    return int(count), int(sides), (int(bonus) if bonus else 0) * (-1 if sign == "-" else 1)
+
+
+def read_ability_scores(entity: dict) -> dict:
+    scores = entity.get("ability_scores") or {}
+    normalized = {}
+    for key, value in scores.items():
+        ability = STAT_BLOCK_ABILITIES.get(key.lower(), key.upper())
+        normalized[ability] = value["score"] if isinstance(value, dict) else value
+    return normalized
+
+
+class Combatant:
+    def __init__(self, name: str, max_hp: int, ac: int, initiative_bonus: int, attack_bonus: int,
+                 damage: tuple[int, int, int], attacks: int = 1, entity_id: str | None = None):
+        self.id = entity_id
+        self.name = name
+        self.max_hp = max(1, int(max_hp))
+        self.ac = int(ac)
+        self.initiative_bonus = int(initiative_bonus)
+        self.attack_bonus = int(attack_bonus)
+        self.damage = damage
+        self.attacks = max(1, int(attacks))
+
+    @classmethod
+    def from_entity(cls, entity: dict) -> "Combatant":
+        """
+        Build a combatant from a stored character or a stat block. An optional "attack" object
+        ({"bonus": 5, "damage": "1d8+3", "count": 2}) overrides the attack derived from the stats.
+        """
+        scores = read_ability_scores(entity)
+        str_mod = ability_mod(scores.get("STR", 10))
+        dex_mod = ability_mod(scores.get("DEX", 10))
+        level = int(entity.get("level") or 1)
+        proficiency = entity.get("proficiency_bonus") or 2 + (level - 1) // 4
+        derived = entity.get("derived_stats") or {}
+        max_hp = entity.get("max_hp") or derived.get("hp") or 10
+        ac = entity.get("ac") or derived.get("ac") or 10 + dex_mod
+        hit_die = CLASSES.get(entity.get("class"), {}).get("hit_die", 8)
+        attack_mod = max(str_mod, dex_mod)
+        attack = entity.get("attack") or {}
+        if "damage" in attack:
+            damage = parse_dice(attack["damage"])
+        else:
+            damage = (1, DAMAGE_DIE_BY_HIT_DIE.get(hit_die, 6), attack_mod)
+        # Martial classes get Extra Attack at level 5
+        default_attacks = 2 if level >= 5 and hit_die >= 10 else 1
+        return cls(
+            name=entity.get("name", "Unknown"),
+            max_hp=max_hp,
+            ac=ac,
+            initiative_bonus=dex_mod,
+            attack_bonus=attack.get("bonus", attack_mod + proficiency),
+            damage=damage,
+            attacks=attack.get("count", default_attacks),
+            entity_id=entity.get("id"),
+        )
+
+    def as_dict(self) -> dict:
+        count, sides, bonus = self.damage
+        return {
+            "id": self.id,
+            "name": self.name,
+            "max_hp": self.max_hp,
+            "ac": self.ac,
+            "initiative_bonus": self.initiative_bonus,
+            "attack_bonus": self.attack_bonus,
+            "damage": f"{count}d{sides}{bonus:+d}",
+            "attacks": self.attacks,
+        }
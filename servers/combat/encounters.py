@@ -0,0 +1,181 @@
+"""Encounter difficulty and XP budgeting, following the 5e Dungeon Master's Guide tables.
+
+A party's budget for a difficulty is the sum of its members' XP thresholds. An encounter's
+adjusted XP is the creatures' total XP times a multiplier for the number of creatures
+(shifted one step up for parties under three and one step down for parties of six or more).
+build_encounter_fn() searches creature combinations whose adjusted XP lands in the band
+between the requested difficulty's threshold and the next one.
+"""
+from functools import lru_cache
+
+CR_XP: dict[float, int] = {
+    0: 10, 0.125: 25, 0.25: 50, 0.5: 100, 1: 200, 2: 450, 3: 700, 4: 1100, 5: 1800,
+    6: 2300, 7: 2900, 8: 3900, 9: 5000, 10: 5900, 11: 7200, 12: 8400, 13: 10000,
+    14: 11500, 15: 13000, 16: 15000, 17: 18000, 18: 20000, 19: 22000, 20: 25000,
+    21: 33000, 22: 41000, 23: 50000, 24: 62000, 25: 75000, 26: 90000, 27: 105000,
+    28: 120000, 29: 135000, 30: 155000,
+}
+
+DIFFICULTIES = ("easy", "medium", "hard", "deadly")
+
+# Character level -> XP threshold per difficulty, in DIFFICULTIES order
+LEVEL_THRESHOLDS: dict[int, tuple[int, int, int, int]] = {
+    1: (25, 50, 75, 100), 2: (50, 100, 150, 200), 3: (75, 150, 225, 400),
+    4: (125, 250, 375, 500), 5: (250, 500, 750, 1100), 6: (300, 600, 900, 1400),
+    7: (350, 750, 1100, 1700), 8: (450, 900, 1400, 2100), 9: (550, 1100, 1600, 2400),
+    10: (600, 1200, 1900, 2800), 11: (800, 1600, 2400, 3600), 12: (1000, 2000, 3000, 4500),
+    13: (1100, 2200, 3400, 5100), 14: (1250, 2500, 3800, 5700), 15: (1400, 2800, 4300, 6400),
+    16: (1600, 3200, 4800, 7200), 17: (2000, 3900, 5900, 8800), 18: (2100, 4200, 6300, 9500),
+    19: (2400, 4900, 7300, 10900), 20: (2800, 5700, 8500, 12700),
+}
+
+MULTIPLIERS = (0.5, 1, 1.5, 2, 2.5, 3, 4, 5)
+# Most distinct creature types in one suggested group
+MAX_TYPES = 3
+# Upper edge of the deadly band, as a factor of the deadly threshold
+DEADLY_CEILING = 1.5
+
+
+def parse_cr(cr) -> float:
+    """1, "1", 0.25 or "1/4" -> the CR as a number."""
+    if isinstance(cr, str) and "/" in cr:
+        numerator, denominator = cr.split("/")
+        return int(numerator) / int(denominator)
+    return float(cr)
+
+
+def xp_for_cr(cr) -> int:
+    value = parse_cr(cr)
+    if value not in CR_XP:
+        raise ValueError(f"Unknown challenge rating: {cr}")
+    return CR_XP[value]
+
+
+def party_thresholds(levels: tuple[int, ...]) -> dict[str, int]:
+    totals = [0, 0, 0, 0]
+    for level in levels:
+        for i, threshold in enumerate(LEVEL_THRESHOLDS[min(max(int(level), 1), 20)]):
+            totals[i] += threshold
+    return dict(zip(DIFFICULTIES, totals))
+
+
+def multiplier_step(creature_count: int) -> int:
+    if creature_count <= 1:
+        return 1
+    if creature_count == 2:
+        return 2
+    if creature_count <= 6:
+        return 3
+    if creature_count <= 10:
+        return 4
+    if creature_count <= 14:
+        return 5
+    return 6
+
+
+def encounter_multiplier(creature_count: int, party_size: int) -> float:
+    step = multiplier_step(creature_count)
+    if party_size < 3:
+        step += 1
+    elif party_size >= 6:
+        step -= 1
+    return MULTIPLIERS[step]
+
+
+def rate_encounter_fn(levels: list[int], crs: list) -> dict:
+    """Difficulty of fighting creatures of the given CRs with a party of the given levels."""
+    thresholds = party_thresholds(tuple(levels))
+    base_xp = sum(xp_for_cr(cr) for cr in crs)
+    adjusted_xp = base_xp * encounter_multiplier(len(crs), len(levels))
+    difficulty = "trivial"
+    for name in DIFFICULTIES:
+        if adjusted_xp >= thresholds[name]:
+            difficulty = name
+    return {"difficulty": difficulty, "base_xp": base_xp, "adjusted_xp": adjusted_xp, "thresholds": thresholds}
+
+
+def budget_band(thresholds: dict[str, int], difficulty: str) -> tuple[float, float]:
+    index = DIFFICULTIES.index(difficulty)
+    low = thresholds[difficulty]
+    high = thresholds[DIFFICULTIES[index + 1]] if index + 1 < len(DIFFICULTIES) else low * DEADLY_CEILING
+    return low, high
+
+
+@lru_cache(maxsize=4096)
+def search_combinations(xp_values: tuple[int, ...], low: float, high: float, party_size: int,
+                        max_creatures: int, limit: int, max_types: int = MAX_TYPES) -> tuple[tuple[int, ...], ...]:
+    """
+    Counts per creature type (aligned with xp_values) whose adjusted XP falls in [low, high),
+    closest to the middle of the band first (within a tenth of the band, fewer creatures
+    first). Adding a creature never lowers the adjusted XP,
+    so any branch that reaches high is cut. Memoized on the XP values, so any two requests
+    with the same party levels and creature CRs share one search.
+    """
+    target = (low + high) / 2
+    closeness = (high - low) / 10 or 1
+    found = []
+    counts = [0] * len(xp_values)
+
+    def visit(position: int, total_xp: int, total_count: int, types: int):
+        if total_count:
+            adjusted = total_xp * encounter_multiplier(total_count, party_size)
+            if adjusted >= high:
+                return
+            if adjusted >= low:
+                found.append((int(abs(adjusted - target) // closeness), total_count, tuple(counts)))
+        if total_count == max_creatures:
+            return
+        for i in range(position, len(xp_values)):
+            new_type = counts[i] == 0
+            if new_type and types == max_types:
+                continue
+            counts[i] += 1
+            visit(i, total_xp + xp_values[i], total_count + 1, types + new_type)
+            counts[i] -= 1
+
+    visit(0, 0, 0, 0)
+    found.sort()
+    return tuple(combination for _, _, combination in found[:limit])
+
+
+def generic_creatures() -> list[dict]:
+    return [{"name": f"CR {format_cr(cr)} creature", "cr": format_cr(cr)} for cr in CR_XP]
+
+
+def format_cr(cr: float) -> str:
+    return {0.125: "1/8", 0.25: "1/4", 0.5: "1/2"}.get(cr, str(int(cr)))
+
+
+def build_encounter_fn(levels: list[int], creatures: list[dict] | None = None, difficulty: str = "medium",
+                       max_creatures: int = 8, limit: int = 5) -> dict:
+    """
+    Suggest up to `limit` groups drawn from `creatures` ({"name", "cr"}; optionally "id")
+    that make a `difficulty` encounter for a party of the given levels. Without creatures,
+    suggests CR mixes from the whole CR table.
+    """
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"difficulty must be one of {', '.join(DIFFICULTIES)}")
+    thresholds = party_thresholds(tuple(levels))
+    low, high = budget_band(thresholds, difficulty)
+    # Identical XP values make identical searches: search per distinct XP, then map back
+    by_xp: dict[int, list[dict]] = {}
+    for creature in creatures or generic_creatures():
+        by_xp.setdefault(xp_for_cr(creature["cr"]), []).append(creature)
+    # A creature worth more than the band on its own can never be part of a group
+    xp_values = tuple(sorted((xp for xp in by_xp if xp < high), reverse=True))
+    combinations = search_combinations(xp_values, low, high, len(levels), max_creatures, limit)
+    suggestions = []
+    for counts in combinations:
+        group = []
+        for xp, count in zip(xp_values, counts):
+            if count:
+                # Rotate through the creatures that share this XP value
+                for i in range(count):
+                    creature = by_xp[xp][i % len(by_xp[xp])]
+                    group.append({key: creature[key] for key in ("id", "name", "cr") if key in creature})
+        crs = [creature["cr"] for creature in group]
+        rating = rate_encounter_fn(levels, crs)
+        del rating["thresholds"]
+        suggestions.append({"creatures": group, **rating})
+    return {"difficulty": difficulty, "budget": {"min_xp": low, "max_xp": high}, "thresholds": thresholds,
+            "suggestions": suggestions}
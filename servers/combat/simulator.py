@@ -0,0 +1,154 @@
+"""Resolve fights between two sides of Combatants.
+
+Rules, kept to the core of 5e: everyone rolls initiative (d20 + DEX mod) once; on its turn a
+living combatant makes its attacks against a random living enemy; an attack hits when
+d20 + attack bonus >= AC, a natural 1 always misses and a natural 20 always hits and rolls
+the damage dice twice; damage on a hit is at least 1; a combatant at 0 HP is out. A fight
+ends when one side is down, or as a draw after max_rounds.
+
+simulate_fight() plays one fight and can return a turn-by-turn log. simulate_batch() plays
+thousands of fights at once with numpy, one array column per combatant, for balancing.
+"""
+import random
+
+from servers.combat.combatant import Combatant
+
+MAX_ROUNDS = 50
+
+
+def roll_damage(combatant: Combatant, critical: bool, rng: random.Random) -> int:
+    count, sides, bonus = combatant.damage
+    dice = count * (2 if critical else 1)
+    return max(1, sum(rng.randint(1, sides) for _ in range(dice)) + bonus)
+
+
+def simulate_fight(side_a: list[Combatant], side_b: list[Combatant], seed: int | None = None,
+                   max_rounds: int = MAX_ROUNDS, record_log: bool = False) -> dict:
+    rng = random.Random(seed)
+    fighters = [(combatant, "a") for combatant in side_a] + [(combatant, "b") for combatant in side_b]
+    hp = [combatant.max_hp for combatant, _ in fighters]
+    initiative = [rng.randint(1, 20) + combatant.initiative_bonus for combatant, _ in fighters]
+    # Ties go to the higher DEX bonus, then at random
+    order = sorted(range(len(fighters)), key=lambda i: (-initiative[i], -fighters[i][0].initiative_bonus, rng.random()))
+    log = []
+
+    def side_alive(side: str) -> bool:
+        return any(hp[i] > 0 for i, (_, s) in enumerate(fighters) if s == side)
+
+    rounds = 0
+    while side_alive("a") and side_alive("b") and rounds < max_rounds:
+        rounds += 1
+        for actor in order:
+            combatant, side = fighters[actor]
+            if hp[actor] <= 0:
+                continue
+            for _ in range(combatant.attacks):
+                enemies = [i for i, (_, s) in enumerate(fighters) if s != side and hp[i] > 0]
+                if not enemies:
+                    break
+                target = rng.choice(enemies)
+                d20 = rng.randint(1, 20)
+                hit = d20 != 1 and (d20 == 20 or d20 + combatant.attack_bonus >= fighters[target][0].ac)
+                damage = roll_damage(combatant, d20 == 20, rng) if hit else 0
+                hp[target] -= damage
+                if record_log:
+                    log.append({
+                        "round": rounds, "attacker": combatant.name, "target": fighters[target][0].name,
+                        "roll": d20, "hit": hit, "critical": hit and d20 == 20, "damage": damage,
+                        "target_hp": max(hp[target], 0),
+                    })
+    winner = "draw"
+    if not side_alive("b"):
+        winner = "a"
+    elif not side_alive("a"):
+        winner = "b"
+    result = {
+        "winner": winner,
+        "rounds": rounds,
+        "combatants": [
+            {"name": combatant.name, "side": side, "hp": max(hp[i], 0)}
+            for i, (combatant, side) in enumerate(fighters)
+        ],
+    }
+    if record_log:
+        result["log"] = log
+    return result
+
+
+def simulate_batch(side_a: list[Combatant], side_b: list[Combatant], fights: int = 1000,
+                   seed: int | None = None, max_rounds: int = MAX_ROUNDS) -> dict:
+    """Play `fights` independent fights as numpy arrays of shape (fights, combatants)."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    combatants = list(side_a) + list(side_b)
+    n = len(combatants)
+    side = np.array([0] * len(side_a) + [1] * len(side_b))
+    ac = np.array([c.ac for c in combatants])
+    attack_bonus = np.array([c.attack_bonus for c in combatants])
+    attacks = np.array([c.attacks for c in combatants])
+    dice_count = np.array([c.damage[0] for c in combatants])
+    dice_sides = np.array([c.damage[1] for c in combatants])
+    damage_bonus = np.array([c.damage[2] for c in combatants])
+    initiative_bonus = np.array([c.initiative_bonus for c in combatants])
+    max_dice = 2 * int(dice_count.max())
+    dice_columns = np.arange(max_dice)
+    rows = np.arange(fights)
+
+    hp = np.tile(np.array([c.max_hp for c in combatants]), (fights, 1))
+    initiative = rng.integers(1, 21, (fights, n)) + initiative_bonus + initiative_bonus / 100 + rng.random((fights, n)) / 1000
+    order = np.argsort(-initiative, axis=1)
+    active = np.ones(fights, dtype=bool)
+    rounds = np.zeros(fights, dtype=np.int64)
+    winner = np.full(fights, 2)  # 0: side a, 1: side b, 2: draw
+
+    for round_number in range(1, max_rounds + 1):
+        rounds[active] = round_number
+        for slot in range(n):
+            actor = order[:, slot]
+            for swing in range(int(attacks.max())):
+                living = hp > 0
+                enemies = living & (side[None, :] != side[actor][:, None])
+                acting = active & living[rows, actor] & (attacks[actor] > swing) & enemies.any(axis=1)
+                if not acting.any():
+                    continue
+                target = np.argmax(np.where(enemies, rng.random((fights, n)), -1.0), axis=1)
+                d20 = rng.integers(1, 21, fights)
+                hit = acting & (d20 != 1) & ((d20 == 20) | (d20 + attack_bonus[actor] >= ac[target]))
+                dice = dice_count[actor] * np.where(d20 == 20, 2, 1)
+                rolls = np.floor(rng.random((fights, max_dice)) * dice_sides[actor][:, None]).astype(np.int64) + 1
+                damage = (rolls * (dice_columns[None, :] < dice[:, None])).sum(axis=1) + damage_bonus[actor]
+                hp[rows, target] -= np.where(hit, np.maximum(damage, 1), 0)
+        living = hp > 0
+        alive_a = (living & (side == 0)).any(axis=1)
+        alive_b = (living & (side == 1)).any(axis=1)
+        winner[active & alive_a & ~alive_b] = 0
+        winner[active & alive_b & ~alive_a] = 1
+        active &= alive_a & alive_b
+        if not active.any():
+            break
+
+    living = hp > 0
+    return {
+        "fights": fights,
+        "win_rate": {
+            "a": round(float(np.mean(winner == 0)), 4),
+            "b": round(float(np.mean(winner == 1)), 4),
+            "draw": round(float(np.mean(winner == 2)), 4),
+        },
+        "expected_rounds": round(float(rounds.mean()), 2),
+        "rounds_p90": int(np.percentile(rounds, 90)),
+        "expected_survivors": {
+            "a": round(float((living & (side == 0)).sum(axis=1).mean()), 2),
+            "b": round(float((living & (side == 1)).sum(axis=1).mean()), 2),
+        },
+        "combatants": [
+            {
+                **c.as_dict(),
+                "side": "a" if side[i] == 0 else "b",
+                "survival_rate": round(float(living[:, i].mean()), 4),
+                "expected_hp_remaining": round(float(np.clip(hp[:, i], 0, None).mean()), 1),
+            }
+            for i, c in enumerate(combatants)
+        ],
+    }
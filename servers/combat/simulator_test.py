@@ -0,0 +1,52 @@
+import pytest
+
+from servers.combat.combatant import Combatant, parse_dice
+from servers.combat.simulator import simulate_batch, simulate_fight
+
+
+def make_fighter(name, hp=30, ac=14, bonus=5, damage="1d8+3"):
+    return Combatant.from_entity({"name": name, "max_hp": hp, "ac": ac, "attack": {"bonus": bonus, "damage": damage}})
+
+
+def test_combatant_reads_characters_and_stat_blocks():
+    assert parse_dice("2d6 - 1") == (2, 6, -1)
+    character = Combatant.from_entity({"name": "Aegua", "class": "Fighter", "level": 5, "max_hp": 44, "ac": 16,
+                                       "ability_scores": {"STR": 16, "DEX": 12}})
+    assert (character.attack_bonus, character.damage, character.attacks) == (6, (1, 8, 3), 2)
+    stat_block = Combatant.from_entity({"name": "Ogre", "ability_scores": {"strength": {"score": 19, "modifier": 4}},
+                                        "derived_stats": {"hp": 59, "ac": 11}})
+    assert (stat_block.max_hp, stat_block.ac, stat_block.attack_bonus) == (59, 11, 6)
+
+
+def test_batch_matches_single_fights_and_is_reproducible():
+    knight, squire = make_fighter("Knight"), make_fighter("Squire", hp=12, bonus=3, damage="1d6+1")
+    batch = simulate_batch([knight], [squire, squire], fights=4000, seed=7)
+    assert batch == simulate_batch([knight], [squire, squire], fights=4000, seed=7)
+    assert sum(batch["win_rate"].values()) == pytest.approx(1.0)
+    single = [simulate_fight([knight], [squire, squire], seed=i)["winner"] for i in range(4000)]
+    assert batch["win_rate"]["a"] == pytest.approx(single.count("a") / 4000, abs=0.05)
+    assert batch["expected_rounds"] >= 1
+
+
+def test_unwinnable_fight_is_a_draw():
+    wall = make_fighter("Wall", hp=10, ac=40, bonus=-20)
+    result = simulate_fight([wall], [wall], seed=1, max_rounds=3, record_log=True)
+    # Only natural 20s land, so most fights run out the clock
+    assert result["rounds"] <= 3 and len(result["log"]) == result["rounds"] * 2
+    assert simulate_batch([wall], [wall], fights=500, seed=1, max_rounds=3)["win_rate"]["draw"] > 0.5
+
+
+def test_encounter_budgets_follow_the_dmg_tables():
+    from servers.combat.encounters import build_encounter_fn, rate_encounter_fn, search_combinations
+    # Four level-1 characters against six CR 1/4 goblins: 300 XP x2 = 600, past the 400 deadly threshold
+    rating = rate_encounter_fn([1, 1, 1, 1], ["1/4"] * 6)
+    assert (rating["adjusted_xp"], rating["difficulty"]) == (600, "deadly")
+    goblin, ogre = {"name": "Goblin", "cr": "1/4"}, {"name": "Ogre", "cr": 2, "id": "o1"}
+    result = build_encounter_fn([3, 3, 3, 3], [goblin, ogre], "hard")
+    assert result["budget"] == {"min_xp": 900, "max_xp": 1600}
+    for suggestion in result["suggestions"]:
+        assert suggestion["difficulty"] == "hard"
+    search_combinations.cache_clear()
+    build_encounter_fn([3, 3, 3, 3], [ogre, goblin], "hard")
+    build_encounter_fn([3, 3, 3, 3], [{"name": "Wolf", "cr": "1/4"}, ogre], "hard")
+    assert search_combinations.cache_info().hits == 1
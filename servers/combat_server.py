@@ -0,0 +1,143 @@
+"""An MCP server that resolves combat between characters and creatures.
+
+This server replaces long chains of roll_dice calls with one simulation call: initiative, attack rolls against AC, damage and HP tracking, played out thousands of times for encounter balancing.
+"""
+
+from mcp.server.fastmcp import FastMCP
+from typing import Dict, List, Optional
+
+from servers.combat.combatant import Combatant
+from servers.combat.encounters import build_encounter_fn, rate_encounter_fn
+from servers.combat.simulator import MAX_ROUNDS, simulate_batch, simulate_fight
+from servers.file_utils.events import fold_pending
+from servers.file_utils.ripgrep import find_entity_by_id
+from servers.file_utils.serialization import read_entity
+from servers.utils.logging import log
+from servers.utils.metrics import instrument_tool, phase, register_metrics_tool
+
+mcp = FastMCP("Combat")
+
+MAX_FIGHTS = 100_000
+
+
+def load_entities(game_id: str, entity_ids: List[str]) -> List[Dict]:
+    entities = []
+    for entity_id in entity_ids:
+        matches = find_entity_by_id(entity_id, game_id)
+        if not matches:
+            raise FileNotFoundError(f"No entity found with id: {entity_id}")
+        with phase("json_parse"):
+            entities.append(fold_pending(game_id, read_entity(matches[0])))
+    return entities
+
+
+def load_combatants(game_id: str, entity_ids: List[str], stat_blocks: Optional[List[Dict]]) -> List[Combatant]:
+    combatants = [Combatant.from_entity(entity) for entity in load_entities(game_id, entity_ids)]
+    for stat_block in stat_blocks or []:
+        combatant = Combatant.from_entity(stat_block)
+        combatants.extend([combatant] * int(stat_block.get("count", 1)))
+    return combatants
+
+
+@mcp.tool()
+@instrument_tool
+def simulate_encounter(
+    request_id: str,
+    game_id: str,
+    party_ids: List[str],
+    enemy_ids: Optional[List[str]] = None,
+    enemies: Optional[List[Dict]] = None,
+    fights: int = 1000,
+    max_rounds: int = MAX_ROUNDS,
+    include_example: bool = False,
+    seed: Optional[int] = None,
+) -> dict:
+    """Simulate a fight between the party and a group of enemies many times and report how it tends to go. Use this instead of rolling initiative, attacks and damage by hand.
+    
+    Args:
+        request_id (str): The ID of the request.
+        game_id (str): The ID of the game.
+        party_ids (List[str]): IDs of the stored characters on the party's side ("a").
+        enemy_ids (Optional[List[str]]): IDs of stored characters on the enemy side ("b").
+        enemies (Optional[List[Dict]]): Enemy stat blocks not stored in the game, e.g. from make_stat_block. Each may set "count" for several identical enemies and "attack" ({"bonus": 4, "damage": "1d6+2", "count": 1}).
+        fights (int): Number of fights to simulate. Defaults to 1000.
+        max_rounds (int): Rounds after which a fight counts as a draw. Defaults to 50.
+        include_example (bool): Also return the turn-by-turn log of one fight. Defaults to False.
+        seed (Optional[int]): Seed for reproducible results.
+    Returns:
+        dict: win_rate per side, expected_rounds, expected_survivors per side and per-combatant survival_rate and expected_hp_remaining.
+    """
+    log({"party_ids": party_ids, "enemy_ids": enemy_ids, "enemies": enemies, "fights": fights, "request_id": request_id}, "simulate_encounter", "mcp_tool_input")
+    party = load_combatants(game_id, party_ids, None)
+    opponents = load_combatants(game_id, enemy_ids or [], enemies)
+    if not party or not opponents:
+        return {"error": "Both sides need at least one combatant."}
+    fights = max(1, min(int(fights), MAX_FIGHTS))
+    result = simulate_batch(party, opponents, fights=fights, seed=seed, max_rounds=max_rounds)
+    if include_example:
+        result["example"] = simulate_fight(party, opponents, seed=seed, max_rounds=max_rounds, record_log=True)
+    log({"result": result}, "simulate_encounter", "mcp_tool_output")
+    return result
+
+def party_levels(game_id: str, party_ids: List[str]) -> List[int]:
+    return [int(entity.get("level") or 1) for entity in load_entities(game_id, party_ids)]
+
+
+@mcp.tool()
+@instrument_tool
+def build_encounter(
+    request_id: str,
+    game_id: str,
+    party_ids: List[str],
+    difficulty: str = "medium",
+    creature_ids: Optional[List[str]] = None,
+    creatures: Optional[List[Dict]] = None,
+    max_creatures: int = 8,
+    limit: int = 5,
+) -> dict:
+    """Suggest groups of creatures that make an easy, medium, hard or deadly encounter for the party, using the Dungeon Master's Guide XP budgets. Use this instead of working out XP and multipliers by hand.
+    
+    Args:
+        request_id (str): The ID of the request.
+        game_id (str): The ID of the game.
+        party_ids (List[str]): IDs of the stored characters in the party.
+        difficulty (str): One of "easy", "medium", "hard" or "deadly". Defaults to "medium".
+        creature_ids (Optional[List[str]]): IDs of stored creatures or characters (with a "cr") to build the groups from.
+        creatures (Optional[List[Dict]]): Other candidate creatures, each {"name": ..., "cr": ...}; cr may be written as "1/4".
+        max_creatures (int): Largest group to suggest. Defaults to 8.
+        limit (int): Number of suggestions. Defaults to 5.
+    Returns:
+        dict: The party's XP budget and suggestions, each with its creatures, base_xp, adjusted_xp and difficulty. With no candidate creatures, suggests mixes of challenge ratings.
+    """
+    candidates = [
+        {"id": entity["id"], "name": entity.get("name"), "cr": entity["cr"]}
+        for entity in load_entities(game_id, creature_ids or []) if entity.get("cr") is not None
+    ] + list(creatures or [])
+    try:
+        return build_encounter_fn(party_levels(game_id, party_ids), candidates, difficulty, max_creatures, limit)
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+@instrument_tool
+def rate_encounter(request_id: str, game_id: str, party_ids: List[str], creature_crs: List[str]) -> dict:
+    """Rate how difficult a fight against creatures of the given challenge ratings is for the party.
+    
+    Args:
+        request_id (str): The ID of the request.
+        game_id (str): The ID of the game.
+        party_ids (List[str]): IDs of the stored characters in the party.
+        creature_crs (List[str]): Challenge rating of each creature, e.g. ["2", "1/4", "1/4"].
+    Returns:
+        dict: difficulty ("trivial", "easy", "medium", "hard" or "deadly"), base_xp, adjusted_xp and the party's thresholds.
+    """
+    try:
+        return rate_encounter_fn(party_levels(game_id, party_ids), creature_crs)
+    except ValueError as e:
+        return {"error": str(e)}
+
+register_metrics_tool(mcp)
+
+if __name__ == "__main__":
+    mcp.run(transport="stdio")
@@ -6,9 +6,12 @@ This server provides dice-rolling operations as tools that can be discovered and
 from mcp.server.fastmcp import FastMCP
 import random
 
+from servers.utils.metrics import instrument_tool, register_metrics_tool
+
 mcp = FastMCP("Dice")
 
 @mcp.tool()
+@instrument_tool
 def roll_dice(number_of_dice: int, number_of_sides: int, request_id: str) -> int:
     """Roll a number of dice with a given number of sides. When the user requests a 2d6, for example, they would pass 2 for number_of_dice and 6 for number_of_sides.
     
@@ -19,6 +22,8 @@ def roll_dice(number_of_dice: int, number_of_sides: int, request_id: str) -> int
     """
     return sum([random.randint(1, number_of_sides) for _ in range(number_of_dice)])
 
+register_metrics_tool(mcp)
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
 
@@ -0,0 +1,364 @@
+"""Append-only log of entity mutations, with periodic snapshots and replay.
+
+Every save and field update of a campaign appends one event to
+output/<game_id>/.events/log.jsonl:
+
+    {"seq": 42, "entity_id": "...", "path": "ambience.vibe", "old": ..., "new": ...,
+     "request_id": "...", "timestamp": "..."}
+
+path "" means the whole entity was written (new holds the full document). seq is the
+campaign's storage generation (see generation.py), so events and memoized reads share
+one ordering. Every SNAPSHOT_EVERY events the folded world state is written to
+.events/snapshot.<seq>.json, and replay() starts from the nearest snapshot. When a
+campaign's log is first created, a snapshot of the existing directory is taken so
+entities that predate the log can still be replayed.
+
+Whole-entity saves write the entity file and then log the event. Field updates are only
+appended to the log (record_update); the log is their write path. Events past the
+.events/applied.json watermark are pending. Reads of single entities fold them in
+(fold_pending), and apply_pending() writes them into the entity files, once per entity.
+That happens every APPLY_EVERY updates, and before searches and scans that read files
+directly.
+
+Every change to the log happens under an exclusive lock on .events/lock, which is a separate
+file from the log, so compaction can replace log.jsonl without losing concurrent appends.
+
+Set EVENT_LOG=off to disable logging (the generation is still bumped, and updates are
+written straight to the entity files).
+"""
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from copy import deepcopy
+from datetime import datetime, timezone
+
+from constants.paths import BASE_PATH
+from servers.file_utils.generation import bump_generation, get_generation
+from servers.file_utils.serialization import is_entity_file, read_entity
+
+SNAPSHOT_EVERY = int(os.getenv("EVENT_SNAPSHOT_EVERY", "500"))
+_held_locks = threading.local()
+# Pending field updates are written into the entity files once this many have accumulated
+APPLY_EVERY = int(os.getenv("EVENT_APPLY_EVERY", "50"))
+
+
+def event_log_enabled() -> bool:
+    return os.getenv("EVENT_LOG", "on").lower() not in ("off", "0", "false")
+
+
+def get_events_dir(game_id: str) -> str:
+    # Hidden so ripgrep searches and entity walks never see it
+    return BASE_PATH + game_id + "/.events/"
+
+
+def get_log_path(game_id: str) -> str:
+    return get_events_dir(game_id) + "log.jsonl"
+
+
+def get_lock_path(game_id: str) -> str:
+    return get_events_dir(game_id) + "lock"
+
+
+def get_applied_path(game_id: str) -> str:
+    return get_events_dir(game_id) + "applied.json"
+
+
+@contextmanager
+def event_log_lock(game_id: str):
+    """
+    Exclusive lock for appending to, applying or compacting the game's log. Re-entrant per
+    thread: applying writes through code paths that may look for pending events again.
+    """
+    held = _held_locks.__dict__.setdefault("games", set())
+    if game_id in held:
+        yield
+        return
+    os.makedirs(get_events_dir(game_id), exist_ok=True)
+    with open(get_lock_path(game_id), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        held.add(game_id)
+        try:
+            yield
+        finally:
+            held.discard(game_id)
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def log_size(game_id: str) -> int:
+    try:
+        return os.path.getsize(get_log_path(game_id))
+    except FileNotFoundError:
+        return 0
+
+
+def read_applied_offset(game_id: str) -> int:
+    """Byte offset in log.jsonl up to which every event is reflected in the entity files."""
+    try:
+        with open(get_applied_path(game_id), "r") as f:
+            return json.load(f)["offset"]
+    except FileNotFoundError:
+        # Logs written before updates were deferred were always applied at once
+        return log_size(game_id)
+
+
+def write_applied_offset(game_id: str, offset: int):
+    path = get_applied_path(game_id)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"offset": offset}, f)
+    os.replace(path + ".tmp", path)
+
+
+def get_snapshot_path(game_id: str, seq: int) -> str:
+    return get_events_dir(game_id) + f"snapshot.{seq}.json"
+
+
+def list_snapshots(game_id: str) -> list[int]:
+    directory = get_events_dir(game_id)
+    if not os.path.isdir(directory):
+        return []
+    seqs = []
+    for fname in os.listdir(directory):
+        if fname.startswith("snapshot.") and fname.endswith(".json"):
+            seqs.append(int(fname.split(".")[1]))
+    return sorted(seqs)
+
+
+def write_snapshot(game_id: str, seq: int, state: dict):
+    path = get_snapshot_path(game_id, seq)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"seq": seq, "entities": state}, f, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+
+def scan_directory_state(game_id: str) -> dict:
+    """Current state of every entity file in the campaign directory, keyed by id."""
+    state = {}
+    game_directory = os.path.normpath(BASE_PATH + game_id)
+    for root, dirs, files in os.walk(game_directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        if os.path.normpath(root) == game_directory:
+            continue
+        for fname in files:
+            if is_entity_file(fname):
+                entity = read_entity(os.path.join(root, fname))
+                state[entity["id"]] = entity
+    return state
+
+
+def read_events(game_id: str, after_seq: int = 0):
+    try:
+        with open(get_log_path(game_id), "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event["seq"] > after_seq:
+                    yield event
+    except FileNotFoundError:
+        return
+
+
+def assign_path(target: dict, path: str, value):
+    # glom is only needed for field-level events, so it is not imported at server start
+    from glom import assign
+    assign(target, path, value, missing=dict)
+
+
+def apply_event(state: dict, event: dict):
+    entity_id, path = event["entity_id"], event["path"]
+    if path == "":
+        state[entity_id] = deepcopy(event["new"])
+    elif entity_id in state:
+        assign_path(state[entity_id], path, deepcopy(event["new"]))
+
+
+def replay(game_id: str, until_seq: int | None = None, until_request_id: str | None = None) -> dict:
+    """
+    Reconstruct the state of the world (entity id -> entity) after event until_seq, or after
+    the last event written by until_request_id. With neither, returns the latest state.
+    """
+    if until_request_id is not None:
+        request_seqs = [e["seq"] for e in read_events(game_id) if e.get("request_id") == until_request_id]
+        if not request_seqs:
+            raise KeyError(f"No events recorded for request_id: {until_request_id}")
+        until_seq = max(request_seqs)
+    snapshots = [s for s in list_snapshots(game_id) if until_seq is None or s <= until_seq]
+    state, start = {}, 0
+    if snapshots:
+        with open(get_snapshot_path(game_id, snapshots[-1]), "r") as f:
+            state = json.load(f)["entities"]
+        start = snapshots[-1]
+    for event in read_events(game_id, after_seq=start):
+        if until_seq is not None and event["seq"] > until_seq:
+            break
+        apply_event(state, event)
+    return state
+
+
+def entity_history(game_id: str, entity_id: str) -> list[dict]:
+    return [e for e in read_events(game_id) if e["entity_id"] == entity_id]
+
+
+def append_event(game_id: str, entity_id: str, path: str, old, new, request_id: str | None,
+                 files: list[str] | None, written: bool = True) -> int:
+    """
+    Append one event; the caller holds event_log_lock. written tells whether the mutation
+    is already in the entity file. Returns the event's seq.
+    """
+    if not os.path.exists(get_applied_path(game_id)):
+        write_applied_offset(game_id, log_size(game_id))
+    with open(get_log_path(game_id), "a") as log_file:
+        if log_file.tell() == 0 and not list_snapshots(game_id):
+            # First event for this campaign: capture what already exists on disk,
+            # with the mutation being recorded undone if it was written first
+            baseline = scan_directory_state(game_id)
+            if written and path == "":
+                baseline.pop(entity_id, None)
+            elif written and entity_id in baseline:
+                assign_path(baseline[entity_id], path, deepcopy(old))
+            write_snapshot(game_id, get_generation(game_id), baseline)
+        seq = bump_generation(game_id, files)
+        event = {
+            "seq": seq,
+            "entity_id": entity_id,
+            "path": path,
+            "old": old,
+            "new": new,
+            "request_id": request_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        log_file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        log_file.flush()
+    if SNAPSHOT_EVERY and seq % SNAPSHOT_EVERY == 0:
+        write_snapshot(game_id, seq, replay(game_id, until_seq=seq))
+    return seq
+
+
+def record_mutation(game_id: str, entity_id: str, path: str, old, new, request_id: str | None = None,
+                    files: list[str] | None = None) -> int:
+    """
+    Log a mutation that the caller has already written to the entity file, and bump the
+    campaign's storage generation; returns the new generation (the event's seq). files are
+    the entity files that were written or removed.
+    """
+    if not event_log_enabled():
+        return bump_generation(game_id, files)
+    with event_log_lock(game_id):
+        return append_event(game_id, entity_id, path, old, new, request_id, files)
+
+
+def record_update(game_id: str, entity_id: str, path: str, old, new, request_id: str | None = None) -> int:
+    """
+    Log a field update without touching the entity file: it stays pending until
+    apply_pending(). Returns the event's seq.
+    """
+    with event_log_lock(game_id):
+        seq = append_event(game_id, entity_id, path, old, new, request_id, [], written=False)
+        if len(read_pending(game_id)) >= APPLY_EVERY:
+            apply_pending_locked(game_id)
+    return seq
+
+
+def read_pending(game_id: str) -> list[dict]:
+    """Events logged after the applied watermark, oldest first."""
+    offset = read_applied_offset(game_id)
+    try:
+        with open(get_log_path(game_id), "r") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in chunk[: chunk.rfind("\n") + 1].splitlines() if line.strip()]
+
+
+def has_pending(game_id: str) -> bool:
+    return event_log_enabled() and log_size(game_id) > read_applied_offset(game_id)
+
+
+def unapplied_updates(events: list[dict], entity_id: str) -> list[dict]:
+    """The entity's field updates that its file does not reflect: those after its last whole write."""
+    updates = []
+    for event in events:
+        if event["entity_id"] != entity_id:
+            continue
+        if event["path"] == "":
+            updates = []
+        else:
+            updates.append(event)
+    return updates
+
+
+def fold_pending(game_id: str, entity: dict) -> dict:
+    """entity as read from its file, with the game's pending updates to it applied."""
+    if not has_pending(game_id):
+        return entity
+    updates = unapplied_updates(read_pending(game_id), entity.get("id"))
+    if not updates:
+        return entity
+    entity = deepcopy(entity)
+    for event in updates:
+        assign_path(entity, event["path"], deepcopy(event["new"]))
+    return entity
+
+
+def apply_pending(game_id: str) -> int:
+    """Write the game's pending updates into its entity files; returns the number of entities rewritten."""
+    if not has_pending(game_id):
+        return 0
+    with event_log_lock(game_id):
+        return apply_pending_locked(game_id)
+
+
+def apply_pending_locked(game_id: str) -> int:
+    # Imported here: both import this module
+    from servers.file_utils.json import entity_file_paths, write_game_entity_file
+    from servers.file_utils.ripgrep import find_entity_by_id
+
+    end = log_size(game_id)
+    events = read_pending(game_id)
+    files, rewritten = [], 0
+    for entity_id in dict.fromkeys(event["entity_id"] for event in events):
+        updates = unapplied_updates(events, entity_id)
+        matches = find_entity_by_id(entity_id, game_id) if updates else []
+        if not matches:
+            continue
+        entity = read_entity(matches[0])
+        for event in updates:
+            assign_path(entity, event["path"], deepcopy(event["new"]))
+        write_game_entity_file(entity)
+        new_paths = entity_file_paths(entity)
+        if os.path.normpath(matches[0]) not in map(os.path.normpath, new_paths):
+            # A renamed entity gets a new file name; drop the old file
+            os.remove(matches[0])
+        files += [matches[0], *new_paths]
+        rewritten += 1
+    write_applied_offset(game_id, end)
+    if files:
+        bump_generation(game_id, files)
+    return rewritten
+
+
+def compact_event_log(game_id: str) -> dict:
+    """
+    Snapshot the current state and drop every event at or before it. History before the
+    snapshot can then only be reconstructed at earlier snapshot points.
+    """
+    log_path = get_log_path(game_id)
+    with event_log_lock(game_id):
+        # Pending updates must reach the files before the events that hold them are dropped
+        apply_pending_locked(game_id)
+        seq = get_generation(game_id)
+        write_snapshot(game_id, seq, replay(game_id, until_seq=seq))
+        try:
+            with open(log_path, "r") as log_file:
+                lines = log_file.readlines()
+        except FileNotFoundError:
+            lines = []
+        remaining = [line for line in lines if line.strip() and json.loads(line)["seq"] > seq]
+        with open(log_path + ".tmp", "w") as f:
+            f.writelines(remaining)
+        os.replace(log_path + ".tmp", log_path)
+        write_applied_offset(game_id, sum(len(line.encode("utf-8")) for line in remaining))
+    return {"snapshot_seq": seq, "events_before": len(lines), "events_after": len(remaining)}
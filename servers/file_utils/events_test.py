@@ -0,0 +1,21 @@
+from servers.file_utils import events
+from servers.file_utils.json import save_game_entity_fn, update_entity_field_fn
+
+
+def test_event_log_replays_state_at_any_request(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(events, "SNAPSHOT_EVERY", 2)
+    entity = {"id": "1234", "entity_type": "environment", "name": "Old Mill", "game_id": "g1",
+              "request_id": "r1", "state": {"visited": False}}
+    save_game_entity_fn(entity)
+    update_entity_field_fn("1234", "state.visited", True, request_id="r2")
+    update_entity_field_fn("1234", "name", "Burnt Mill", request_id="r3")
+
+    assert events.replay("g1", until_request_id="r1")["1234"]["state"]["visited"] is False
+    assert events.replay("g1", until_request_id="r2")["1234"]["name"] == "Old Mill"
+    assert events.replay("g1")["1234"]["name"] == "Burnt Mill"
+    assert [e["old"] for e in events.entity_history("g1", "1234")] == [None, False, "Old Mill"]
+    assert events.list_snapshots("g1") == [0, 2]
+
+    assert events.compact_event_log("g1")["events_after"] == 0
+    assert events.replay("g1")["1234"]["state"]["visited"] is True
@@ -35,6 +35,10 @@ def test_rg_basic(tmp_path):
     print('RG STDERR:', result.stderr)
     assert result.returncode == 0 or result.stdout  # Should succeed or have output
     assert 'goblin' in result.stdout
+    # And through our wrapper
+    matches = run_ripgrep('GOBLIN', str(d))
+    assert len(matches) == 1
+    assert matches[0]['file'] == str(f)
 
 def test_rg_multiple_results(tmp_path):
     import subprocess
@@ -0,0 +1,84 @@
+import fcntl
+import json
+import os
+
+from constants.paths import BASE_PATH
+
+GENERATION_FILENAME = ".generation"
+# Which files each bump touched, so indexes re-read only those instead of re-statting the game
+CHANGES_FILENAME = ".changes"
+# The journal is cut when it grows past this; readers then fall back to a rescan
+CHANGES_MAX_BYTES = 1 << 20
+
+
+def get_generation_path(game_id: str) -> str:
+    # Dotfile so ripgrep (hidden files skipped) and find_entity_by_id (suffix match) ignore it
+    return BASE_PATH + game_id + "/" + GENERATION_FILENAME
+
+
+def get_changes_path(game_id: str) -> str:
+    return BASE_PATH + game_id + "/" + CHANGES_FILENAME
+
+
+def get_generation(game_id: str) -> int:
+    """
+    Return the storage generation for game_id, or 0 if nothing has been written yet.
+    The counter lives on disk so every server process sees bumps made by the others.
+    """
+    try:
+        with open(get_generation_path(game_id), "r") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def bump_generation(game_id: str, paths: list[str] | None = None) -> int:
+    """
+    Atomically increment and return the storage generation for game_id.
+    Must be called after every write to an entity of that game, with the entity files it
+    wrote or removed; None means they are unknown and readers must rescan the game.
+    """
+    path = get_generation_path(game_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            try:
+                generation = int(f.read().strip() or 0) + 1
+            except ValueError:
+                generation = 1
+            # Journal first: whoever sees the new generation also finds its entry
+            changes_path = get_changes_path(game_id)
+            mode = "w" if os.path.exists(changes_path) and os.path.getsize(changes_path) > CHANGES_MAX_BYTES else "a"
+            with open(changes_path, mode) as changes:
+                changes.write(json.dumps({"generation": generation, "paths": paths}) + "\n")
+            f.seek(0)
+            f.truncate()
+            f.write(str(generation))
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+    return generation
+
+
+def read_changes(game_id: str, offset: int = 0) -> tuple[list[dict] | None, int]:
+    """
+    Journal records appended after byte offset, and the offset to continue from. None when
+    the journal was cut or rewritten since offset, so the caller has to rescan.
+    """
+    try:
+        with open(get_changes_path(game_id), "r") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < offset:
+                return None, f.tell()
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return ([] if offset == 0 else None), 0
+    complete = chunk[: chunk.rfind("\n") + 1]
+    try:
+        records = [json.loads(line) for line in complete.splitlines()]
+    except ValueError:
+        return None, offset + len(complete.encode("utf-8"))
+    return records, offset + len(complete.encode("utf-8"))
@@ -0,0 +1,324 @@
+"""In-memory id -> path map and token index over the entity files under output/.
+
+The index is kept current by servers.file_utils.watcher (inotify, polling fallback) and by
+writers in the same process. Before a game is queried, sync_game() checks whether its
+storage generation moved past the one the index last saw and, if so, re-reads the files
+the writers listed in the game's change journal (see generation.py), so a write made by
+another process is never missed, even before its watcher event arrives. The game is only
+re-statted as a whole on first use, or when the journal cannot account for every bump.
+"""
+import json
+import os
+import re
+import threading
+
+from constants.paths import BASE_PATH
+from servers.file_utils.events import apply_pending
+from servers.file_utils.generation import get_generation, read_changes
+from servers.file_utils.serialization import is_entity_file, read_entity
+
+TOKEN_PATTERN = re.compile(r"\w+")
+ID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+# Top-level fields that hold ids but are not references to other entities
+NON_REFERENCE_FIELDS = ("id", "request_id", "game_id")
+
+_active_index = None
+
+
+def tokenize(entity: dict) -> set[str]:
+    # Keys and values alike, lowercased, mirroring what `rg -i` sees in a JSON file
+    return set(TOKEN_PATTERN.findall(json.dumps(entity, ensure_ascii=False).lower()))
+
+
+def extract_references(entity, path: str = "") -> set[tuple[str, str]]:
+    """(field path, target id) for every string in the entity that is an entity id, e.g. ("creatures.0", "0f3c...")."""
+    references = set()
+    if isinstance(entity, dict):
+        items = ((key, value) for key, value in entity.items() if path or key not in NON_REFERENCE_FIELDS)
+    elif isinstance(entity, list):
+        items = enumerate(entity)
+    else:
+        if isinstance(entity, str) and ID_PATTERN.fullmatch(entity):
+            references.add((path, entity.lower()))
+        return references
+    for key, value in items:
+        references |= extract_references(value, f"{path}.{key}" if path else str(key))
+    return references
+
+
+def value_key(value):
+    """Normalized, type-tagged form of a scalar so that e.g. "Rogue" == "rogue" but True != 1."""
+    if isinstance(value, bool):
+        return ("b", value)
+    if isinstance(value, (int, float)):
+        return ("n", float(value))
+    if isinstance(value, str):
+        return ("s", value.lower())
+    return ("z", None)
+
+
+def extract_fields(entity, path: str = "") -> set[tuple[str, tuple]]:
+    """(field path, value key) for every scalar; list elements are indexed under the list's own path."""
+    fields = set()
+    if isinstance(entity, dict):
+        for key, value in entity.items():
+            fields |= extract_fields(value, f"{path}.{key}" if path else str(key))
+    elif isinstance(entity, list):
+        for value in entity:
+            fields |= extract_fields(value, path)
+    elif path:
+        fields.add((path, value_key(entity)))
+    return fields
+
+
+def is_plain_query(search_query: str) -> bool:
+    """Single-word queries can be answered from the token index; anything else goes to ripgrep."""
+    return bool(TOKEN_PATTERN.fullmatch(search_query or ""))
+
+
+def is_indexed_path(path: str) -> bool:
+    parts = os.path.normpath(path).split(os.sep)
+    return is_entity_file(parts[-1]) and not any(part.startswith(".") for part in parts if part not in (".", ".."))
+
+
+class EntityIndex:
+    def __init__(self, root: str = "output"):
+        self.root = os.path.normpath(root)
+        self.paths: dict[str, str] = {}
+        self.ids_by_path: dict[str, str] = {}
+        self.tokens_by_id: dict[str, set[str]] = {}
+        self.postings: dict[str, set[str]] = {}
+        self.references: dict[str, set[tuple[str, str]]] = {}
+        self.referrers: dict[str, set[tuple[str, str]]] = {}
+        self.fields_by_id: dict[str, set[tuple[str, tuple]]] = {}
+        # field path -> value key -> ids
+        self.field_values: dict[str, dict[tuple, set[str]]] = {}
+        self.stats: dict[str, tuple[int, int]] = {}
+        self.generations: dict[str, int] = {}
+        self.change_offsets: dict[str, int] = {}
+        self.lock = threading.RLock()
+
+    def game_of(self, path: str) -> str:
+        return os.path.relpath(path, self.root).split(os.sep)[0]
+
+    def upsert_file(self, path: str):
+        path = os.path.normpath(path)
+        if not is_indexed_path(path):
+            return
+        try:
+            stat = os.stat(path)
+            entity = read_entity(path)
+        except (FileNotFoundError, ValueError):
+            # Deleted or half-written; the next event for this path settles it
+            return
+        if not isinstance(entity, dict) or "id" not in entity:
+            return
+        entity_id = entity["id"]
+        with self.lock:
+            self.remove_file(path)
+            if entity_id in self.paths:
+                # Same entity under a new file name: drop the old postings first
+                self.remove_file(self.paths[entity_id])
+            tokens = tokenize(entity)
+            self.paths[entity_id] = path
+            self.ids_by_path[path] = entity_id
+            self.tokens_by_id[entity_id] = tokens
+            self.stats[path] = (stat.st_mtime_ns, stat.st_size)
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(entity_id)
+            references = extract_references(entity)
+            self.references[entity_id] = references
+            for field, target in references:
+                self.referrers.setdefault(target, set()).add((entity_id, field))
+            fields = extract_fields(entity)
+            self.fields_by_id[entity_id] = fields
+            for field, key in fields:
+                self.field_values.setdefault(field, {}).setdefault(key, set()).add(entity_id)
+
+    def remove_file(self, path: str):
+        path = os.path.normpath(path)
+        with self.lock:
+            self.stats.pop(path, None)
+            entity_id = self.ids_by_path.pop(path, None)
+            if entity_id is None or self.paths.get(entity_id) != path:
+                # Unknown, or the entity has already been seen at its new path
+                return
+            del self.paths[entity_id]
+            for token in self.tokens_by_id.pop(entity_id, ()):
+                ids = self.postings.get(token)
+                if ids is not None:
+                    ids.discard(entity_id)
+                    if not ids:
+                        del self.postings[token]
+            for field, target in self.references.pop(entity_id, ()):
+                sources = self.referrers.get(target)
+                if sources is not None:
+                    sources.discard((entity_id, field))
+                    if not sources:
+                        del self.referrers[target]
+            for field, key in self.fields_by_id.pop(entity_id, ()):
+                values = self.field_values.get(field, {})
+                ids = values.get(key)
+                if ids is not None:
+                    ids.discard(entity_id)
+                    if not ids:
+                        del values[key]
+                        if not values:
+                            del self.field_values[field]
+
+    def remove_tree(self, directory: str):
+        prefix = os.path.normpath(directory) + os.sep
+        with self.lock:
+            for path in [p for p in self.ids_by_path if p.startswith(prefix)]:
+                self.remove_file(path)
+
+    def move(self, source: str, destination: str):
+        self.remove_file(source)
+        self.upsert_file(destination)
+
+    def scan(self, directory: str | None = None) -> int:
+        """
+        Stat every entity file under directory (default: the whole root) and re-read only the
+        ones whose mtime or size changed; drop files that disappeared. Returns files re-read.
+        """
+        directory = os.path.normpath(directory or self.root)
+        prefix = directory + os.sep
+        seen, changed = set(), 0
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for fname in files:
+                path = os.path.join(root, fname)
+                if not is_indexed_path(path):
+                    continue
+                seen.add(path)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if self.stats.get(path) != (stat.st_mtime_ns, stat.st_size):
+                    self.upsert_file(path)
+                    changed += 1
+        with self.lock:
+            for path in [p for p in self.stats if p.startswith(prefix) and p not in seen]:
+                self.remove_file(path)
+        return changed
+
+    def refresh_file(self, path: str):
+        if os.path.exists(path):
+            self.upsert_file(path)
+        else:
+            self.remove_file(path)
+
+    def sync_game(self, game_id: str):
+        # Deferred field updates reach the files (and the change journal) first
+        apply_pending(game_id)
+        generation = get_generation(game_id)
+        seen = self.generations.get(game_id)
+        if seen == generation:
+            return
+        changes, offset = read_changes(game_id, self.change_offsets.get(game_id, 0))
+        expected = list(range(seen + 1, generation + 1)) if seen is not None else None
+        if (
+            changes is None
+            or [change["generation"] for change in changes][: len(expected or ())] != expected
+            or any(change["paths"] is None for change in changes)
+        ):
+            # First sync of the game, a cut journal or a writer that did not list its files
+            self.scan(os.path.join(self.root, game_id))
+        else:
+            for path in dict.fromkeys(path for change in changes for path in change["paths"]):
+                self.refresh_file(path)
+        self.change_offsets[game_id] = offset
+        self.generations[game_id] = max([generation] + [change["generation"] for change in changes or ()])
+
+    def path_for(self, entity_id: str, game_id: str | None = None) -> str | None:
+        if game_id:
+            self.sync_game(game_id)
+        path = self.paths.get(entity_id)
+        if path and game_id and self.game_of(path) != game_id:
+            return None
+        return path
+
+    def ids_with_text(self, text: str) -> set[str]:
+        """Ids with a token containing text (case-insensitive), across all games."""
+        needle = text.lower()
+        with self.lock:
+            ids = set()
+            for token, token_ids in self.postings.items():
+                if needle in token:
+                    ids |= token_ids
+            return ids
+
+    def game_entity_ids(self, game_id: str) -> set[str]:
+        with self.lock:
+            return {entity_id for entity_id, path in self.paths.items() if self.game_of(path) == game_id}
+
+    def search(self, search_query: str, game_id: str, entity_type: str = "") -> list[str]:
+        """Paths of the game's entities with a token containing search_query (case-insensitive)."""
+        self.sync_game(game_id)
+        ids = self.ids_with_text(search_query)
+        with self.lock:
+            paths = []
+            for entity_id in ids:
+                path = self.paths.get(entity_id)
+                parts = os.path.relpath(path, self.root).split(os.sep) if path else []
+                if len(parts) < 3 or parts[0] != game_id or (entity_type and parts[1] != entity_type):
+                    continue
+                paths.append(path)
+        return sorted(paths)
+
+    def references_to(self, entity_id: str, game_id: str) -> list[dict]:
+        """Entities of the game that hold entity_id in one of their fields."""
+        self.sync_game(game_id)
+        with self.lock:
+            sources = sorted(self.referrers.get(entity_id.lower(), ()))
+            return [{"id": source, "field": field} for source, field in sources
+                    if source in self.paths and self.game_of(self.paths[source]) == game_id]
+
+    def references_from(self, entity_id: str, game_id: str) -> list[dict]:
+        self.sync_game(game_id)
+        with self.lock:
+            return [{"field": field, "id": target} for field, target in sorted(self.references.get(entity_id, ()))]
+
+    def dangling_references(self, game_id: str) -> list[dict]:
+        """Every reference in the game whose target entity does not exist in that game."""
+        self.sync_game(game_id)
+        with self.lock:
+            known = {entity_id.lower() for entity_id, path in self.paths.items() if self.game_of(path) == game_id}
+            dangling = []
+            for target, sources in self.referrers.items():
+                if target in known:
+                    continue
+                for source, field in sorted(sources):
+                    if source in self.paths and self.game_of(self.paths[source]) == game_id:
+                        dangling.append({"id": source, "field": field, "missing_id": target})
+        return sorted(dangling, key=lambda d: (d["id"], d["field"]))
+
+
+def get_game_index(game_id: str) -> EntityIndex:
+    """The active index, or (in scripts and with INDEX_WATCH=off) a one-off index of the game."""
+    index = get_active_index()
+    if index is None:
+        index = EntityIndex(BASE_PATH)
+        index.scan(BASE_PATH + game_id)
+    return index
+
+
+def get_active_index() -> EntityIndex | None:
+    return _active_index
+
+
+def set_active_index(index: EntityIndex | None):
+    global _active_index
+    _active_index = index
+
+
+def notify_written(path: str):
+    """Let the active index see a write from this process without waiting for the watcher."""
+    if _active_index is not None:
+        _active_index.upsert_file(path)
+
+
+def notify_removed(path: str):
+    if _active_index is not None:
+        _active_index.remove_file(path)
@@ -1,20 +1,46 @@
-import json
 import os
 from copy import deepcopy
-from glom import glom, assign
 
 from servers.file_utils.path import get_path
 from servers.file_utils.filename import make_filename
 from servers.file_utils.ripgrep import find_entity_by_id
+from servers.file_utils.events import event_log_enabled, fold_pending, record_mutation, record_update
+from servers.file_utils.index import notify_removed, notify_written
+from servers.file_utils.serialization import (
+    ENTITY_EXTENSIONS, extension_for, get_entity_format, read_entity, strip_entity_extension, write_entity,
+)
 from servers.utils.logging import log
+from servers.utils.metrics import phase
 
-def save_game_entity_fn(game_entity: dict) -> str:
-    filename = make_filename(game_entity)
+def write_game_entity_file(game_entity: dict) -> str:
+    fmt = get_entity_format()
+    stem = strip_entity_extension(make_filename(game_entity))
+    filename = stem + extension_for(fmt)
     directory = get_path(game_entity)
     if not os.path.exists(directory):
         os.makedirs(directory)
-    with open(directory + filename, "w") as f:
-        json.dump(game_entity, f, indent="\t")
+    with phase("write"):
+        write_entity(directory + filename, game_entity, fmt)
+    # Drop a copy of the same entity saved earlier in the other format
+    for extension in ENTITY_EXTENSIONS:
+        if stem + extension != filename and os.path.exists(directory + stem + extension):
+            os.remove(directory + stem + extension)
+            notify_removed(directory + stem + extension)
+    notify_written(directory + filename)
+    # Imported on first save rather than at server start: it pulls in numpy
+    from servers.file_utils.semantic import index_entity
+    index_entity(game_entity, directory + filename)
+    return filename
+
+def entity_file_paths(game_entity: dict) -> list[str]:
+    """Every file write_game_entity_file may write or remove for game_entity, one per format."""
+    stem = strip_entity_extension(make_filename(game_entity))
+    return [get_path(game_entity) + stem + extension for extension in ENTITY_EXTENSIONS]
+
+def save_game_entity_fn(game_entity: dict) -> str:
+    filename = write_game_entity_file(game_entity)
+    record_mutation(game_entity["game_id"], game_entity["id"], "", None, game_entity, game_entity.get("request_id"),
+                    files=entity_file_paths(game_entity))
     return filename
 
 def read_game_entity_fn(entity_id: str) -> dict:
@@ -26,8 +52,8 @@ def read_game_entity_fn(entity_id: str) -> dict:
     extracted_game_id = filepath.split("/")[1]
     extracted_entity_type = filepath.split("/")[2]
     entity = None
-    with open(filepath, "r") as f:
-        entity = json.load(f)
+    with phase("json_parse"):
+        entity = fold_pending(extracted_game_id, read_entity(filepath))
     entity_file_match = {
         "filepath": filepath,
         "game_id": extracted_game_id,
@@ -36,8 +62,9 @@ def read_game_entity_fn(entity_id: str) -> dict:
     }
     return entity_file_match
 
-def update_entity_field_fn(entity_id: str, field: str, value: str or int or float or bool or dict or list) -> str:
+def update_entity_field_fn(entity_id: str, field: str, value: str or int or float or bool or dict or list, request_id: str = None) -> str:
     # ToDo: Make sure thee changes match the schema defintions
+    from glom import glom, assign
     try:
         entity_file_match = read_game_entity_fn(entity_id)
         filepath = entity_file_match["filepath"]
@@ -47,8 +74,14 @@ def update_entity_field_fn(entity_id: str, field: str, value: str or int or floa
         previous_value = glom(old_entity, field, default=None)
         new_entity = deepcopy(old_entity)
         assign(new_entity, field, value)
-        save_game_entity_fn(new_entity)
-        return new_entity    
+        if event_log_enabled():
+            # The logged event is the write; the file catches up in apply_pending()
+            record_update(game_id, entity_id, field, previous_value, value, request_id)
+        else:
+            write_game_entity_file(new_entity)
+            record_mutation(game_id, entity_id, field, previous_value, value, request_id,
+                            files=[filepath, *entity_file_paths(new_entity)])
+        return new_entity
     except Exception as e:
         raise Exception(e)
     
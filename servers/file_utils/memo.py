@@ -0,0 +1,74 @@
+import functools
+import inspect
+import json
+from collections import OrderedDict
+from copy import deepcopy
+
+from servers.file_utils.generation import get_generation
+
+
+def memoize_read(game_id_arg: str = "game_id", normalize=None, maxsize: int = 256):
+    """
+    Memoize a read-only storage function on its normalized arguments plus the storage
+    generation of the game it reads from. Any save/update of that game bumps the
+    generation, so stale entries are never served and simply age out of the LRU.
+
+    Args:
+        game_id_arg (str): Name of the argument that holds the game id.
+        normalize (callable, optional): Takes the bound arguments dict and returns a
+            normalized copy. The wrapped function is called with the normalized arguments.
+        maxsize (int): Maximum number of cached results kept per function.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        cache = OrderedDict()
+        stats = {"hits": 0, "misses": 0}
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if normalize:
+                arguments = normalize(arguments)
+            key = (
+                json.dumps(arguments, sort_keys=True, default=str),
+                get_generation(arguments[game_id_arg]),
+            )
+            if key in cache:
+                stats["hits"] += 1
+                cache.move_to_end(key)
+                return deepcopy(cache[key])
+            stats["misses"] += 1
+            result = fn(**arguments)
+            cache[key] = deepcopy(result)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+
+        def cache_info() -> dict:
+            return {**stats, "size": len(cache), "maxsize": maxsize}
+
+        def cache_clear():
+            cache.clear()
+            stats["hits"] = stats["misses"] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+def normalize_search_arguments(arguments: dict) -> dict:
+    """
+    Normalize find_entities_fn arguments. rg runs with -i, so case is irrelevant unless the
+    query contains an escape sequence (\\S, \\W, ...) whose meaning depends on case.
+    """
+    normalized = dict(arguments)
+    query = (normalized.get("search_query") or "").strip()
+    if "\\" not in query:
+        query = query.lower()
+    normalized["search_query"] = query
+    normalized["game_id"] = (normalized.get("game_id") or "").strip()
+    normalized["entity_type"] = (normalized.get("entity_type") or "").strip().lower()
+    return normalized
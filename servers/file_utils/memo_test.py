@@ -0,0 +1,24 @@
+from servers.file_utils.generation import bump_generation, get_generation
+from servers.file_utils.memo import memoize_read, normalize_search_arguments
+
+
+def test_memoize_read_invalidates_on_generation_bump(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    @memoize_read(normalize=normalize_search_arguments)
+    def search(search_query: str, game_id: str, entity_type: str = ""):
+        calls.append(search_query)
+        return [search_query]
+
+    assert get_generation("g1") == 0
+    assert search("Goblin ", "g1") == ["goblin"]
+    assert search("goblin", "g1", "") == ["goblin"]
+    assert len(calls) == 1
+    assert bump_generation("g1") == 1
+    search("goblin", "g1")
+    assert len(calls) == 2
+    # case is preserved when the query contains escapes
+    search("\\S+goblin", "g1")
+    assert calls[-1] == "\\S+goblin"
+    assert search.cache_info()["hits"] == 1
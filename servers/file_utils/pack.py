@@ -0,0 +1,261 @@
+"""Packed campaign archives: one append-only data file plus an id -> offset index.
+
+A campaign directory (output/<game_id>/<entity_type>/*.json) can be exported into
+
+    output/<game_id>.pack      records, appended in order
+    output/<game_id>.pack.idx  JSON index {"data_size": n, "entries": {id: [offset, length, entity_type]}}
+
+Each record is a fixed header (kind, id length, payload length), the id, and the entity
+payload encoded by servers.file_utils.serialization. Updates and deletes append a new
+record or a tombstone, so the index always points at the latest version; compact()
+rewrites only live records. Reads are a single slice of a memory-mapped data file.
+
+Usage:
+    python -m servers.file_utils.pack export <game_id>
+    python -m servers.file_utils.pack import <game_id>
+    python -m servers.file_utils.pack compact <game_id>
+    python -m servers.file_utils.pack get <game_id> <entity_id>
+"""
+import argparse
+import fcntl
+import json
+import mmap
+import os
+import struct
+
+from constants.paths import BASE_PATH
+from servers.file_utils.events import apply_pending
+from servers.file_utils.serialization import dumps_entity, is_entity_file, loads_entity, read_entity
+
+MAGIC = b"DNDPACK1"
+# kind (0 = entity, 1 = tombstone), id length, payload length
+HEADER = struct.Struct("<BHI")
+KIND_ENTITY = 0
+KIND_TOMBSTONE = 1
+
+
+def get_pack_path(game_id: str) -> str:
+    return BASE_PATH + game_id + ".pack"
+
+
+class PackedCampaign:
+    """
+    Append-only packed storage for one campaign.
+
+    Args:
+        path (str): Path of the data file; the index lives next to it with an .idx suffix.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + ".idx"
+        new_file = not os.path.exists(path)
+        self.file = open(path, "a+b")
+        if new_file or os.path.getsize(path) == 0:
+            self.file.write(MAGIC)
+            self.file.flush()
+        self.file.seek(0)
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a packed campaign")
+        self.entries: dict[str, list] = {}
+        self.data_size = len(MAGIC)
+        self._map = None
+        self._map_size = 0
+        self._load_index()
+
+    # ── Index ───────────────────────────────────────────────────────────────────
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            self.entries = index["entries"]
+            self.data_size = index["data_size"]
+        except (FileNotFoundError, ValueError, KeyError):
+            self.entries, self.data_size = {}, len(MAGIC)
+        actual_size = os.path.getsize(self.path)
+        if self.data_size > actual_size:
+            # The index is ahead of the data (truncated file); rebuild from scratch.
+            self.entries, self.data_size = {}, len(MAGIC)
+        if self.data_size < actual_size:
+            self._scan(self.data_size, actual_size)
+
+    def _scan(self, start: int, end: int):
+        """Replay record headers in [start, end) into the index, e.g. after a crash."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            while offset + HEADER.size <= end:
+                kind, id_length, payload_length = HEADER.unpack(f.read(HEADER.size))
+                entity_id = f.read(id_length).decode("utf-8")
+                payload_offset = offset + HEADER.size + id_length
+                if payload_offset + payload_length > end:
+                    break  # torn write at the tail
+                if kind == KIND_TOMBSTONE:
+                    self.entries.pop(entity_id, None)
+                else:
+                    entity_type = loads_entity(f.read(payload_length)).get("entity_type")
+                    self.entries[entity_id] = [payload_offset, payload_length, entity_type]
+                f.seek(payload_offset + payload_length)
+                offset = payload_offset + payload_length
+        self.data_size = offset
+
+    def flush(self):
+        """Persist the index atomically; the data file is flushed on every append."""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"data_size": self.data_size, "entries": self.entries}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    # ── Writes ──────────────────────────────────────────────────────────────────
+    def _append(self, kind: int, entity_id: str, payload: bytes) -> int:
+        encoded_id = entity_id.encode("utf-8")
+        fcntl.flock(self.file, fcntl.LOCK_EX)
+        try:
+            self.file.seek(0, os.SEEK_END)
+            offset = self.file.tell()
+            self.file.write(HEADER.pack(kind, len(encoded_id), len(payload)) + encoded_id + payload)
+            self.file.flush()
+        finally:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.data_size = offset + HEADER.size + len(encoded_id) + len(payload)
+        return offset + HEADER.size + len(encoded_id)
+
+    def put(self, entity: dict, fmt: str | None = None):
+        payload = dumps_entity(entity, fmt)
+        payload_offset = self._append(KIND_ENTITY, entity["id"], payload)
+        self.entries[entity["id"]] = [payload_offset, len(payload), entity.get("entity_type")]
+
+    def delete(self, entity_id: str):
+        if entity_id not in self.entries:
+            raise KeyError(entity_id)
+        self._append(KIND_TOMBSTONE, entity_id, b"")
+        del self.entries[entity_id]
+
+    # ── Reads ───────────────────────────────────────────────────────────────────
+    def _view(self) -> memoryview:
+        if self._map is None or self._map_size < self.data_size:
+            self._release_map()
+            self._map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_size = len(self._map)
+        return memoryview(self._map)
+
+    def _release_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._map_size = 0
+
+    def get(self, entity_id: str) -> dict:
+        entry = self.entries.get(entity_id)
+        if entry is None:
+            raise KeyError(entity_id)
+        offset, length, _ = entry
+        with self._view() as view:
+            return loads_entity(view[offset:offset + length])
+
+    def ids(self, entity_type: str | None = None) -> list[str]:
+        return [i for i, e in self.entries.items() if entity_type is None or e[2] == entity_type]
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        for entity_id in list(self.entries):
+            yield self.get(entity_id)
+
+    def stats(self) -> dict:
+        live_bytes = sum(e[1] for e in self.entries.values())
+        return {"entities": len(self.entries), "data_size": self.data_size, "live_payload_bytes": live_bytes}
+
+    # ── Maintenance ─────────────────────────────────────────────────────────────
+    def compact(self) -> dict:
+        """Rewrite only the live records into a fresh file and swap it in place."""
+        before = self.data_size
+        tmp_path = self.path + ".compact"
+        for path in (tmp_path, tmp_path + ".idx"):
+            if os.path.exists(path):
+                os.remove(path)
+        with PackedCampaign(tmp_path) as compacted:
+            with self._view() as view:
+                for entity_id, (offset, length, entity_type) in self.entries.items():
+                    payload = view[offset:offset + length].tobytes()
+                    payload_offset = compacted._append(KIND_ENTITY, entity_id, payload)
+                    compacted.entries[entity_id] = [payload_offset, length, entity_type]
+        self._release_map()
+        self.file.close()
+        os.replace(tmp_path, self.path)
+        os.replace(tmp_path + ".idx", self.index_path)
+        self.file = open(self.path, "a+b")
+        self._load_index()
+        return {"bytes_before": before, "bytes_after": self.data_size}
+
+    def close(self):
+        self.flush()
+        self._release_map()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_campaign(game_id: str, pack_path: str | None = None) -> dict:
+    """Pack every entity file under output/<game_id>/<entity_type>/ into a packed campaign."""
+    pack_path = pack_path or get_pack_path(game_id)
+    game_directory = os.path.normpath(BASE_PATH + game_id)
+    apply_pending(game_id)
+    with PackedCampaign(pack_path) as pack:
+        for root, dirs, files in os.walk(game_directory):
+            # Skip bookkeeping directories such as .events/
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            # Entities live in <game_id>/<entity_type>/; skip game_information.json at the top
+            if os.path.normpath(root) == game_directory:
+                continue
+            for fname in files:
+                if is_entity_file(fname):
+                    pack.put(read_entity(os.path.join(root, fname)))
+        return pack.stats()
+
+
+def import_campaign(game_id: str, pack_path: str | None = None) -> int:
+    """Write every packed entity back to the directory layout through the normal save path."""
+    from servers.file_utils.json import save_game_entity_fn
+
+    count = 0
+    with PackedCampaign(pack_path or get_pack_path(game_id)) as pack:
+        for entity in pack:
+            save_game_entity_fn(entity)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert campaigns between the directory layout and packed archives.")
+    parser.add_argument("command", choices=["export", "import", "compact", "get", "stats"])
+    parser.add_argument("game_id")
+    parser.add_argument("entity_id", nargs="?")
+    parser.add_argument("--pack", help="Pack file path (default output/<game_id>.pack)")
+    args = parser.parse_args()
+    pack_path = args.pack or get_pack_path(args.game_id)
+
+    if args.command == "export":
+        print(json.dumps(export_campaign(args.game_id, pack_path), indent=2))
+    elif args.command == "import":
+        print(f"Imported {import_campaign(args.game_id, pack_path)} entities into {BASE_PATH}{args.game_id}/")
+    else:
+        with PackedCampaign(pack_path) as pack:
+            if args.command == "compact":
+                print(json.dumps(pack.compact(), indent=2))
+            elif args.command == "stats":
+                print(json.dumps(pack.stats(), indent=2))
+            else:
+                print(json.dumps(pack.get(args.entity_id), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+
+from servers.file_utils.pack import PackedCampaign
+
+
+def test_packed_campaign_roundtrip_and_compaction(tmp_path):
+    path = str(tmp_path / "game.pack")
+    with PackedCampaign(path) as pack:
+        for i in range(5):
+            pack.put({"id": f"id-{i}", "entity_type": "character", "name": f"N{i}"})
+        pack.put({"id": "id-1", "entity_type": "character", "name": "Renamed"})
+        pack.delete("id-2")
+        assert pack.get("id-1")["name"] == "Renamed"
+        before = pack.data_size
+
+    # Reopen without the index to prove the data file is self-describing
+    os.remove(path + ".idx")
+    with PackedCampaign(path) as pack:
+        assert sorted(pack.ids()) == ["id-0", "id-1", "id-3", "id-4"]
+        assert pack.get("id-1")["name"] == "Renamed"
+        result = pack.compact()
+        assert result["bytes_after"] < before
+        assert pack.get("id-4")["name"] == "N4"
+        assert "id-2" not in pack
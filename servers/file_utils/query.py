@@ -0,0 +1,196 @@
+"""A small query language for entities, evaluated against the EntityIndex field indexes.
+
+    entity_type=character AND class=Rogue AND level>=5
+    entity_type=environment kind~closed threats~trap
+    (race=Elf OR race="Half-Elf") NOT background=Sailor
+    ability_scores.DEX>14 quillfeather
+
+A comparison is <field><op><value>; fields are dotted paths into the entity and a list field
+matches if any element does. Operators: = and != (case-insensitive equality), > >= < <=
+(numbers), ~ (case-insensitive substring). Values are numbers, true/false/null, bare words
+or "quoted strings". A term on its own is a text search over every field, like
+find_entities. Terms are ANDed unless joined by OR; NOT negates; parentheses group.
+
+compile_query() turns the text into a plan of index lookups: equality is a hash lookup,
+ranges and ~ scan only the distinct values of one field, AND narrows the candidates starting
+with equality lookups, and entities are read from disk only for the final matches.
+"""
+import re
+
+from servers.file_utils.index import EntityIndex, get_game_index, value_key
+from servers.file_utils.serialization import read_entity
+from servers.utils.metrics import phase
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<paren>[()])
+      | (?P<field>[A-Za-z_][\w.]*)\s*(?P<op>>=|<=|!=|=|>|<|~)\s*(?P<value>"(?:[^"\\]|\\.)*"|[^\s()"]+)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<word>[^\s()"]+)
+    )""", re.VERBOSE)
+KEYWORDS = ("AND", "OR", "NOT")
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+def parse_value(text: str):
+    if text.startswith('"'):
+        return re.sub(r"\\(.)", r"\1", text[1:-1])
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered == "null":
+        return None
+    try:
+        return float(text) if any(c in text for c in ".eE") else int(text)
+    except ValueError:
+        return text
+
+
+def tokenize_query(query: str) -> list[tuple]:
+    tokens, position = [], 0
+    query = query.rstrip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise QuerySyntaxError(f"Unexpected input at position {position}: {query[position:]!r}")
+        position = match.end()
+        if match["paren"]:
+            tokens.append(("paren", match["paren"]))
+        elif match["field"]:
+            tokens.append(("compare", match["field"], match["op"], parse_value(match["value"])))
+        elif match["string"]:
+            tokens.append(("text", parse_value(match["string"])))
+        elif match["word"] in KEYWORDS:
+            tokens.append(("keyword", match["word"]))
+        else:
+            tokens.append(("text", match["word"]))
+    return tokens
+
+
+class Parser:
+    """Recursive descent: or := and (OR and)* ; and := not (AND? not)* ; not := NOT not | atom."""
+
+    def __init__(self, tokens: list[tuple]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("Empty query")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.peek() == ("keyword", "OR"):
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else ("or", operands)
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while self.peek() not in (None, ("keyword", "OR"), ("paren", ")")):
+            if self.peek() == ("keyword", "AND"):
+                self.take()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else ("and", operands)
+
+    def parse_not(self):
+        if self.peek() == ("keyword", "NOT"):
+            self.take()
+            return ("not", self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        token = self.take()
+        if token is None:
+            raise QuerySyntaxError("Query ends unexpectedly")
+        if token == ("paren", "("):
+            node = self.parse_or()
+            if self.take() != ("paren", ")"):
+                raise QuerySyntaxError("Missing closing parenthesis")
+            return node
+        if token[0] == "compare":
+            return token
+        if token[0] == "text":
+            return ("text", str(token[1]))
+        raise QuerySyntaxError(f"Unexpected {token[1]!r}")
+
+
+def compile_query(query: str):
+    return Parser(tokenize_query(query)).parse()
+
+
+def matches_comparison(key: tuple, op: str, value) -> bool:
+    tag, stored = key
+    if op == "~":
+        return tag == "s" and str(value).lower() in stored
+    if op in (">", ">=", "<", "<="):
+        if tag != "n" or isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return {">": stored > value, ">=": stored >= value, "<": stored < value, "<=": stored <= value}[op]
+    raise ValueError(op)
+
+
+def execute_plan(plan, index: EntityIndex, game_ids: set[str]) -> set[str]:
+    kind = plan[0]
+    if kind == "compare":
+        _, field, op, value = plan
+        values = index.field_values.get(field, {})
+        if op in ("=", "!="):
+            ids = set(values.get(value_key(value), ()))
+            return ids & game_ids if op == "=" else game_ids - ids
+        ids = set()
+        for key, key_ids in values.items():
+            if matches_comparison(key, op, value):
+                ids |= key_ids
+        return ids & game_ids
+    if kind == "text":
+        return index.ids_with_text(plan[1]) & game_ids
+    if kind == "not":
+        return game_ids - execute_plan(plan[1], index, game_ids)
+    if kind == "or":
+        ids = set()
+        for operand in plan[1]:
+            ids |= execute_plan(operand, index, game_ids)
+        return ids
+    # and: evaluate cheap equality lookups first and stop as soon as nothing is left
+    operands = sorted(plan[1], key=lambda node: 0 if node[0] == "compare" and node[2] == "=" else 1)
+    ids = None
+    for operand in operands:
+        ids = execute_plan(operand, index, game_ids if ids is None else ids)
+        if not ids:
+            return set()
+    return ids
+
+
+def query_entities_fn(query: str, game_id: str, limit: int = 50) -> list[dict]:
+    """Entities of the game matching the query, ordered by file name, at most limit of them."""
+    plan = compile_query(query)
+    index = get_game_index(game_id)
+    with phase("index_lookup"):
+        index.sync_game(game_id)
+        with index.lock:
+            ids = execute_plan(plan, index, index.game_entity_ids(game_id))
+            paths = sorted(index.paths[entity_id] for entity_id in ids if entity_id in index.paths)
+    entities = []
+    for path in paths[:limit]:
+        try:
+            with phase("json_parse"):
+                entities.append(read_entity(path))
+        except FileNotFoundError:
+            continue
+    return entities
@@ -0,0 +1,23 @@
+import pytest
+
+from servers.file_utils.json import save_game_entity_fn
+from servers.file_utils.query import QuerySyntaxError, compile_query, query_entities_fn
+
+
+def test_query_entities_filters_with_field_indexes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for i, (char_class, level) in enumerate([("Rogue", 3), ("Rogue", 7), ("Bard", 9)]):
+        save_game_entity_fn({"id": f"c{i}", "entity_type": "character", "name": f"N{i}", "description": "x",
+                             "game_id": "g1", "class": char_class, "level": level})
+    save_game_entity_fn({"id": "e1", "entity_type": "environment", "name": "Crypt", "game_id": "g1",
+                         "kind": "Closed:Crypt", "threats": ["Pit trap (DC 13)"]})
+
+    def ids(query):
+        return sorted(e["id"] for e in query_entities_fn(query, "g1"))
+
+    assert ids("entity_type=character AND class=rogue AND level>=5") == ["c1"]
+    assert ids("entity_type=environment kind~closed threats~TRAP") == ["e1"]
+    assert ids("(class=Bard OR level<5) NOT name=N2") == ["c0"]
+    assert ids("crypt OR level>8") == ["c2", "e1"]
+    with pytest.raises(QuerySyntaxError):
+        compile_query("(class=Rogue")
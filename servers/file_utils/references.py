@@ -0,0 +1,44 @@
+"""Reverse-reference lookups and integrity checks over a campaign's entities.
+
+Backed by the reference maps of the active EntityIndex, which are updated on every save
+and watcher event, so a lookup costs O(degree) rather than a scan of the campaign. Without
+an active index (scripts, INDEX_WATCH=off) a one-off index of the game is built.
+"""
+import argparse
+import json
+
+from servers.file_utils.index import get_game_index
+
+
+def get_references_fn(game_id: str, entity_id: str) -> dict:
+    index = get_game_index(game_id)
+    return {
+        "id": entity_id,
+        "referenced_by": index.references_to(entity_id, game_id),
+        "references": index.references_from(entity_id, game_id),
+    }
+
+
+def find_dangling_references_fn(game_id: str) -> list[dict]:
+    return get_game_index(game_id).dangling_references(game_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect references between a campaign's entities.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    refs = subparsers.add_parser("refs", help="Show what references an entity and what it references")
+    refs.add_argument("game_id")
+    refs.add_argument("entity_id")
+    check = subparsers.add_parser("check", help="List references to entities that do not exist")
+    check.add_argument("game_id")
+    args = parser.parse_args()
+    if args.command == "refs":
+        print(json.dumps(get_references_fn(args.game_id, args.entity_id), indent=2))
+    else:
+        dangling = find_dangling_references_fn(args.game_id)
+        print(json.dumps(dangling, indent=2))
+        raise SystemExit(1 if dangling else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from servers.file_utils.index import EntityIndex, set_active_index
+from servers.file_utils.json import save_game_entity_fn, update_entity_field_fn
+from servers.file_utils.references import find_dangling_references_fn, get_references_fn
+
+
+def test_reference_index_tracks_saves_and_dangling_ids(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    hero, ghost = "11111111-1111-4111-8111-111111111111", "22222222-2222-4222-8222-222222222222"
+    inn = "33333333-3333-4333-8333-333333333333"
+    save_game_entity_fn({"id": hero, "entity_type": "character", "name": "Hero", "description": "brave", "game_id": "g1"})
+    set_active_index(EntityIndex("output"))
+    try:
+        save_game_entity_fn({"id": inn, "entity_type": "environment", "name": "Inn", "game_id": "g1",
+                             "request_id": "44444444-4444-4444-8444-444444444444", "creatures": [hero, ghost, "a dog"]})
+        assert get_references_fn("g1", hero)["referenced_by"] == [{"id": inn, "field": "creatures.0"}]
+        assert find_dangling_references_fn("g1") == [{"id": inn, "field": "creatures.1", "missing_id": ghost}]
+        update_entity_field_fn(inn, "creatures", [ghost])
+        assert get_references_fn("g1", hero)["referenced_by"] == []
+        assert get_references_fn("g1", inn)["references"] == [{"field": "creatures.0", "id": ghost}]
+    finally:
+        set_active_index(None)
+
+
+def test_index_sync_rereads_only_journaled_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_game_entity_fn({"id": "1", "entity_type": "character", "name": "Ann", "description": "x", "game_id": "g1"})
+    index = EntityIndex("output")
+    assert index.path_for("1", "g1") == "output/g1/character/Ann.x.1.json"
+    scanned = []
+    monkeypatch.setattr(index, "scan", lambda directory=None: scanned.append(directory))
+    # Writes from "another process": only the generation bump and journal tell the index
+    save_game_entity_fn({"id": "2", "entity_type": "character", "name": "Bob", "description": "y", "game_id": "g1"})
+    update_entity_field_fn("1", "description", "z")
+    assert index.path_for("2", "g1") == "output/g1/character/Bob.y.2.json"
+    assert index.path_for("1", "g1") == "output/g1/character/Ann.z.1.json"
+    assert scanned == []
@@ -1,8 +1,11 @@
 import subprocess
 from typing import List, Dict
-import json
 import os
 from typing import Optional
+from servers.utils.metrics import phase
+from servers.file_utils.serialization import ENTITY_EXTENSIONS, read_entity
+from servers.file_utils.events import apply_pending
+from servers.file_utils.index import get_active_index, is_plain_query
 
 
 BASE_PATH="output/"
@@ -20,13 +23,14 @@ def run_ripgrep(query: str, search_path: str = './output') -> List[Dict[str, str
     #query = f"/{query}/i"
     print(f"Running ripgrep with query: '{query}' and search_path: '{search_path}'")
     try:
-        result = subprocess.run(
-            ['rg', "-i", query, search_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
+        with phase("rg_subprocess"):
+            result = subprocess.run(
+                ['rg', "-i", query, search_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=True
+            )
         output = result.stdout
     except subprocess.CalledProcessError as e:
         output = e.stdout
@@ -50,6 +54,12 @@ def find_entity_by_id(entity_id: str, game_id: Optional[str] = None, entity_type
     output/GAME_ID/ENTITY_TYPE/NAME.DESCRIPTION.ENTITY_ID.json
     Returns a list of file paths that match the entity_id.
     """
+    index = get_active_index()
+    if index is not None and game_id and os.path.normpath(base_path) == index.root:
+        with phase("index_lookup"):
+            path = index.path_for(entity_id, game_id)
+        if path and (not entity_type or path.split(os.sep)[-2] == entity_type):
+            return [path]
     matches = []
     # Build the search directory
     search_dir = base_path
@@ -59,12 +69,42 @@ def find_entity_by_id(entity_id: str, game_id: Optional[str] = None, entity_type
         search_dir = os.path.join(search_dir, entity_type)
     if not os.path.isdir(search_dir):
         return []
-    for root, dirs, files in os.walk(search_dir):
-        for fname in files:
-            if fname.endswith(f".{entity_id}.json"):
-                matches.append(os.path.join(root, fname))
+    suffixes = tuple(f".{entity_id}{ext}" for ext in ENTITY_EXTENSIONS)
+    with phase("index_lookup"):
+        for root, dirs, files in os.walk(search_dir):
+            for fname in files:
+                if fname.endswith(suffixes):
+                    matches.append(os.path.join(root, fname))
     return matches
 
+def find_entities_by_ids(entity_ids: list, game_id: str, entity_type: Optional[str] = None, base_path: str = "output") -> dict:
+    """
+    Bulk form of find_entity_by_id: one index lookup per id when an index is active, otherwise
+    a single directory walk for all of them. Returns {entity_id: path} for the ids found.
+    """
+    found = {}
+    index = get_active_index()
+    if index is not None and os.path.normpath(base_path) == index.root:
+        with phase("index_lookup"):
+            for entity_id in entity_ids:
+                path = index.path_for(entity_id, game_id)
+                if path and (not entity_type or path.split(os.sep)[-2] == entity_type):
+                    found[entity_id] = path
+        if len(found) == len(set(entity_ids)):
+            return found
+    search_dir = os.path.join(base_path, game_id, entity_type or "")
+    if not os.path.isdir(search_dir):
+        return found
+    wanted = set(entity_ids) - set(found)
+    with phase("index_lookup"):
+        for root, dirs, files in os.walk(search_dir):
+            for fname in files:
+                stem, ext = os.path.splitext(fname)
+                entity_id = stem.rsplit(".", 1)[-1]
+                if ext in ENTITY_EXTENSIONS and entity_id in wanted:
+                    found.setdefault(entity_id, os.path.join(root, fname))
+    return found
+
 def find_entities_fn(search_query: str, game_id: str, entity_type: str = "", search_path: str = './output') -> List[Dict[str, str]]:
     """
     Runs ripgrep (rg) with the given query and returns a list of dicts with filename and matching line.
@@ -82,11 +122,19 @@ def find_entities_fn(search_query: str, game_id: str, entity_type: str = "", sea
         search_path = BASE_PATH + game_id + "/"
     
     found_entity_ids = []
-    matches = run_ripgrep(search_query, search_path)
+    # ripgrep reads the files, so deferred field updates must be in them
+    apply_pending(game_id)
+    index = get_active_index()
+    if index is not None and is_plain_query(search_query):
+        with phase("index_lookup"):
+            matches = [{"file": path} for path in index.search(search_query, game_id, entity_type)]
+    else:
+        matches = run_ripgrep(search_query, search_path)
     if matches:
         entities = []
         for match in matches:
-            entity = json.load(open(match['file']))
+            with phase("json_parse"):
+                entity = read_entity(match['file'])
             # if entity_type and entity["entity_type"] != entity_type:
             #     continue
             if entity["id"] in found_entity_ids:
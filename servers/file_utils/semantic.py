@@ -0,0 +1,326 @@
+"""Semantic search over a campaign's entities.
+
+Entity text is embedded with SEMANTIC_EMBEDDER:
+  - "hashing" (default): signed feature hashing of words and character trigrams; no model
+    download, deterministic, and good enough to match spelling variants and related words.
+  - "minilm": the all-MiniLM-L6-v2 ONNX model that ships with chromadb, run on the CPU.
+
+The index is opt-in per game: the first semantic search of a game embeds all of its entities,
+and from then on saving an entity of that game appends its vector. SEMANTIC_INDEX=on builds
+the index on the first save of every game instead, and SEMANTIC_INDEX=off never touches it
+on save (searches then see the game as of its last rebuild_semantic_index()).
+
+Vectors live in output/<game_id>/.semantic/ as an append-only float32 matrix (vectors.f32)
+plus a manifest of rows (rows.jsonl: row number, entity id, path). meta.json records the
+embedder and marks a complete build. The newest row of an id wins and
+rebuild_semantic_index() drops superseded rows.
+Queries go through random-hyperplane LSH tables built from the matrix when it is loaded,
+and readers in other processes pick up new rows by reading only what was appended.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from constants.paths import BASE_PATH
+from servers.file_utils.events import apply_pending
+from servers.file_utils.serialization import is_entity_file, read_entity
+from servers.utils.metrics import phase
+
+DIMENSIONS = 256
+LSH_TABLES = 8
+LSH_BITS = 10
+LSH_SEED = 1234
+# Text fields that never carry meaning worth embedding
+SKIPPED_FIELDS = ("id", "request_id", "game_id", "entity_type", "schema_version")
+WORD_PATTERN = re.compile(r"\w+")
+
+_embedders = {}
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def semantic_index_mode() -> str:
+    """"auto" (default: games with a built index), "on" (every game) or "off"."""
+    mode = os.getenv("SEMANTIC_INDEX", "auto").lower()
+    if mode in ("off", "0", "false"):
+        return "off"
+    return "on" if mode in ("on", "1", "true") else "auto"
+
+
+def entity_text(entity) -> str:
+    if isinstance(entity, dict):
+        return " ".join(entity_text(v) for k, v in entity.items() if k not in SKIPPED_FIELDS)
+    if isinstance(entity, list):
+        return " ".join(entity_text(v) for v in entity)
+    if isinstance(entity, str):
+        return entity
+    return ""
+
+
+class HashingEmbedder:
+    name = "hashing"
+
+    def __init__(self, dimensions: int = DIMENSIONS):
+        self.dimensions = dimensions
+
+    def features(self, text: str):
+        for word in WORD_PATTERN.findall(text.lower()):
+            yield word, 1.0
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                yield "#" + padded[i:i + 3], 0.5
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self.features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                sign = 1.0 if digest >> 63 else -1.0
+                vectors[row, digest % self.dimensions] += sign * weight
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+class MiniLMEmbedder:
+    name = "minilm"
+    dimensions = 384
+
+    def __init__(self):
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+        self.model = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.asarray(self.model(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+def get_embedder(name: str | None = None):
+    name = name or os.getenv("SEMANTIC_EMBEDDER", "hashing")
+    if name not in _embedders:
+        _embedders[name] = MiniLMEmbedder() if name == "minilm" else HashingEmbedder()
+    return _embedders[name]
+
+
+def get_semantic_dir(game_id: str) -> str:
+    return BASE_PATH + game_id + "/.semantic/"
+
+
+class SemanticIndex:
+    """One campaign's vectors, with LSH tables over them kept in memory."""
+
+    def __init__(self, game_id: str, embedder=None):
+        self.game_id = game_id
+        self.embedder = embedder or get_embedder()
+        self.directory = get_semantic_dir(game_id)
+        self.dimensions = self.embedder.dimensions
+        planes = np.random.default_rng(LSH_SEED).standard_normal((LSH_TABLES, self.dimensions, LSH_BITS))
+        self.planes = planes.astype(np.float32)
+        self.bit_weights = (1 << np.arange(LSH_BITS)).astype(np.int64)
+        self.reset()
+
+    def reset(self):
+        # Over-allocated so appending one row per save does not copy the whole matrix
+        self.buffer = np.zeros((1024, self.dimensions), dtype=np.float32)
+        self.rows: list[tuple[str, str]] = []
+        self.types: list[str] = []
+        self.latest: dict[str, int] = {}
+        self.tables = [dict() for _ in range(LSH_TABLES)]
+        self.manifest_offset = 0
+        self.manifest_inode = None
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self.buffer[: len(self.rows)]
+
+    @property
+    def manifest_path(self) -> str:
+        return self.directory + "rows.jsonl"
+
+    @property
+    def vectors_path(self) -> str:
+        return self.directory + "vectors.f32"
+
+    @property
+    def meta_path(self) -> str:
+        return self.directory + "meta.json"
+
+    def signatures(self, vectors: np.ndarray) -> np.ndarray:
+        # (tables, n) bucket keys: one bit per hyperplane side
+        bits = np.einsum("nd,tdb->tnb", vectors, self.planes) > 0
+        return bits.astype(np.int64) @ self.bit_weights
+
+    def read_meta(self) -> dict | None:
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, "r") as f:
+            meta = json.load(f)
+        if (meta.get("embedder"), meta.get("dimensions")) != (self.embedder.name, self.dimensions):
+            raise ValueError(f"Semantic index of {self.game_id} was built with a different embedder; rebuild it")
+        return meta
+
+    def initialized(self) -> bool:
+        """Whether every entity of the game has been embedded (by rebuild_semantic_index)."""
+        meta = self.read_meta()
+        return bool(meta and meta.get("initialized"))
+
+    def mark_initialized(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.meta_path, "w") as f:
+            json.dump({"embedder": self.embedder.name, "dimensions": self.dimensions, "initialized": True}, f)
+
+    def refresh(self):
+        """Load rows appended (by any process) since the last refresh."""
+        if not os.path.exists(self.manifest_path):
+            return
+        stat = os.stat(self.manifest_path)
+        if stat.st_size < self.manifest_offset or self.manifest_inode not in (None, stat.st_ino):
+            # Rebuilt by another process, or a different file now lives at the path
+            self.reset()
+        self.manifest_inode = stat.st_ino
+        with open(self.manifest_path, "r") as f:
+            f.seek(self.manifest_offset)
+            chunk = f.read()
+        complete = chunk[: chunk.rfind("\n") + 1]
+        if not complete:
+            return
+        new_rows = [json.loads(line) for line in complete.splitlines() if line.strip()]
+        self.manifest_offset += len(complete.encode("utf-8"))
+        start = len(self.rows)
+        end = start + len(new_rows)
+        row_bytes = self.dimensions * 4
+        with open(self.vectors_path, "rb") as f:
+            f.seek(start * row_bytes)
+            block = np.frombuffer(f.read((end - start) * row_bytes), dtype=np.float32).reshape(-1, self.dimensions)
+        if end > len(self.buffer):
+            grown = np.zeros((max(end, 2 * len(self.buffer)), self.dimensions), dtype=np.float32)
+            grown[:start] = self.buffer[:start]
+            self.buffer = grown
+        self.buffer[start:end] = block
+        for offset, record in enumerate(new_rows):
+            self.rows.append((record["id"], record["path"]))
+            self.types.append(os.path.normpath(record["path"]).split(os.sep)[-2])
+            self.latest[record["id"]] = start + offset
+        keys = self.signatures(block)
+        for table, table_keys in zip(self.tables, keys):
+            for offset, key in enumerate(table_keys.tolist()):
+                table.setdefault(key, []).append(start + offset)
+
+    def add(self, entities: list[tuple[dict, str]]):
+        """Embed and append (entity, path) pairs."""
+        if not entities:
+            return
+        self.read_meta()
+        os.makedirs(self.directory, exist_ok=True)
+        vectors = self.embedder.embed([entity_text(entity) for entity, _ in entities])
+        with open(self.manifest_path, "a") as manifest:
+            fcntl.flock(manifest, fcntl.LOCK_EX)
+            try:
+                with open(self.vectors_path, "ab") as f:
+                    first_row = f.tell() // (self.dimensions * 4)
+                    f.write(vectors.astype(np.float32).tobytes())
+                lines = [
+                    json.dumps({"row": first_row + i, "id": entity["id"], "path": path}) + "\n"
+                    for i, (entity, path) in enumerate(entities)
+                ]
+                manifest.write("".join(lines))
+            finally:
+                fcntl.flock(manifest, fcntl.LOCK_UN)
+        self.refresh()
+
+    def search(self, query: str, limit: int = 10, entity_type: str = "") -> list[dict]:
+        self.refresh()
+        if not self.rows:
+            return []
+        query_vector = self.embedder.embed([query])
+        with phase("index_lookup"):
+            candidates = set()
+            for table, key in zip(self.tables, self.signatures(query_vector)[:, 0].tolist()):
+                candidates.update(table.get(key, ()))
+            # Filtered before ranking, so a type with few bucket hits still gets `limit` results
+            candidates = [row for row in candidates if self.live(row, entity_type)]
+            if len(candidates) < limit:
+                # Sparse buckets: a brute-force pass over the live rows is still cheap
+                candidates = [row for row in self.latest.values() if self.live(row, entity_type)]
+            if not candidates:
+                return []
+            candidates = np.asarray(candidates, dtype=np.int64)
+            scores = self.vectors[candidates] @ query_vector[0]
+            order = np.argsort(-scores)
+        results = []
+        for position in order[:limit]:
+            entity_id, path = self.rows[candidates[position]]
+            results.append({"id": entity_id, "path": path, "score": round(float(scores[position]), 4)})
+        return results
+
+    def live(self, row: int, entity_type: str = "") -> bool:
+        """Whether row is the newest row of its entity (and of entity_type, when given)."""
+        return self.latest.get(self.rows[row][0]) == row and (not entity_type or self.types[row] == entity_type)
+
+
+def get_semantic_index(game_id: str) -> SemanticIndex:
+    with _indexes_lock:
+        if game_id not in _indexes:
+            _indexes[game_id] = SemanticIndex(game_id)
+        return _indexes[game_id]
+
+
+def index_entity(game_entity: dict, path: str):
+    """Save hook: append the entity's vector to its game's index, when the game has one (see SEMANTIC_INDEX)."""
+    mode = semantic_index_mode()
+    game_id = game_entity["game_id"]
+    if mode == "off" or (mode == "auto" and not os.path.exists(get_semantic_dir(game_id) + "meta.json")):
+        return
+    index = get_semantic_index(game_id)
+    if index.initialized():
+        index.add([(game_entity, path)])
+    else:
+        # The entity is already on disk, so the full build includes it
+        rebuild_semantic_index(game_id)
+
+
+def rebuild_semantic_index(game_id: str) -> int:
+    """Embed every entity of the game from scratch; returns the number of entities indexed."""
+    directory = get_semantic_dir(game_id)
+    for fname in ("rows.jsonl", "vectors.f32", "meta.json"):
+        if os.path.exists(directory + fname):
+            os.remove(directory + fname)
+    index = get_semantic_index(game_id)
+    index.reset()
+    game_directory = os.path.normpath(BASE_PATH + game_id)
+    entities = []
+    for root, dirs, files in os.walk(game_directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        if os.path.normpath(root) == game_directory:
+            continue
+        for fname in files:
+            if is_entity_file(fname):
+                path = os.path.join(root, fname)
+                entities.append((read_entity(path), path))
+    index.add(entities)
+    # Only a complete build is marked, so saves never extend a partial index
+    index.mark_initialized()
+    return len(entities)
+
+
+def semantic_find_entities_fn(search_query: str, game_id: str, entity_type: str = "", limit: int = 10) -> list[dict]:
+    """Entities ranked by similarity to search_query, each with a "score" between -1 and 1."""
+    # Applying re-embeds the entities whose deferred updates it writes
+    apply_pending(game_id)
+    index = get_semantic_index(game_id)
+    if not index.initialized():
+        rebuild_semantic_index(game_id)
+    entities = []
+    for match in index.search(search_query, limit, entity_type):
+        try:
+            with phase("json_parse"):
+                entity = read_entity(match["path"])
+        except FileNotFoundError:
+            continue
+        entities.append({**entity, "score": match["score"]})
+    return entities
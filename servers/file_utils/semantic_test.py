@@ -0,0 +1,48 @@
+from servers.file_utils import semantic
+from servers.file_utils.json import save_game_entity_fn, update_entity_field_fn
+from servers.file_utils.serialization import write_entity
+
+
+def test_semantic_find_entities_ranks_by_meaning_and_follows_saves(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(semantic, "_indexes", {})
+    save_game_entity_fn({"id": "1", "entity_type": "environment", "name": "Belrak Den", "game_id": "g1",
+                         "summary": "Lair of the belraks in the hills of Ontabia"})
+    save_game_entity_fn({"id": "2", "entity_type": "environment", "name": "Old Mill", "game_id": "g1",
+                         "summary": "A creaking watermill by the river"})
+    results = semantic.semantic_find_entities_fn("the belrak from Ontabia", "g1")
+    assert [r["id"] for r in results] == ["1", "2"]
+    assert results[0]["score"] > results[1]["score"]
+    update_entity_field_fn("2", "summary", "Belraks from Ontabia have nested in the mill")
+    assert semantic.semantic_find_entities_fn("belraks nesting in a mill", "g1")[0]["id"] == "2"
+    # A reader in another process sees the same rows, and rebuilding drops superseded ones
+    assert len(semantic.SemanticIndex("g1").search("mill", limit=10)) == 2
+    assert semantic.rebuild_semantic_index("g1") == 2
+
+
+def test_semantic_index_covers_entities_saved_before_it_existed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(semantic, "_indexes", {})
+    directory = tmp_path / "output" / "g1" / "environment"
+    directory.mkdir(parents=True)
+    # An existing campaign: entities on disk, no index yet
+    write_entity(str(directory / "Unka.1.json"), {"id": "1", "entity_type": "environment", "name": "Village of Unka",
+                                                  "game_id": "g1", "summary": "A fishing village"})
+    for mode in ("auto", "on"):
+        monkeypatch.setenv("SEMANTIC_INDEX", mode)
+        save_game_entity_fn({"id": f"new-{mode}", "entity_type": "environment", "name": "New Place", "game_id": "g1"})
+        assert semantic.semantic_find_entities_fn("village of unka", "g1", limit=1)[0]["id"] == "1"
+    assert {r["id"] for r in semantic.semantic_find_entities_fn("place", "g1")} == {"1", "new-auto", "new-on"}
+
+
+def test_semantic_search_filters_entity_type_before_ranking(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(semantic, "_indexes", {})
+    for i in range(40):
+        save_game_entity_fn({"id": f"e{i}", "entity_type": "environment", "name": f"Mill {i}", "game_id": "g1",
+                             "summary": "An old mill by the river"})
+    for i in range(3):
+        save_game_entity_fn({"id": f"c{i}", "entity_type": "character", "name": f"Miller {i}", "description": "x",
+                             "game_id": "g1"})
+    results = semantic.semantic_find_entities_fn("an old mill by the river", "g1", "character", limit=3)
+    assert sorted(r["id"] for r in results) == ["c0", "c1", "c2"]
@@ -0,0 +1,110 @@
+"""Entity (de)serialization shared by every read and write of entity files.
+
+ENTITY_FORMAT selects how entities are written:
+    json     compact stdlib JSON (default)
+    orjson   compact JSON via orjson when installed, else stdlib
+    msgpack  binary MessagePack, stored with a .msgpack extension
+
+Reads autodetect the format from the content, so campaigns may mix formats.
+MessagePack files are not text searchable, so find_entities (ripgrep) skips them;
+use msgpack for archival or id-addressed access only.
+"""
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:  # optional acceleration
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional binary format
+    msgpack = None
+
+FORMATS = ("json", "orjson", "msgpack")
+ENTITY_EXTENSIONS = (".json", ".msgpack")
+
+
+def get_entity_format() -> str:
+    fmt = os.getenv("ENTITY_FORMAT", "json")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown ENTITY_FORMAT '{fmt}'; use one of {FORMATS}")
+    return fmt
+
+
+def extension_for(fmt: str) -> str:
+    return ".msgpack" if fmt == "msgpack" else ".json"
+
+
+def format_for_path(path: str) -> str:
+    """The format to use when rewriting an existing file, based on its extension."""
+    if path.endswith(".msgpack"):
+        return "msgpack"
+    fmt = get_entity_format()
+    return "json" if fmt == "msgpack" else fmt
+
+
+def dumps_entity(entity: dict, fmt: str | None = None) -> bytes:
+    fmt = fmt or get_entity_format()
+    if fmt == "msgpack":
+        if msgpack is None:
+            raise ImportError("ENTITY_FORMAT=msgpack requires the 'msgpack' package")
+        return msgpack.packb(entity, use_bin_type=True)
+    if fmt == "orjson" and orjson is not None:
+        return orjson.dumps(entity)
+    return json.dumps(entity, separators=(",", ":")).encode("utf-8")
+
+
+def loads_entity(data: bytes | memoryview) -> dict:
+    """
+    Decode an entity, detecting JSON (any indentation) vs. MessagePack from the first byte.
+    A memoryview (e.g. an mmap slice) is decoded without copying when orjson or msgpack is used.
+    """
+    if isinstance(data, memoryview):
+        if data[:1].tobytes() in (b"{", b"[") and orjson is not None:
+            return orjson.loads(data)
+        if msgpack is not None and data[:1].tobytes() not in (b"{", b"["):
+            return msgpack.unpackb(data, raw=False)
+        data = data.tobytes()
+    stripped = data.lstrip()
+    if stripped[:1] in (b"{", b"["):
+        if orjson is not None:
+            return orjson.loads(stripped)
+        return json.loads(stripped)
+    if msgpack is None:
+        raise ImportError("Reading a MessagePack entity requires the 'msgpack' package")
+    return msgpack.unpackb(data, raw=False)
+
+
+def read_entity(path: str) -> dict:
+    with open(path, "rb") as f:
+        return loads_entity(f.read())
+
+
+def write_entity(path: str, entity: dict, fmt: str | None = None):
+    """Write atomically: readers see the old file or the new one, never a partial write."""
+    data = dumps_entity(entity, fmt or format_for_path(path))
+    directory, filename = os.path.split(path)
+    # Unique per writer (threads of one process included), and dot-prefixed so the index
+    # watcher and searches ignore it until the rename
+    temporary = os.path.join(directory, f".{filename}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def is_entity_file(filename: str) -> bool:
+    return filename.endswith(ENTITY_EXTENSIONS)
+
+
+def strip_entity_extension(filename: str) -> str:
+    for extension in ENTITY_EXTENSIONS:
+        if filename.endswith(extension):
+            return filename[: -len(extension)]
+    return filename
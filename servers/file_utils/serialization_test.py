@@ -0,0 +1,45 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from servers.file_utils.json import read_game_entity_fn, save_game_entity_fn
+from servers.file_utils.serialization import dumps_entity, loads_entity, msgpack, read_entity, write_entity
+
+
+def test_entity_serialization_autodetects_format():
+    entity = {"id": "abc", "name": "Gobélin", "level": 3, "tags": ["a", "b"]}
+    assert dumps_entity(entity, "json") == b'{"id":"abc","name":"Gob\\u00e9lin","level":3,"tags":["a","b"]}'
+    assert loads_entity(dumps_entity(entity, "json")) == entity
+    assert loads_entity(json.dumps(entity, indent="\t").encode()) == entity
+    if msgpack is not None:
+        assert loads_entity(dumps_entity(entity, "msgpack")) == entity
+
+
+def test_save_switches_format_without_leaving_duplicates(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    monkeypatch.chdir(tmp_path)
+    entity = {"id": "1234", "entity_type": "environment", "name": "Old Mill", "game_id": "g1"}
+    assert save_game_entity_fn(entity) == "Old_Mill.1234.json"
+    monkeypatch.setenv("ENTITY_FORMAT", "msgpack")
+    assert save_game_entity_fn(entity) == "Old_Mill.1234.msgpack"
+    assert os.listdir(tmp_path / "output" / "g1" / "environment") == ["Old_Mill.1234.msgpack"]
+    assert read_game_entity_fn("1234")["entity"] == entity
+
+
+def test_write_entity_from_many_threads_leaves_one_complete_file(tmp_path):
+    path = str(tmp_path / "Old_Mill.1234.json")
+    entities = [{"id": "1234", "name": "Old Mill", "notes": [i] * 1000} for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda entity: write_entity(path, entity), entities))
+    assert read_entity(path) in entities
+    assert os.listdir(tmp_path) == ["Old_Mill.1234.json"]
+
+
+def test_write_entity_removes_its_temporary_file_on_failure(tmp_path):
+    # The rename fails: a directory is in the way
+    (tmp_path / "Taken.1.json").mkdir()
+    with pytest.raises(OSError):
+        write_entity(str(tmp_path / "Taken.1.json"), {"id": "1"})
+    assert os.listdir(tmp_path) == ["Taken.1.json"]
@@ -0,0 +1,105 @@
+"""Keep an EntityIndex current while other processes write to output/.
+
+Uses inotify (through the optional inotify_simple package) to apply create, modify, delete
+and rename events as they happen, and falls back to re-statting the tree every
+INDEX_POLL_INTERVAL seconds when inotify is unavailable. Either way only changed files are
+re-read; the full scan happens once, at start.
+"""
+import os
+import threading
+
+from servers.file_utils.index import EntityIndex, set_active_index
+from servers.utils.logging import log
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # pragma: no cover - optional dependency
+    INotify = None
+
+POLL_INTERVAL = float(os.getenv("INDEX_POLL_INTERVAL", "1.0"))
+
+
+class IndexWatcher:
+    def __init__(self, index: EntityIndex, backend: str | None = None, poll_interval: float = POLL_INTERVAL):
+        self.index = index
+        self.backend = backend or ("inotify" if INotify is not None else "poll")
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+        self.thread = None
+        self.inotify = None
+        self.directories: dict[int, str] = {}
+
+    def start(self) -> "IndexWatcher":
+        os.makedirs(self.index.root, exist_ok=True)
+        if self.backend == "inotify":
+            self.inotify = INotify()
+            # Watch first, then scan, so nothing written in between is lost
+            self.add_tree(self.index.root)
+        self.index.scan()
+        target = self.run_inotify if self.backend == "inotify" else self.run_poll
+        self.thread = threading.Thread(target=target, name="index-watcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=max(self.poll_interval, 1.0) * 2)
+        if self.inotify is not None:
+            self.inotify.close()
+
+    def run_poll(self):
+        while not self.stopped.wait(self.poll_interval):
+            try:
+                self.index.scan()
+            except Exception as e:
+                log({"error": str(e)}, "index_watcher", "error")
+
+    def add_tree(self, directory: str):
+        mask = (flags.CREATE | flags.CLOSE_WRITE | flags.DELETE | flags.MOVED_FROM
+                | flags.MOVED_TO | flags.DELETE_SELF)
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            try:
+                self.directories[self.inotify.add_watch(root, mask)] = root
+            except OSError:
+                continue
+
+    def run_inotify(self):
+        while not self.stopped.is_set():
+            try:
+                events = self.inotify.read(timeout=int(self.poll_interval * 1000))
+            except (OSError, ValueError):
+                return
+            for event in events:
+                directory = self.directories.get(event.wd)
+                if directory is None:
+                    continue
+                self.handle(directory, event)
+
+    def handle(self, directory: str, event):
+        path = os.path.join(directory, event.name)
+        if event.mask & flags.DELETE_SELF:
+            self.directories.pop(event.wd, None)
+            return
+        if event.name.startswith("."):
+            return
+        if event.mask & flags.ISDIR:
+            if event.mask & (flags.CREATE | flags.MOVED_TO):
+                self.add_tree(path)
+                # Files may have landed before the new watch was in place
+                self.index.scan(path)
+            elif event.mask & (flags.DELETE | flags.MOVED_FROM):
+                self.index.remove_tree(path)
+        elif event.mask & (flags.DELETE | flags.MOVED_FROM):
+            self.index.remove_file(path)
+        elif event.mask & (flags.CLOSE_WRITE | flags.MOVED_TO):
+            self.index.upsert_file(path)
+
+
+def start_index_watcher(root: str = "output", backend: str | None = None) -> IndexWatcher:
+    """Build the index for root, make it the process-wide active index and keep it current."""
+    index = EntityIndex(root)
+    watcher = IndexWatcher(index, backend=backend).start()
+    set_active_index(index)
+    return watcher
@@ -0,0 +1,61 @@
+import os
+import time
+
+import pytest
+
+from servers.file_utils import watcher as watcher_module
+from servers.file_utils.index import EntityIndex
+from servers.file_utils.serialization import write_entity
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+
+
+@pytest.mark.parametrize("backend", ["poll", "inotify"])
+def test_index_watcher_follows_external_writes(tmp_path, monkeypatch, backend):
+    if backend == "inotify" and watcher_module.INotify is None:
+        pytest.skip("inotify_simple not installed")
+    monkeypatch.chdir(tmp_path)
+    directory = tmp_path / "output" / "g1" / "character"
+    directory.mkdir(parents=True)
+    write_entity(str(directory / "Ann.1.json"), {"id": "1", "name": "Ann the Quillfeather"})
+    index = EntityIndex("output")
+    watcher = watcher_module.IndexWatcher(index, backend=backend, poll_interval=0.05).start()
+    try:
+        assert index.search("quill", "g1") == ["output/g1/character/Ann.1.json"]
+        # Simulate another process: no generation bump, only the watcher can notice
+        write_entity(str(directory / "Bob.2.json"), {"id": "2", "name": "Bob Quillfeather"})
+        os.rename(directory / "Ann.1.json", directory / "Anna.1.json")
+        expected = {"1": "output/g1/character/Anna.1.json", "2": "output/g1/character/Bob.2.json"}
+        wait_until(lambda: index.paths == expected)
+        assert index.paths == expected
+        os.remove(directory / "Bob.2.json")
+        wait_until(lambda: "2" not in index.paths)
+        assert index.search("quillfeather", "g1", "character") == ["output/g1/character/Anna.1.json"]
+    finally:
+        watcher.stop()
+
+
+def test_poll_watcher_logs_scan_errors_and_keeps_running(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    index = EntityIndex("output")
+    logged, scans = [], []
+
+    def failing_scan(directory=None):
+        scans.append(directory)
+        if len(scans) > 1:
+            raise OSError("disk gone")
+        return 0
+
+    monkeypatch.setattr(index, "scan", failing_scan)
+    monkeypatch.setattr(watcher_module, "log", lambda data, tool_name, label: logged.append((data, tool_name, label)))
+    watcher = watcher_module.IndexWatcher(index, backend="poll", poll_interval=0.02).start()
+    try:
+        wait_until(lambda: len(logged) >= 2)
+    finally:
+        watcher.stop()
+    assert logged[0] == ({"error": "disk gone"}, "index_watcher", "error")
+    assert not watcher.thread.is_alive()
@@ -3,24 +3,33 @@
 This server provides character and environment creation operations as tools that can be discovered and used by MCP clients.
 """
 
+import os
 from mcp.server.fastmcp import FastMCP
 from typing import Optional
 from servers.character_creator.character import build_random_character, log
 from servers.environments.environments import Environment
 from servers.file_utils.ripgrep import find_entity_by_id
-import json
+from servers.file_utils.json import save_game_entity_fn, update_entity_field_fn
 from typing import Dict, List
 from servers.utils.logging import log
+from servers.file_utils.watcher import start_index_watcher
+from servers.utils.metrics import instrument_tool, register_metrics_tool
 
 mcp = FastMCP("Character")
 
+def persist_entity(game_entity: dict) -> dict:
+    """Save a freshly created entity in this process and return where it went."""
+    return {"id": game_entity["id"], "filename": save_game_entity_fn(game_entity)}
+
 @mcp.tool()
+@instrument_tool
 def make_character(
     request_id: str,
     game_id: str,
     description: str,
     name: Optional[str] = None,
     level: Optional[int] = None,
+    persist: bool = False,
     # cr: Optional[int] = None,
     # strength: Optional[int] = None,
     # dexterity: Optional[int] = None,
@@ -39,6 +48,7 @@ def make_character(
         description (str): A description of the creature.
         name (Optional[str]): The name of the creature. If None, will be generated from the description.
         level (Optional[int]): The level of the creature. If None, will be determined from the description.
+        persist (bool): Save the character as well. Returns {"id", "filename"} instead of the character.
     """
     #  cr (Optional[int]): The challenge rating of the creature. If None, will be determined from the description.
     # strength (Optional[int]): The strength of the creature. If None, will be determined from the description.
@@ -51,13 +61,14 @@ def make_character(
     # current_goal (Optional[str]): The current goal of the creature. If None, will be determined from the description.
     log({"name": name}, "Tool Calledmake_character - name")
     character = build_random_character(name=name, description=description, request_id=request_id, game_id=game_id)
-    if level and level > 0:
-        for _ in range(level):
-            character.level_up()
-    
+    if level and level > 1:
+        character.advance_to(min(level, 20))
+    if persist:
+        return persist_entity(character.as_dict())
     return character.as_dict()
 
 @mcp.tool()
+@instrument_tool
 def set_personality_profile(
     request_id: str,
     game_id: str,
@@ -76,14 +87,11 @@ def set_personality_profile(
     """
     matches = find_entity_by_id(character_id, game_id, "character")
     if matches:
-        character = json.load(open(matches[0]))
-        character["personality_profile"] = personality_profile
-        with open(matches[0], "w") as f:
-            json.dump(character, f)
-        return character
+        return update_entity_field_fn(character_id, "personality_profile", personality_profile, request_id)
     return "ERROR: No game entity found with that id."
 
 @mcp.tool()
+@instrument_tool
 def create_environment(
     request_id: str,
     game_id: str,
@@ -100,6 +108,7 @@ def create_environment(
     closed_spec: Optional[Dict[str, str]] = None,
     open_spec: Optional[Dict[str, str]] = None,
     description: Optional[str] = None,
+    persist: bool = False,
 ) -> dict:
     """
     Factory endpoint for agents to spawn a new **Environment** object.
@@ -128,11 +137,14 @@ def create_environment(
         Tactical add-ons — only include the one that matches *kind*.
     description : str, optional
         Free-form GM notes.
+    persist : bool, optional
+        Save the environment as well, so no separate save_game_entity call is needed.
 
     Returns
     -------
     dict
-        JSON-serialisable representation of the new environment (same as ``Environment.as_dict()``).
+        JSON-serialisable representation of the new environment (same as ``Environment.as_dict()``),
+        or ``{"id", "filename"}`` of the saved file when *persist* is set.
 
     Examples
     --------
@@ -190,8 +202,14 @@ def create_environment(
         description=description,
     )
 
+    if persist:
+        return persist_entity(environment.as_dict())
     return environment.as_dict()
 
 
+register_metrics_tool(mcp)
+
 if __name__ == "__main__":
+    if os.getenv("INDEX_WATCH", "on").lower() not in ("off", "0", "false"):
+        start_index_watcher()
     mcp.run(transport="stdio")
\ No newline at end of file
@@ -7,12 +7,41 @@ from mcp.server.fastmcp import FastMCP
 from servers.file_utils.filename import make_filename
 from servers.file_utils.ripgrep import find_entities_fn
 from servers.file_utils.json import save_game_entity_fn
+from servers.file_utils.events import fold_pending
+from servers.file_utils.memo import memoize_read, normalize_search_arguments
+from servers.file_utils.query import QuerySyntaxError, query_entities_fn
+from servers.file_utils.references import find_dangling_references_fn, get_references_fn
 from servers.utils.logging import log
+from servers.file_utils.watcher import start_index_watcher
+from servers.utils.metrics import instrument_tool, phase, register_metrics_tool
+from servers.utils.context import ENTITY_TOKEN_BUDGET, MIN_ENTITY_TOKENS, pack_entity
+from servers.file_utils.serialization import is_entity_file, read_entity
 from constants.paths import BASE_PATH
+import os
 
 mcp = FastMCP("JSON File")
 
+# Read-only lookups are memoized per game storage generation; saves/updates bump it.
+cached_find_entities_fn = memoize_read(normalize=normalize_search_arguments)(find_entities_fn)
+
+@memoize_read()
+def load_game_entity_containing_id(game_id: str, game_entity_id: str) -> dict:
+    # Walk through the game's directory and look for files containing game_entity_id
+    with phase("index_lookup"):
+        file_path = next(
+            (os.path.join(root, file)
+             for root, dirs, files in os.walk(BASE_PATH + game_id)
+             for file in files
+             if game_entity_id in file and is_entity_file(file)),
+            None,
+        )
+    if file_path:
+        with phase("json_parse"):
+            return fold_pending(game_id, read_entity(file_path))
+    raise FileNotFoundError(f"No game entity file found containing id: {game_entity_id}")
+
 @mcp.tool()
+@instrument_tool
 def save_game_entity(game_entity: dict) -> str:
     """Save a game entity as a JSON file.
     
@@ -27,6 +56,7 @@ def save_game_entity(game_entity: dict) -> str:
     return result
 
 @mcp.tool()
+@instrument_tool
 def get_game_entity_by_id(request_id: str, game_id: str, game_entity_id: str) -> dict:
     """Get a game entity given a known game_entity_id.
     
@@ -37,20 +67,11 @@ def get_game_entity_by_id(request_id: str, game_id: str, game_entity_id: str) ->
     Returns:
         dict: The loaded game entity, or raises FileNotFoundError if not found.
     """
-    import os
-    import json
-
-    # Walk through BASE_PATH and look for files containing game_entity_id
-    for root, dirs, files in os.walk(BASE_PATH):
-        for file in files:
-            if game_entity_id in file and file.endswith('.json'):
-                file_path = os.path.join(root, file)
-                with open(file_path, 'r') as f:
-                    return json.load(f)
-    raise FileNotFoundError(f"No game entity file found containing id: {game_entity_id}")
+    return load_game_entity_containing_id(game_id, game_entity_id)
 
 @mcp.tool()
-def find_entities(request_id: str, game_id: str, search_query: str, entity_type: str = "") -> list:
+@instrument_tool
+def find_entities(request_id: str, game_id: str, search_query: str, entity_type: str = "", max_tokens_per_entity: int = ENTITY_TOKEN_BUDGET) -> list:
     """Find entities that match the given search query and (optionally) entity_type.
     
     Args:
@@ -58,13 +79,16 @@ def find_entities(request_id: str, game_id: str, search_query: str, entity_type:
         game_id (str): The ID of the game.
         search_query (str): The search query to use.
         entity_type (str, optional): The type of the entity to find (character or environment). Generally, this should be left empty in order to keep the story's cannon consistent. Defaults to "" (matches any type).
+        max_tokens_per_entity (int, optional): Each entity is trimmed to its most important fields within this many tokens; fields left out are listed under "_omitted" (use get_game_entity_by_id for the full entity). id and name are always kept, and budgets below 40 are raised to 40. 0 returns full entities. Defaults to 300.
     Returns:
         list: A list of entities that match the given search query and entity_type.
     """
     RETURN_SUMMARY = False
     log({"entity_type": entity_type, "search_query": search_query, "game_id": game_id, "request_id": request_id}, "find_entities", "mcp_tool_input")
-    result = find_entities_fn(search_query, game_id, entity_type)
-    summary_result = [{"id": x["id"], "name": x["name"], "description": x["description"]} for x in result]
+    result = cached_find_entities_fn(search_query, game_id, entity_type)
+    summary_result = [{"id": x.get("id"), "name": x.get("name"), "description": x.get("description")} for x in result]
+    if max_tokens_per_entity:
+        result = [pack_entity(entity, max(max_tokens_per_entity, MIN_ENTITY_TOKENS)) for entity in result]
     # we learned that if you return a list, only the first element in the list gets to the agent
     # the solution is to wrap a list in a dictionary
     if RETURN_SUMMARY:
@@ -76,6 +100,97 @@ def find_entities(request_id: str, game_id: str, search_query: str, entity_type:
     log({"full_result": result_obj}, "find_entities", "mcp_tool_output")
     return result_obj
 
+@mcp.tool()
+@instrument_tool
+def query_entities(request_id: str, game_id: str, query: str, limit: int = 50, max_tokens_per_entity: int = ENTITY_TOKEN_BUDGET) -> dict:
+    """Find entities by their fields instead of pulling everything and filtering it yourself.
+    
+    Query syntax: field comparisons <field><op><value> with = != > >= < <= and ~ (contains, case-insensitive),
+    combined with AND, OR, NOT and parentheses; terms are ANDed when no operator is given. Nested fields use dots
+    (ability_scores.DEX) and list fields match if any element matches. A bare word searches every field.
+    Examples:
+        entity_type=character AND class=Rogue AND level>=5
+        entity_type=environment kind~closed threats~trap
+        (race=Elf OR race="Half-Elf") NOT background=Sailor
+    
+    Args:
+        request_id (str): The ID of the request.
+        game_id (str): The ID of the game.
+        query (str): The query, as described above.
+        limit (int, optional): Maximum number of entities to return. Defaults to 50.
+        max_tokens_per_entity (int, optional): Each entity is trimmed to its most important fields within this many tokens (see find_entities). 0 returns full entities. Defaults to 300.
+    Returns:
+        dict: "result" holds the matching entities, or "error" describes a malformed query.
+    """
+    log({"query": query, "game_id": game_id, "request_id": request_id}, "query_entities", "mcp_tool_input")
+    try:
+        result = query_entities_fn(query, game_id, limit)
+        if max_tokens_per_entity:
+            result = [pack_entity(entity, max(max_tokens_per_entity, MIN_ENTITY_TOKENS)) for entity in result]
+        result_obj = {"result": result}
+    except QuerySyntaxError as e:
+        result_obj = {"error": f"Invalid query: {e}"}
+    log({"full_result": result_obj}, "query_entities", "mcp_tool_output")
+    return result_obj
+
+@mcp.tool()
+@instrument_tool
+def semantic_find_entities(request_id: str, game_id: str, search_query: str, entity_type: str = "", limit: int = 10, max_tokens_per_entity: int = ENTITY_TOKEN_BUDGET) -> dict:
+    """Find entities whose content is most similar in meaning to the search query. Unlike find_entities, the query can be a whole phrase or description (e.g. "the belrak from Ontabia"), so it does not need to be split into separate searches.
+    
+    Args:
+        request_id (str): The ID of the request.
+        game_id (str): The ID of the game.
+        search_query (str): Free-text description of what to look for.
+        entity_type (str, optional): The type of the entity to find (character or environment). Defaults to "" (matches any type).
+        limit (int, optional): Maximum number of entities to return. Defaults to 10.
+        max_tokens_per_entity (int, optional): Each entity is trimmed to its most important fields within this many tokens (see find_entities). 0 returns full entities. Defaults to 300.
+    Returns:
+        dict: "result" holds the best matching entities, most similar first, each with a "score".
+    """
+    log({"entity_type": entity_type, "search_query": search_query, "game_id": game_id, "request_id": request_id}, "semantic_find_entities", "mcp_tool_input")
+    # Loaded on first use: the embedders need numpy, which the other tools do not
+    from servers.file_utils.semantic import semantic_find_entities_fn
+    result = semantic_find_entities_fn(search_query, game_id, entity_type, limit)
+    if max_tokens_per_entity:
+        budget = max(max_tokens_per_entity, MIN_ENTITY_TOKENS)
+        result = [{**pack_entity({k: v for k, v in entity.items() if k != "score"}, budget), "score": entity["score"]}
+                  for entity in result]
+    result_obj = {"result": result}
+    log({"full_result": result_obj}, "semantic_find_entities", "mcp_tool_output")
+    return result_obj
+
+@mcp.tool()
+@instrument_tool
+def get_references(request_id: str, game_id: str, game_entity_id: str) -> dict:
+    """Find which entities reference a game entity (e.g. environments listing a character among their creatures) and which entities it references.
+    
+    Args:
+        request_id (str): The ID of the request.
+        game_id (str): The ID of the game.
+        game_entity_id (str): The ID of the game entity.
+    Returns:
+        dict: "referenced_by" and "references", each a list of {"id", "field"} entries.
+    """
+    return get_references_fn(game_id, game_entity_id)
+
+@mcp.tool()
+@instrument_tool
+def find_dangling_references(request_id: str, game_id: str) -> dict:
+    """List every reference in the game that points to an entity id which does not exist.
+    
+    Args:
+        request_id (str): The ID of the request.
+        game_id (str): The ID of the game.
+    Returns:
+        dict: "result" holds a list of {"id", "field", "missing_id"} entries.
+    """
+    return {"result": find_dangling_references_fn(game_id)}
+
+register_metrics_tool(mcp)
+
 if __name__ == "__main__":
+    if os.getenv("INDEX_WATCH", "on").lower() not in ("off", "0", "false"):
+        start_index_watcher()
     mcp.run(transport="stdio")
 
@@ -0,0 +1,11 @@
+from servers.file_utils.json import save_game_entity_fn
+from servers.json_file_tool import find_entities
+
+
+def test_find_entities_small_budget_keeps_id_and_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_game_entity_fn({"id": "c1", "entity_type": "character", "name": "Ann", "game_id": "g1",
+                         "description": "A bold sailor from the eastern isles " * 10, "class": "Rogue"})
+    result = find_entities("r1", "g1", "sailor", max_tokens_per_entity=30)["result"]
+    assert [(entity["id"], entity["name"]) for entity in result] == [("c1", "Ann")]
+    assert len(result[0].get("description", "")) < 100
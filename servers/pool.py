@@ -0,0 +1,241 @@
+"""Warm pool of pre-imported MCP servers, handed out as ready stdio pipes.
+
+Starting a server with `python -m servers.json_file_tool` pays for a fresh interpreter plus
+its imports (mostly the mcp package) on every MCPServerAdapter spawn. The pool pays that
+once: `serve` imports the server modules and waits on a unix socket. `connect` is a tiny
+stdlib-only client that passes its own stdin/stdout/stderr to the pool with SCM_RIGHTS.
+The pool forks a worker from its warm state (fork-server style), points the worker's
+stdio at those fds and runs the module as __main__. The MCP client then talks to the
+worker as if it had spawned it itself. The connect process stays until the worker exits,
+returns its exit code and passes termination on to it, so adapters still own the lifecycle.
+
+    python -m servers.pool serve --socket /tmp/mcp-pool.sock
+    python -m servers.pool connect servers.json_file_tool --socket /tmp/mcp-pool.sock
+
+crews/servers.py uses `connect` when MCP_POOL_SOCKET names a running pool. Workers get
+the client's environment and working directory. Constants read from the environment
+at import time keep the values they had when the pool started.
+"""
+import argparse
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+
+DEFAULT_MODULES = ("servers.json_file_tool", "servers.game_entity_maker", "servers.combat_server")
+MAX_MESSAGE = 1 << 20
+
+
+def send_message(connection: socket.socket, message: dict, fds: list[int] | None = None):
+    data = (json.dumps(message) + "\n").encode()
+    if fds:
+        socket.send_fds(connection, [data], fds)
+    else:
+        connection.sendall(data)
+
+
+def run_worker(module: str, fds: list[int], environment: dict, cwd: str) -> int:
+    """In the forked child: take over the client's stdio and run the server module."""
+    import runpy
+    import traceback
+
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    # Fresh stream objects: the pool's were set up for whatever its own stdio was
+    sys.stdin = sys.__stdin__ = open(0, "r", closefd=False)
+    sys.stdout = sys.__stdout__ = open(1, "w", closefd=False)
+    sys.stderr = sys.__stderr__ = open(2, "w", buffering=1, closefd=False)
+    os.environ.clear()
+    os.environ.update(environment)
+    os.chdir(cwd)
+    sys.argv = [module]
+    # Its dependencies stay warm; only the module body runs again, as __main__
+    sys.modules.pop(module, None)
+    try:
+        runpy.run_module(module, run_name="__main__", alter_sys=True)
+        return 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+
+class WarmPool:
+    def __init__(self, socket_path: str, modules: tuple[str, ...] = DEFAULT_MODULES):
+        self.socket_path = socket_path
+        self.modules = tuple(modules)
+        self.selector = selectors.DefaultSelector()
+        self.buffers: dict[socket.socket, bytes] = {}
+        self.workers: dict[int, socket.socket] = {}
+        self.listener = None
+        self.wakeup = None
+
+    def warm(self):
+        import importlib
+        for module in self.modules:
+            importlib.import_module(module)
+
+    def listen(self) -> socket.socket:
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        listener.listen(64)
+        self.selector.register(listener, selectors.EVENT_READ)
+        self.listener = listener
+        return listener
+
+    def watch_children(self):
+        # SIGCHLD writes to a pipe the selector watches, so exits are reported at once
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        signal.set_wakeup_fd(write_fd)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        self.wakeup = (read_fd, write_fd)
+        self.selector.register(read_fd, selectors.EVENT_READ)
+
+    def serve(self):
+        self.warm()
+        listener = self.listen()
+        self.watch_children()
+        print(f"Pool ready on {self.socket_path} with {', '.join(self.modules)}", file=sys.stderr, flush=True)
+        try:
+            while True:
+                for key, _ in self.selector.select(timeout=1.0):
+                    if key.fileobj == self.wakeup[0]:
+                        while True:
+                            try:
+                                if not os.read(self.wakeup[0], 512):
+                                    break
+                            except BlockingIOError:
+                                break
+                    elif key.fileobj is listener:
+                        connection, _ = listener.accept()
+                        self.buffers[connection] = b""
+                        self.selector.register(connection, selectors.EVENT_READ)
+                    else:
+                        self.handle(key.fileobj)
+                self.reap()
+        finally:
+            listener.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def handle(self, connection: socket.socket):
+        data, fds, _, _ = socket.recv_fds(connection, MAX_MESSAGE, 3)
+        if not data:
+            # Client gone: its worker keeps running until its stdin closes
+            self.drop(connection)
+            return
+        self.buffers[connection] += data
+        if not self.buffers[connection].endswith(b"\n"):
+            for fd in fds:
+                os.close(fd)
+            return
+        request = json.loads(self.buffers[connection])
+        self.buffers[connection] = b""
+        if request.get("module") not in self.modules or len(fds) != 3:
+            for fd in fds:
+                os.close(fd)
+            send_message(connection, {"error": f"Pool does not serve {request.get('module')!r}"})
+            self.drop(connection)
+            return
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            self.selector.close()
+            for open_socket in [self.listener, *self.buffers]:
+                open_socket.close()
+            signal.set_wakeup_fd(-1)
+            for fd in self.wakeup:
+                os.close(fd)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = run_worker(request["module"], fds, request.get("env", {}), request.get("cwd", os.getcwd()))
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except (OSError, ValueError):  # closed by the module
+                    pass
+            os._exit(code)
+        for fd in fds:
+            os.close(fd)
+        self.workers[pid] = connection
+        send_message(connection, {"pid": pid})
+
+    def drop(self, connection: socket.socket):
+        self.selector.unregister(connection)
+        self.buffers.pop(connection, None)
+        connection.close()
+
+    def reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            connection = self.workers.pop(pid, None)
+            if connection is not None and connection in self.buffers:
+                try:
+                    send_message(connection, {"exit": os.waitstatus_to_exitcode(status)})
+                except OSError:
+                    pass
+                self.drop(connection)
+
+
+def connect(module: str, socket_path: str) -> int:
+    """Hand this process's stdio to a pooled worker running module; returns its exit code."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(socket_path)
+    send_message(connection, {"module": module, "env": dict(os.environ), "cwd": os.getcwd()}, [0, 1, 2])
+    # Only the worker should hold the pipes from now on, so EOF reaches the right reader
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1):
+        os.dup2(devnull, fd)
+    reader = connection.makefile("r")
+    reply = json.loads(reader.readline() or '{"error": "pool closed the connection"}')
+    if "error" in reply:
+        print(reply["error"], file=sys.stderr)
+        return 1
+    pid = reply["pid"]
+
+    def forward(signum, frame):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, forward)
+    line = reader.readline()
+    return json.loads(line)["exit"] if line else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm pool of pre-imported MCP stdio servers.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--socket", default=os.getenv("MCP_POOL_SOCKET", "/tmp/mcp-pool.sock"))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", parents=[common], help="Import the server modules and hand out workers")
+    serve_parser.add_argument("--modules", nargs="+", default=list(DEFAULT_MODULES))
+    connect_parser = subparsers.add_parser("connect", parents=[common], help="Run a server module in a pooled worker over this stdio")
+    connect_parser.add_argument("module")
+    args = parser.parse_args()
+    if args.command == "serve":
+        WarmPool(args.socket, tuple(args.modules)).serve()
+    else:
+        sys.exit(connect(args.module, args.socket))
+
+
+if __name__ == "__main__":
+    main()
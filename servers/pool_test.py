@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV = {**os.environ, "PYTHONPATH": REPO_ROOT}
+
+
+@pytest.fixture
+def pool_socket(tmp_path):
+    path = str(tmp_path / "pool.sock")
+    pool = subprocess.Popen([sys.executable, "-m", "servers.pool", "serve", "--modules", "json.tool", "--socket", path],
+                            env=ENV, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield path
+    pool.terminate()
+    pool.wait(timeout=5)
+
+
+def connect(module, socket_path, stdin):
+    return subprocess.run([sys.executable, "-S", "-m", "servers.pool", "connect", module, "--socket", socket_path],
+                          input=stdin, capture_output=True, text=True, env=ENV, cwd=REPO_ROOT, timeout=10)
+
+
+def test_worker_runs_module_over_client_stdio(pool_socket):
+    completed = connect("json.tool", pool_socket, '{"a": [1, 2]}')
+    assert completed.returncode == 0
+    assert completed.stdout == '{\n    "a": [\n        1,\n        2\n    ]\n}\n'
+
+
+def test_worker_exit_code_and_unknown_module(pool_socket):
+    assert connect("json.tool", pool_socket, "not json").returncode == 1
+    completed = connect("servers.combat_server", pool_socket, "")
+    assert completed.returncode == 1
+    assert "does not serve" in completed.stderr
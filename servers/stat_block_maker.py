@@ -7,11 +7,14 @@ from mcp.server.fastmcp import FastMCP
 import random
 from uuid import uuid4
 from typing import Optional
-from character_creator.name_generator import FantasyNameGenerator
+from servers.character_creator.name_generator import FantasyNameGenerator
+
+from servers.utils.metrics import instrument_tool, register_metrics_tool
 
 mcp = FastMCP("Dice")
 
 @mcp.tool()
+@instrument_tool
 def make_stat_block(request_id: str, game_id: str, description: str, name: Optional[str] = None, level: Optional[int] = None, cr: Optional[int] = None, strength: Optional[int] = None, dexterity: Optional[int] = None, constitution: Optional[int] = None, intelligence: Optional[int] = None, wisdom: Optional[int] = None, charisma: Optional[int] = None) -> dict:
     """Create a D&D character stat block based on the provided parameters. Only request_id and description are required; other parameters will be filled in deterministically if not provided.
     
@@ -122,6 +125,8 @@ def make_stat_block(request_id: str, game_id: str, description: str, name: Optio
     
     return stat_block
 
+register_metrics_tool(mcp)
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
 
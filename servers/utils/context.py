@@ -0,0 +1,173 @@
+"""Compact entity renderings that fit a token budget, for prompts and tool responses.
+
+pack_entity() keeps an entity's fields in the priority order of its type (FIELD_PRIORITIES)
+until the budget is spent. A field that does not fit whole is shortened when that still says
+something: long strings are cut at a sentence or word boundary, lists keep their first items
+plus a "+N more" marker, and objects keep the keys that fit. Fields left out are listed (or,
+when even the list does not fit, counted) under "_omitted" so an agent knows to fetch the
+full entity by id when it needs them.
+
+Tokens are counted with tiktoken's cl100k_base encoding when it is installed, else estimated
+at four characters per token. Packed renderings are cached per entity content, so repeated
+tool calls and turns over unchanged entities skip the work.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # optional; tiktoken may also be unable to fetch its encoding offline
+    _encoding = None
+
+CHARS_PER_TOKEN = 4
+# Default per-entity budget for tool responses
+ENTITY_TOKEN_BUDGET = 300
+# A shortened field must keep at least this many tokens to be worth including
+MIN_FIELD_TOKENS = 12
+# Smallest budget the tools accept; id and name are kept whatever the budget
+MIN_ENTITY_TOKENS = 40
+REQUIRED_FIELDS = ("id", "name")
+CACHE_SIZE = 1024
+
+# Fields most worth a prompt's tokens first; fields not listed follow in their stored order
+FIELD_PRIORITIES: dict[str, tuple[str, ...]] = {
+    "character": (
+        "id", "name", "description", "race", "class", "level", "personality_profile", "current_goal",
+        "max_hp", "ac", "spell_slots", "ability_scores", "background", "skills", "feats",
+        "saving_throws", "tools", "proficiency_bonus", "cr",
+    ),
+    "environment": (
+        "id", "name", "description", "kind", "summary", "state", "creatures", "threats", "hooks",
+        "landmarks", "loot_or_clues", "ambience",
+    ),
+}
+# Bookkeeping fields that never help an agent
+SKIPPED_FIELDS = ("request_id", "game_id", "schema_version", "entity_type")
+
+_cache: OrderedDict = OrderedDict()
+
+
+def count_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def clip_text(text: str, max_tokens: int) -> str:
+    """Shorten text to about max_tokens, preferring to end at a sentence, then a word."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    clipped = text[: max_tokens * CHARS_PER_TOKEN]
+    while clipped and count_tokens(clipped + "…") > max_tokens:
+        clipped = clipped[: int(len(clipped) * 0.9)]
+    sentence_end = max(clipped.rfind(". "), clipped.rfind("! "), clipped.rfind("? "))
+    if sentence_end > len(clipped) // 2:
+        return clipped[: sentence_end + 1]
+    word_end = clipped.rfind(" ")
+    if word_end > len(clipped) // 2:
+        clipped = clipped[:word_end]
+    return clipped.rstrip(" ,;:") + "…"
+
+
+def shorten(value, max_tokens: int):
+    """value cut down to max_tokens of compact JSON, or None when nothing useful fits."""
+    if max_tokens < MIN_FIELD_TOKENS:
+        return None
+    if isinstance(value, str):
+        return clip_text(value, max_tokens - 2)
+    if isinstance(value, list):
+        kept = []
+        for item in value:
+            marker = f"+{len(value) - len(kept) - 1} more" if len(kept) + 1 < len(value) else None
+            candidate = kept + [item] + ([marker] if marker else [])
+            if count_tokens(dumps(candidate)) > max_tokens:
+                break
+            kept.append(item)
+        if not kept:
+            return None
+        return kept + ([f"+{len(value) - len(kept)} more"] if len(kept) < len(value) else [])
+    if isinstance(value, dict):
+        kept = {}
+        for key, item in value.items():
+            if count_tokens(dumps({**kept, key: item})) <= max_tokens:
+                kept[key] = item
+        return kept or None
+    return None
+
+
+def field_order(entity: dict, entity_type: str, fields=None) -> list[str]:
+    priorities = fields or FIELD_PRIORITIES.get(entity_type, ("id", "name", "description"))
+    ordered = [key for key in priorities if key in entity]
+    if fields is None:
+        ordered += [key for key in entity if key not in priorities and key not in SKIPPED_FIELDS]
+    return ordered
+
+
+def fingerprint(entity: dict) -> str:
+    return hashlib.blake2b(json.dumps(entity, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def pack_entity(entity: dict, max_tokens: int = ENTITY_TOKEN_BUDGET, entity_type: str | None = None,
+                fields: tuple[str, ...] | None = None) -> dict:
+    """
+    The most important fields of entity that fit in max_tokens of compact JSON. `fields`
+    replaces the type's priority list and drops every field not named in it. id and name
+    are always kept, even past the budget.
+    """
+    entity_type = entity_type or entity.get("entity_type", "")
+    key = (fingerprint(entity), max_tokens, entity_type, fields)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return dict(_cache[key])
+    packed, omitted = {}, []
+    used = 2  # the enclosing braces
+    for name in field_order(entity, entity_type, fields):
+        value = entity[name]
+        cost = count_tokens(dumps({name: value})) - 1
+        if used + cost > max_tokens and name not in REQUIRED_FIELDS:
+            name_cost = count_tokens(dumps(name)) + 1
+            value = shorten(value, max_tokens - used - name_cost)
+            if value is None:
+                omitted.append(name)
+                continue
+            cost = count_tokens(dumps({name: value})) - 1
+        packed[name] = value
+        used += cost
+    if omitted:
+        # Name the omitted fields when that fits, else just count them; drop the least
+        # important kept fields while even the count does not fit
+        packed["_omitted"] = omitted
+        if count_tokens(dumps(packed)) > max_tokens:
+            packed["_omitted"] = len(omitted)
+        droppable = [name for name in packed if name not in REQUIRED_FIELDS and name != "_omitted"]
+        while droppable and count_tokens(dumps(packed)) > max_tokens:
+            del packed[droppable.pop()]
+            packed["_omitted"] += 1
+    _cache[key] = packed
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return dict(packed)
+
+
+def pack_entities(entities: list[dict], max_tokens: int, entity_type: str | None = None) -> list[dict]:
+    """Pack a list of entities into max_tokens overall, split evenly between them."""
+    if not entities:
+        return []
+    per_entity = max(max_tokens // len(entities), MIN_FIELD_TOKENS * 2)
+    return [pack_entity(entity, per_entity, entity_type) for entity in entities]
+
+
+def render_entity(entity: dict, max_tokens: int = ENTITY_TOKEN_BUDGET, entity_type: str | None = None,
+                  fields: tuple[str, ...] | None = None) -> str:
+    """pack_entity() as a compact JSON string, ready to drop into a prompt."""
+    return dumps(pack_entity(entity, max_tokens, entity_type, fields))
+
+
+def cache_clear():
+    _cache.clear()
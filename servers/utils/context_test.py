@@ -0,0 +1,36 @@
+from servers.utils.context import count_tokens, dumps, pack_entity, render_entity
+
+CHARACTER = {
+    "id": "c1", "entity_type": "character", "game_id": "g1", "request_id": "r1", "name": "Ann",
+    "description": "a bold sailor", "class": "Rogue", "level": 3,
+    "personality_profile": "Ann is loud and loyal. " * 40,
+    "skills": [f"Skill {i}" for i in range(30)],
+    "ability_scores": {"STR": 10, "DEX": 16},
+}
+
+
+def test_pack_entity_keeps_priority_fields_within_budget():
+    packed = pack_entity(CHARACTER, 80)
+    assert count_tokens(dumps(packed)) <= 80
+    assert packed["name"] == "Ann" and packed["class"] == "Rogue"
+    assert "game_id" not in packed and "request_id" not in packed
+    assert packed["_omitted"]
+
+
+def test_pack_entity_shortens_strings_and_lists():
+    packed = pack_entity({**CHARACTER, "personality_profile": "short"}, 70)
+    assert packed["skills"][-1].startswith("+") and packed["skills"][-1].endswith("more")
+    clipped = pack_entity(CHARACTER, 120)["personality_profile"]
+    assert len(clipped) < len(CHARACTER["personality_profile"]) and clipped.endswith(".")
+
+
+def test_pack_entity_fits_whole_entity_and_honours_field_list():
+    assert "_omitted" not in pack_entity(CHARACTER, 10_000)
+    assert pack_entity(CHARACTER, 10_000, fields=("name", "level")) == {"name": "Ann", "level": 3}
+    assert render_entity(CHARACTER, 10_000) == render_entity(dict(CHARACTER), 10_000)
+
+
+def test_pack_entity_keeps_id_and_name_under_any_budget():
+    packed = pack_entity(CHARACTER, 5)
+    assert packed["id"] == "c1" and packed["name"] == "Ann"
+    assert "description" not in packed and packed["_omitted"]
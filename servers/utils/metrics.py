@@ -0,0 +1,214 @@
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Samples kept per histogram; percentiles are computed over this rolling window.
+RESERVOIR_SIZE = 4096
+QUANTILES = (0.5, 0.95, 0.99)
+
+_lock = threading.Lock()
+_tools: dict = {}
+_current_tool = contextvars.ContextVar("current_tool", default=None)
+
+
+def _pick(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class Histogram:
+    """Count/sum over all observations plus a rolling window of recent samples for percentiles."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def quantile(self, q: float) -> float:
+        return _pick(sorted(self.samples), q)
+
+    def as_dict(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            **{f"p{int(q * 100)}": round(_pick(ordered, q), 6) for q in QUANTILES},
+        }
+
+
+class ToolMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.input_bytes = Histogram()
+        self.output_bytes = Histogram()
+        self.phases: dict[str, Histogram] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_s": self.latency.as_dict(),
+            "input_bytes": self.input_bytes.as_dict(),
+            "output_bytes": self.output_bytes.as_dict(),
+            "phases_s": {name: h.as_dict() for name, h in sorted(self.phases.items())},
+        }
+
+
+def payload_size(value) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+def get_tool_metrics(tool_name: str) -> ToolMetrics:
+    with _lock:
+        metrics = _tools.get(tool_name)
+        if metrics is None:
+            metrics = _tools[tool_name] = ToolMetrics()
+        return metrics
+
+
+def instrument_tool(fn):
+    """
+    Record call count, error count, payload sizes and latency for an MCP tool.
+    Apply it below @mcp.tool() so FastMCP still sees the original signature:
+
+        @mcp.tool()
+        @instrument_tool
+        def find_entities(...):
+    """
+    metrics = get_tool_metrics(fn.__name__)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        input_size = payload_size({"args": args, "kwargs": kwargs})
+        token = _current_tool.set(metrics)
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with _lock:
+                metrics.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_tool.reset(token)
+            with _lock:
+                metrics.calls += 1
+                metrics.latency.observe(elapsed)
+                metrics.input_bytes.observe(input_size)
+        output_size = payload_size(result)
+        with _lock:
+            metrics.output_bytes.observe(output_size)
+        return result
+    return wrapper
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Time a block (e.g. "rg_subprocess", "json_parse") and attribute it to the tool
+    currently executing. Outside of an instrumented tool this is a no-op.
+    """
+    metrics = _current_tool.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            histogram = metrics.phases.get(name)
+            if histogram is None:
+                histogram = metrics.phases[name] = Histogram()
+            histogram.observe(elapsed)
+
+
+def get_metrics_snapshot() -> dict:
+    with _lock:
+        return {name: metrics.as_dict() for name, metrics in sorted(_tools.items())}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_prometheus(server: str = "") -> str:
+    """Render all tool metrics in the Prometheus text exposition format."""
+    lines = []
+    base_labels = f'server="{_escape(server)}",' if server else ""
+
+    def summary(metric: str, help_text: str, histograms: list[tuple[str, Histogram]]):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} summary")
+        for labels, histogram in histograms:
+            for q in QUANTILES:
+                lines.append(f'{metric}{{{labels},quantile="{q}"}} {histogram.quantile(q):.6f}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+    with _lock:
+        tools = sorted(_tools.items())
+        lines.append("# HELP mcp_tool_calls_total Tool invocations.")
+        lines.append("# TYPE mcp_tool_calls_total counter")
+        for name, metrics in tools:
+            lines.append(f'mcp_tool_calls_total{{{base_labels}tool="{_escape(name)}"}} {metrics.calls}')
+        lines.append("# HELP mcp_tool_errors_total Tool invocations that raised.")
+        lines.append("# TYPE mcp_tool_errors_total counter")
+        for name, metrics in tools:
+            lines.append(f'mcp_tool_errors_total{{{base_labels}tool="{_escape(name)}"}} {metrics.errors}')
+        summary("mcp_tool_latency_seconds", "Tool latency.",
+                [(f'{base_labels}tool="{_escape(n)}"', m.latency) for n, m in tools])
+        summary("mcp_tool_input_bytes", "Serialized tool argument size.",
+                [(f'{base_labels}tool="{_escape(n)}"', m.input_bytes) for n, m in tools])
+        summary("mcp_tool_output_bytes", "Serialized tool result size.",
+                [(f'{base_labels}tool="{_escape(n)}"', m.output_bytes) for n, m in tools])
+        summary("mcp_tool_phase_seconds", "Time spent in a phase of a tool call.",
+                [(f'{base_labels}tool="{_escape(n)}",phase="{_escape(p)}"', h)
+                 for n, m in tools for p, h in sorted(m.phases.items())])
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    with _lock:
+        _tools.clear()
+
+
+def register_metrics_tool(mcp):
+    """
+    Add a get_server_metrics tool to an MCP server. When METRICS_DUMP_PATH is set, the
+    Prometheus text is also written there when the server process exits.
+    """
+    @mcp.tool()
+    def get_server_metrics(format: str = "json") -> dict | str:
+        """Get per-tool call counts, error counts, payload sizes and p50/p95/p99 latency (overall and per phase) for this server.
+
+        Args:
+            format (str): "json" (default) for a dictionary, or "prometheus" for Prometheus text exposition format.
+        """
+        if format == "prometheus":
+            return render_prometheus(mcp.name)
+        return {"server": mcp.name, "tools": get_metrics_snapshot()}
+
+    dump_path = os.getenv("METRICS_DUMP_PATH")
+    if dump_path:
+        def dump():
+            with open(dump_path, "a") as f:
+                f.write(render_prometheus(mcp.name))
+        atexit.register(dump)
+    return get_server_metrics
@@ -0,0 +1,35 @@
+import pytest
+from servers.utils.metrics import instrument_tool, phase, get_metrics_snapshot, render_prometheus, reset_metrics
+
+
+def test_instrument_tool_records_calls_errors_and_phases():
+    reset_metrics()
+
+    @instrument_tool
+    def lookup(entity_id: str) -> dict:
+        with phase("index_lookup"):
+            pass
+        if entity_id == "missing":
+            raise FileNotFoundError(entity_id)
+        return {"id": entity_id}
+
+    assert lookup("abc") == {"id": "abc"}
+    with pytest.raises(FileNotFoundError):
+        lookup("missing")
+
+    metrics = get_metrics_snapshot()["lookup"]
+    assert metrics["calls"] == 2
+    assert metrics["errors"] == 1
+    assert metrics["phases_s"]["index_lookup"]["count"] == 2
+    assert metrics["output_bytes"]["count"] == 1
+
+    text = render_prometheus("Test")
+    assert 'mcp_tool_calls_total{server="Test",tool="lookup"} 2' in text
+    assert 'mcp_tool_phase_seconds_count{server="Test",tool="lookup",phase="index_lookup"} 2' in text
+
+
+def test_phase_outside_tool_is_noop():
+    reset_metrics()
+    with phase("write"):
+        pass
+    assert get_metrics_snapshot() == {}
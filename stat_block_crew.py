@@ -35,12 +35,12 @@ crew_input = {
 server_params_list = [
     StdioServerParameters(
         command="python3", 
-        args=["servers/stat_block_maker.py"],
+        args=["-m", "servers.stat_block_maker"],
         env={"UV_PYTHON": "3.12", **os.environ},
     ),
     StdioServerParameters(
         command="python3", 
-        args=["servers/json_file_tool.py"],
+        args=["-m", "servers.json_file_tool"],
         env={"UV_PYTHON": "3.12", **os.environ},
     ),
 ]
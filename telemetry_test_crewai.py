@@ -1,4 +1,5 @@
-import instrumentation.langfuse 
+from instrumentation.langfuse import init_tracing
+init_tracing()
 from crewai import Agent, Task, Crew, Process
 from crewai_tools import MCPServerAdapter
 from mcp import StdioServerParameters
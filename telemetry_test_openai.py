@@ -1,5 +1,6 @@
 
-import instrumentation.langfuse
+from instrumentation.langfuse import init_tracing
+init_tracing()
 from openai import OpenAI
  
 openai_client = OpenAI()
@@ -1,4 +1,78 @@
+import hashlib
+import json
+import os
+import re
+
 from .fileutils import read_json_file
 
+# Longest background excerpt that gets embedded into agent prompts.
+SUMMARY_MAX_CHARS = 600
+
+# path -> (mtime_ns, size, context)
+_CONTEXT_CACHE: dict = {}
+
+
+def get_game_information_path(game_id: str) -> str:
+    return f"output/{game_id}/game_information.json"
+
+
+def summarize_background(background: str, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """
+    Collapse whitespace and trim the background to whole sentences that fit in max_chars.
+    Falls back to a hard cut when the first sentence is already too long.
+    """
+    text = re.sub(r"\s+", " ", background or "").strip()
+    if len(text) <= max_chars:
+        return text
+    summary = ""
+    for sentence in re.split(r"(?<=[.!?])\s+", text):
+        candidate = f"{summary} {sentence}".strip()
+        if len(candidate) > max_chars:
+            break
+        summary = candidate
+    return summary or text[:max_chars].rstrip()
+
+
+def build_campaign_context(game_information: dict) -> dict:
+    """
+    Build the compact, hashed form of a campaign's game information.
+
+    The digest is computed over the canonical JSON of the game information, so it only
+    changes when the file content changes. prompt_prefix is byte-for-byte stable for a
+    given digest, which lets providers reuse their prompt cache across crew runs.
+    """
+    canonical = json.dumps(game_information, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+    game_id = game_information.get("game_id")
+    summary = summarize_background(game_information.get("background", ""))
+    return {
+        "game_id": game_id,
+        "digest": digest,
+        "summary": summary,
+        "prompt_prefix": f"World [{game_id}@{digest}]: {summary}",
+        "information": game_information,
+    }
+
+
+def get_campaign_context(game_id: str) -> dict:
+    """
+    Return the cached campaign context for game_id, reloading game_information.json only
+    when its mtime or size changed since the last load.
+    """
+    path = get_game_information_path(game_id)
+    stat = os.stat(path)
+    cached = _CONTEXT_CACHE.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    context = build_campaign_context(read_json_file(path))
+    _CONTEXT_CACHE[path] = (stat.st_mtime_ns, stat.st_size, context)
+    return context
+
+
+def clear_campaign_context_cache():
+    _CONTEXT_CACHE.clear()
+
+
 def get_game_information(game_id: str) -> dict:
-    return read_json_file(f"output/{game_id}/game_information.json")
+    # Shared cached instance; callers should treat it as read-only.
+    return get_campaign_context(game_id)["information"]
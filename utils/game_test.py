@@ -0,0 +1,32 @@
+import json
+import os
+from utils.game import get_campaign_context, summarize_background, clear_campaign_context_cache
+
+
+def write_game_information(tmp_path, background):
+    directory = tmp_path / "output" / "testgame"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "game_information.json"
+    path.write_text(json.dumps({"game_id": "testgame", "background": background}))
+    return path
+
+
+def test_campaign_context_is_cached_and_invalidated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    clear_campaign_context_cache()
+    path = write_game_information(tmp_path, "A land of salt.")
+    first = get_campaign_context("testgame")
+    assert get_campaign_context("testgame") is first
+    assert first["prompt_prefix"] == f"World [testgame@{first['digest']}]: A land of salt."
+
+    path.write_text(json.dumps({"game_id": "testgame", "background": "A land of ash and salt."}))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    second = get_campaign_context("testgame")
+    assert second is not first
+    assert second["digest"] != first["digest"]
+
+
+def test_summarize_background_keeps_whole_sentences():
+    background = "First sentence.  Second   sentence is longer. Third."
+    assert summarize_background(background, max_chars=30) == "First sentence."
+    assert summarize_background("x" * 50, max_chars=10) == "x" * 10